@@ -1,224 +1,460 @@
-import random
-from read import read_instance
-from scipy.sparse import dok_matrix
-ENE = 5
+from itertools import takewhile
+from os.path import basename, exists
+from time import perf_counter
+
+import numpy as np
+from bound import LagrangianBound, relative_gap
+from checkpoint import CHECKPOINT_INTERVAL, Checkpointer, read_checkpoint, restore, snapshot
+from costmatrix import client_blocks
+from deadline import Deadline, expired
+from elite import ElitePool, path_relinking, solution_hash
+from instrument import logger, timed, PROFILER
+from read import ResidualState, read_instance
+from results import read_solution, validate
+from sas import EPS, SASEngine
+from solution import EMPTY, Solution
+from transport import cached_transport
+ENE = 5        # Pasadas SAS entre intentos de abrir/cerrar centros (ver `SearchPolicy`)
+ALPHA = 0.05    # Tamaño de la lista restringida: 0 = greedy puro, 1 = aleatorio puro
+
+# Motivos por los que se detiene la construcción
+COMPLETE = "complete"                       # Toda la demanda fue asignada
+CAPACITY_EXHAUSTED = "capacity_exhausted"   # No queda capacidad en ningún centro
+NO_CANDIDATE = "no_candidate"               # La RCL quedó vacía
+TIME_LIMIT = "time_limit"                   # Se cumplió el límite de tiempo
+
+
+class SearchPolicy:
+    """
+    Política de la búsqueda local (ver `Local_Search`).
+
+    Args:
+        open_close_every (int): Intentar abrir/cerrar centros cada este número de
+                                pasadas SAS (0 = nunca por calendario).
+        open_close_on_stall (bool): Intentar abrir/cerrar centros cuando una
+                                    pasada SAS no mejora, antes de terminar.
+        tabu_tenure (int): Lotes de SAS durante los que un cliente movido no se
+                           vuelve a mover (0 = sin lista tabú).
+        escapes (int): Movimientos SAS que empeoran permitidos por pasada cuando
+                       no quedan mejoras (requiere `tabu_tenure` > 0).
+    """
+
+    def __init__(self, open_close_every=ENE, open_close_on_stall=True, tabu_tenure=0, escapes=0):
+        self.open_close_every = open_close_every
+        self.open_close_on_stall = open_close_on_stall
+        self.tabu_tenure = tabu_tenure
+        self.escapes = escapes
+
+    def __repr__(self):
+        return (f"SearchPolicy(open_close_every={self.open_close_every}, "
+                f"open_close_on_stall={self.open_close_on_stall}, "
+                f"tabu_tenure={self.tabu_tenure}, escapes={self.escapes})")
+
+    def open_close(self, passes, stalled):
+        """True si después de la pasada `passes` se debe intentar abrir/cerrar centros."""
+        if stalled and self.open_close_on_stall:
+            return True
+        return self.open_close_every > 0 and passes % self.open_close_every == 0
+
+
+class ConstructionState:
+    """
+    Estado de la construcción greedy.
+
+    Trabaja sobre las demandas y capacidades residuales de la instancia
+    (`data["demandas"]`, `data["capacity"]`) y lleva la cuenta de los clientes con
+    demanda pendiente y de los centros con capacidad restante, de modo que
+    verificar si la solución está completa o si ya no es factible es O(1).
+
+    Args:
+        data (Instance): Datos de la instancia (se modifican sus vectores residuales).
+    """
+
+    def __init__(self, data):
+        instance_dim = data["params"]
+        self.solution = Solution(instance_dim[0], instance_dim[1])
+        self.demandas = data["demandas"]
+        self.capacity = data["capacity"]
+        self.unsatisfied = int(np.count_nonzero(self.demandas > 0))
+        self.available = int(np.count_nonzero(self.capacity > 0))
+        self.cost = None
+        self.stop_reason = None
+
+    def assign(self, facility, client):
+        """
+        Asigna al centro lo máximo posible de la demanda pendiente del cliente.
+
+        Returns:
+            float: Cantidad asignada.
+        """
+        amount = min(self.demandas[client], self.capacity[facility])
+        if amount <= 0:
+            return 0
+
+        self.solution.add(facility, client, amount)
+        self.demandas[client] -= amount
+        self.capacity[facility] -= amount
+        if self.demandas[client] <= 0:
+            self.unsatisfied -= 1
+        if self.capacity[facility] <= 0:
+            self.available -= 1
+        return amount
+
 
 # Done?
-def complete_solution(solution, data):
+def complete_solution(state):
     """
     Verifica si todas las demandas han sido satisfechas.
     """
-    total_assigned = {client: 0 for client in range(data["params"][1])}
-    for (facility, client), proportion in solution.items():
-        total_assigned[client] += proportion
+    return state.unsatisfied == 0
 
-    demandas_pendientes = {
-        client: data["initial_demand"][client] - total_assigned[client]
-        for client in range(data["params"][1])
-    }
 
-    print(f"Demandas pendientes: {list(demandas_pendientes.items())[:10]} (mostrando las primeras 10)")
-    return all(
-        total_assigned[client] >= data["initial_demand"][client]
-        for client in range(data["params"][1])
-    )
+def infeasible_solution(state):
+    """
+    Verifica si quedan clientes con demanda pendiente pero ningún centro con capacidad.
+    """
+    return state.unsatisfied > 0 and state.available == 0
 
 
+def opening_shares(data):
+    """
+    Parte del costo fijo de cada centro que se carga a cada unidad de demanda
+    mientras el centro está cerrado.
 
-# Done?
-def all_candidates(data, solution):
-    candidates = []
+    El costo fijo se reparte entre la demanda que el centro atendería de forma
+    realista: la de los clientes que lo tienen como centro más cercano (con su
+    capacidad como tope). Un centro que no es el más cercano de ningún cliente
+    reparte su costo fijo entre la demanda de los clientes que lo tienen entre
+    sus `k` más cercanos, dividida por `k`. Repartirlo entre toda la capacidad
+    haría la parte despreciable y la construcción abriría casi todos los centros.
 
-    for facility in range(data["params"][0]):
-        if facility >= len(data["capacity"]):
-            print(f"Índice de facilidad fuera de rango: {facility}")
-            continue
+    Args:
+        data (Instance): Datos de la instancia.
 
-        if data["capacity"][facility] > 0:  # Considerar facilidades con capacidad restante
-            for client in range(data["params"][1]):
-                if data["demandas"][client] > 0:  # Considerar clientes con demanda pendiente
-                    current_demand_satisfied = solution[:, client].sum()
-                    remaining_capacity = data["capacity"][facility] - current_demand_satisfied
-                    if remaining_capacity > 0:
-                        candidates.append((facility, client))
+    Returns:
+        ndarray: Costo por unidad de demanda de abrir cada centro.
+    """
+    nearest = data.nearest_index()
+    initial_capacity = np.asarray(data["initial_capacity"], dtype=np.float64)
+    demand = np.asarray(data["initial_demand"], dtype=np.float64)
+    n_facilities = len(initial_capacity)
+
+    served = np.bincount(nearest.order[:, 0], weights=demand, minlength=n_facilities)
+    shared = np.bincount(nearest.order.ravel(), weights=np.repeat(demand, nearest.k),
+                         minlength=n_facilities) / nearest.k
+    served = np.minimum(np.where(served > 0, served, shared), initial_capacity)
+    return np.divide(data["costos_fijos"], served, out=np.zeros(n_facilities), where=served > 0)
+
+
+def greedy_costs(data, facilities, clients, share):
+    """
+    Costo greedy por unidad de demanda de asignar cada cliente a cada centro.
 
-    print(f"Candidatos disponibles: {candidates}")
-    return candidates
+    Es el costo de transporte más, para los centros aún cerrados, la parte del
+    costo fijo que corresponde a cada unidad de demanda (ver `opening_shares`).
 
-# Falta expandir
-def construct_candidates(data, solution):
+    Args:
+        data (Instance): Datos de la instancia.
+        facilities (ndarray): Centros candidatos de cada cliente (clientes x k).
+        clients (ndarray): Índices de los clientes considerados.
+        share (ndarray): Costo por unidad de abrir cada centro (`opening_shares`).
+
+    Returns:
+        ndarray: Matriz (clientes x k) de costos greedy.
     """
-    Construye una lista de candidatos factibles para agregar a la solución.
+    closed = data["capacity"] >= data["initial_capacity"]  # Aún sin asignaciones
+    return data["costo"][clients[:, None], facilities] + np.where(closed, share, 0.0)[facilities]
+
+
+class CandidateScores:
     """
-    all_can = all_candidates(data, solution)
-    if not all_can:
-        print("Advertencia: No se generaron candidatos válidos en esta iteración.")
-    else:
-        print(f"Candidatos generados: {all_can[:10]} (mostrando los primeros 10)")
-    return all_can
+    Costos greedy de los pares (centro, cliente) candidatos durante la construcción.
+
+    Guarda, por cliente pendiente, sus centros candidatos (ver
+    `NearestIndex.candidates`), sus costos greedy (`greedy_costs`, infinito si
+    el par no es factible) y el menor y mayor costo finito de cada fila. El
+    costo de un par solo cambia cuando su centro se abre (deja de pagar la
+    parte del costo fijo) y su factibilidad solo cuando el centro pierde
+    capacidad, por lo que después de cada asignación se recalculan solo las
+    filas de los clientes que tienen al centro entre sus candidatos, en lugar
+    de todos los clientes pendientes.
+
+    Args:
+        data (Instance): Datos de la instancia (sus vectores residuales se leen
+                         en cada actualización).
+        clients (ndarray): Clientes pendientes al inicio.
+        amounts (ndarray): Capacidad que necesita cada cliente en un centro (por
+                           defecto basta con que quede capacidad; fuente única
+                           usa la demanda, ver `single.py`).
+    """
+
+    def __init__(self, data, clients, amounts=None):
+        self.data = data
+        self.amounts = amounts
+        self.nearest = data.nearest_index()
+        self.share = opening_shares(data)
+        n_clients = data["params"][1]
+        self.facilities = np.zeros((n_clients, self.nearest.k), dtype=np.intp)
+        self.scores = np.full((n_clients, self.nearest.k), np.inf)
+        self.low = np.full(n_clients, np.inf)    # Menor costo finito de cada fila
+        self.high = np.full(n_clients, -np.inf)  # Mayor costo finito de cada fila
+        self.active = np.zeros(n_clients, dtype=bool)
+        self.active[clients] = True
+        self.fallback = {}  # Centro fuera de los `k` más cercanos -> clientes que lo tienen de candidato
+        self.refresh(np.asarray(clients, dtype=np.intp))
+
+    def refresh(self, clients):
+        """Recalcula las filas de los clientes pendientes dados."""
+        if len(clients) == 0:
+            return
+        amounts = None if self.amounts is None else self.amounts[clients]
+        facilities, feasible = self.nearest.candidates(clients, self.data["capacity"], amounts)
+        scores = greedy_costs(self.data, facilities, clients, self.share)
+        scores[~feasible] = np.inf
+
+        for client, facility in zip(clients.tolist(), self.facilities[clients, 0].tolist()):
+            self.fallback.get(facility, set()).discard(client)
+        rows = np.flatnonzero(facilities[:, 0] != self.nearest.order[clients, 0])
+        for client, facility in zip(clients[rows].tolist(), facilities[rows, 0].tolist()):
+            self.fallback.setdefault(facility, set()).add(client)
+
+        self.facilities[clients] = facilities
+        self.scores[clients] = scores
+        self.low[clients] = scores.min(axis=1)
+        self.high[clients] = np.where(feasible, scores, -np.inf).max(axis=1)
+
+    def remove(self, client):
+        """El cliente ya no está pendiente."""
+        self.active[client] = False
+        self.scores[client] = np.inf
+        self.low[client] = np.inf
+        self.high[client] = -np.inf
+        self.fallback.get(int(self.facilities[client, 0]), set()).discard(client)
+
+    def update(self, facility, client, opened, satisfied):
+        """
+        Actualiza las filas después de asignar demanda del cliente al centro.
+
+        Args:
+            facility (int): Centro asignado.
+            client (int): Cliente asignado.
+            opened (bool): El centro no tenía asignaciones antes de esta.
+            satisfied (bool): El cliente ya no tiene demanda pendiente.
+        """
+        if satisfied:
+            self.remove(client)
+        clients = self.nearest.clients_of(facility)
+        if self.fallback.get(facility):
+            clients = np.union1d(clients, list(self.fallback[facility]))
+        capacity = self.data["capacity"][facility]
+        if not opened:  # Solo cambian los pares que el centro dejó de poder atender
+            if self.amounts is None:
+                clients = clients if capacity <= 0 else clients[:0]
+            else:
+                clients = clients[self.amounts[clients] > capacity]
+        self.refresh(clients[self.active[clients]])
+
+
+def construct_candidates(candidates, alpha=ALPHA):
+    """
+    Construye la lista restringida de candidatos (RCL).
+
+    Contiene los pares cuyo costo greedy está dentro de
+    `min + alpha * (max - min)` entre todos los pares factibles; el mínimo y
+    el máximo salen de los extremos de cada fila y solo se recorren las filas
+    que pueden tener pares en la lista.
+
+    Args:
+        candidates (CandidateScores): Costos greedy de los candidatos.
+        alpha (float): Parámetro de la RCL en [0, 1].
+
+    Returns:
+        ndarray: Pares (centro, cliente) de la RCL, de forma (k, 2), ordenados
+                 por cliente.
+    """
+    best = candidates.low.min()
+    if not np.isfinite(best):
+        logger.debug("No se generaron candidatos válidos en esta iteración.")
+        return np.empty((0, 2), dtype=np.intp)
+
+    threshold = best + alpha * (candidates.high.max() - best)
+    clients = np.flatnonzero(candidates.low <= threshold)
+    rows, cols = np.nonzero(candidates.scores[clients] <= threshold)
+    return np.column_stack((candidates.facilities[clients[rows], cols], clients[rows]))
 
 
-# DONE?
-def select_candidate(candidate_list, seed):
+def select_candidate(candidate_list, rng):
     """
-    Selecciona un candidato aleatorio de la lista.
+    Selecciona un candidato aleatorio de la RCL.
+
+    Args:
+        candidate_list (ndarray): Pares (centro, cliente).
+        rng (Generator): Generador de números aleatorios de la iteración.
+
+    Returns:
+        tuple: (centro, cliente) o None si la lista está vacía.
     """
-    random.seed(seed)
-    if not candidate_list:
-        print("Error: Lista de candidatos vacía. No se puede seleccionar.")
+    if len(candidate_list) == 0:
+        logger.debug("Lista de candidatos vacía. No se puede seleccionar.")
         return None
-    candidate = random.choice(candidate_list)
-    print(f"Candidato seleccionado: {candidate}")
-    return candidate
+    facility, client = candidate_list[rng.integers(len(candidate_list))]
+    return int(facility), int(client)
 
 
 
-def add_candidate(solution, candidate, data):
+def add_candidate(state, candidate, data):
     """
     Asigna una parte de la demanda de un cliente a una facilidad.
+
+    Args:
+        state (ConstructionState): Estado de la construcción.
+        candidate (tuple): Par (centro, cliente).
+        data (Instance): Datos de la instancia.
+
+    Returns:
+        Solution: Solución parcial actualizada.
     """
     facility, client = candidate
-    demand = data["demandas"][client]
-    capacity = data["capacity"][facility]
-
-    # Asignar lo máximo posible
-    total_assigned_demand = min(demand, capacity)
+    total_assigned_demand = state.assign(facility, client)  # Asignar lo máximo posible
 
-    if total_assigned_demand > 0:
-        solution[facility, client] += total_assigned_demand
-        data["demandas"][client] -= total_assigned_demand
-        data["capacity"][facility] -= total_assigned_demand
-        print(f"Asignación realizada: {candidate}, demanda satisfecha: {total_assigned_demand}")
-    else:
-        print(f"Advertencia: No se pudo asignar {candidate}. Capacidad restante: {capacity}, demanda: {demand}")
-    return solution
+    if total_assigned_demand <= 0:
+        logger.warning("No se pudo asignar %s. Capacidad restante: %s, demanda: %s",
+                       candidate, data["capacity"][facility], data["demandas"][client])
+    return state.solution
 
 
+@timed("evaluation")
 def evaluate_cost(solution, data):
     """
     Calcula el costo total de la solución.
 
     Args:
-        solution (dok_matrix): Solución actual.
-        data (dict): Datos de la instancia.
+        solution (Solution): Solución actual (también acepta una matriz dispersa
+                             centros x clientes, que se convierte).
+        data (Instance): Datos de la instancia.
 
     Returns:
         float: Costo total o None si la solución es inválida.
     """
+    if not isinstance(solution, Solution):
+        solution = Solution.from_matrix(solution)
+
     if solution.nnz == 0:  # Verifica si la solución está vacía
-        print("La solución está vacía, no se puede calcular el costo.")
+        logger.warning("La solución está vacía, no se puede calcular el costo.")
         return None
 
-    total_cost = 0
-    facilities_used = set(i for i, _ in solution.keys() if solution[i, _] > 0)
-
-    # Costo fijo por abrir instalaciones
-    total_cost += sum(data["costos_fijos"][facility] for facility in facilities_used)
-
-    # Costo de transporte
-    for (facility, client), proportion in solution.items():
-        if proportion > 0:  # Solo considera asignaciones no nulas
-            total_cost += proportion * data["costo"][client][facility]
+    return solution.evaluate(data)
 
-    return total_cost
 
-
-def greedy_randomized_construction(seed, data):
+@timed("construction")
+def construct(seed, data, alpha=ALPHA, deadline=None):
     """
     Construye una solución inicial utilizando un enfoque aleatorio greedy.
 
     Args:
         seed (int): Semilla para generar números aleatorios.
-        data (dict): Datos de la instancia.
+        data (Instance): Datos de la instancia.
+        alpha (float): Parámetro de la RCL (ver `construct_candidates`).
+        deadline (Deadline): Límite de tiempo (opcional).
 
     Returns:
-        tuple: Solución generada y su costo.
+        ConstructionState: Estado final, con la solución, su costo y el motivo
+                           de término (`stop_reason`).
     """
-    random.seed(seed)
-    instance_dim = data["params"]
-    solution = dok_matrix((instance_dim[0], instance_dim[1]), dtype=float)
-
-    print("Estado inicial:")
-    print(f"Capacidades: {data['capacity']}")
-    print(f"Demandas: {data['demandas']}")
+    rng = np.random.default_rng(seed)
+    state = ConstructionState(data)
+    candidates = CandidateScores(data, np.flatnonzero(data["demandas"] > 0))
 
-    while not complete_solution(solution, data):
-        candidates = construct_candidates(data, solution)
-        if not candidates:
-            print("No hay más candidatos disponibles.")
+    while not complete_solution(state):
+        if expired(deadline):
+            state.stop_reason = TIME_LIMIT
             break
-
-        print(f"Candidatos disponibles: {candidates}")
-
-        selection = select_candidate(candidates, seed)
-        if not selection:
-            print("No se pudo seleccionar un candidato.")
+        if infeasible_solution(state):
+            state.stop_reason = CAPACITY_EXHAUSTED
             break
 
-        solution = add_candidate(solution, selection, data)
-        print(f"Asignación actual: {solution.items()}")
+        selection = select_candidate(construct_candidates(candidates, alpha), rng)
+        if selection is None:
+            state.stop_reason = NO_CANDIDATE
+            break
 
-    cost = evaluate_cost(solution, data)
-    print(f"Solución construida con costo: {cost}")
-    return solution, cost
+        opened = state.solution.count[selection[0]] == 0
+        add_candidate(state, selection, data)
+        candidates.update(*selection, opened, satisfied=state.demandas[selection[1]] <= 0)
+    else:
+        state.stop_reason = COMPLETE
 
+    state.cost = evaluate_cost(state.solution, data)
+    return state
 
 
-def SAS(solution, data):
+def greedy_randomized_construction(seed, data, alpha=ALPHA):
     """
-    Reassigns a portion of a client's demand from one facility to another to reduce cost
-    or improve resource utilization while respecting capacity and demand constraints.
+    Construye una solución inicial utilizando un enfoque aleatorio greedy.
 
     Args:
-        solution (dok_matrix): Current solution matrix (centers x clients), where values represent 
-                               the amount of demand satisfied by each facility.
-        data (dict): Instance data, including capacities, demands, costs, etc.
+        seed (int): Semilla para generar números aleatorios.
+        data (Instance): Datos de la instancia.
+        alpha (float): Parámetro de la RCL (ver `construct_candidates`).
 
     Returns:
-        dok_matrix: Updated solution matrix after performing a single assignment swap.
-    """
-    best_solution = solution.copy()  # Copy current solution as the baseline
-    best_cost = evaluate_cost(best_solution, data)  # Initial cost of the current solution
-    improved = False 
-    # Iterate over all assignments in the solution
-    for (current_facility, client), assigned_demand in solution.items():
-        if assigned_demand <= 0:  # Skip if no demand is currently assigned
-            continue
+        tuple: Solución generada y su costo.
+    """
+    state = construct(seed, data, alpha)
+    if state.stop_reason != COMPLETE:
+        logger.info("Construcción detenida antes de completar la solución: %s", state.stop_reason)
+    logger.debug("Solución construida con costo: %s", state.cost)
+    return state.solution, state.cost
+
 
-        # Iterate over all alternative facilities (to swap with)
-        for alternative_facility in range(data["params"][0]):
-            if alternative_facility == current_facility:
-                continue  # Skip the current facility
 
-            # Calculate the potential new demand for both facilities
-            # Tentatively swap the entire demand between the current and alternative facility
-            tentative_solution = best_solution.copy()
-            tentative_solution[current_facility, client] -= assigned_demand
-            tentative_solution[alternative_facility, client] += assigned_demand
+@timed("sas")
+def sas_pass(engine, deadline=None):
+    """Pasada SAS sobre un `SASEngine` que conserva su contabilidad entre pasadas."""
+    return engine.improve_batch(deadline)
 
-            # Check if this reassignment respects the capacity constraints
-            # Ensure that no facility exceeds its original capacity after reassignment
-            facility_demand_current = tentative_solution[current_facility, :].sum()  # Total demand in the current facility
-            facility_demand_alternative = tentative_solution[alternative_facility, :].sum()  # Total demand in the alternative facility
 
-            if facility_demand_current <= data["initial_capacity"][current_facility] and facility_demand_alternative <= data["initial_capacity"][alternative_facility]:
-                # If the solution is feasible, evaluate the cost
-                tentative_cost = evaluate_cost(tentative_solution, data)
+def SAS(solution, data, deadline=None):
+    """
+    Reassigns a client's demand from one facility to another to reduce cost
+    while respecting capacity constraints.
 
-                # If this reassignment reduces the cost, update the best solution
-                if tentative_cost < best_cost:
-                    best_solution = tentative_solution
-                    best_cost = tentative_cost
-                    improved = True
+    Facility loads and open/closed state are kept incrementally by `SASEngine`.
+    Each batch scores every (assignment, alternative facility) move at once as a
+    delta matrix (transport cost difference plus any fixed cost saved or added),
+    masks capacity-infeasible moves and applies the best non-conflicting
+    improving moves (see `SASEngine.improve_batch`), until none improves.
 
-    return best_solution, improved
-def facility_opening_closing(solution, data):
+    Args:
+        solution (Solution): Current solution, with the amount of each client's
+                             demand satisfied by each facility.
+        data (Instance): Instance data, including capacities, demands, costs, etc.
+        deadline (Deadline): Optional time limit; the pass stops early when it expires.
+
+    Returns:
+        tuple: (Updated solution matrix, bool indicating whether any move was applied).
+    """
+    engine = SASEngine(solution, data)
+    improved = sas_pass(engine, deadline)
+    if not improved:
+        return solution, improved
+    return engine.solution, improved
+
+
+@timed("facility_opening_closing")
+def facility_opening_closing(solution, data, deadline=None, candidates=None):
     """
     Intenta abrir o cerrar instalaciones para mejorar la solución actual.
+
+    Cada prueba trabaja con su propio estado residual, calculado desde la
+    solución que modifica (`ResidualState.from_solution`), sin tocar `data`.
     
     Args:
-        solution (dok_matrix): Solución actual.
-        data (dict): Datos de la instancia.
+        solution (Solution): Solución actual.
+        data (Instance): Datos de la instancia.
+        deadline (Deadline): Límite de tiempo; al cumplirse se deja de probar centros.
+        candidates (ndarray): Máscara de los centros que vale la pena intentar
+                              cerrar (por defecto todos).
 
     Returns:
         tuple: (Nueva solución, bool indicando si hubo mejora).
@@ -228,35 +464,34 @@ def facility_opening_closing(solution, data):
     best_cost = evaluate_cost(best_solution, data)
 
     # Intentar cerrar instalaciones
+    nearest = data.nearest_index()
     for facility in range(data["params"][0]):
-        if solution[facility, :].sum() == 0:  # Si no tiene asignaciones, ya está cerrada
+        if expired(deadline):
+            return best_solution, improved
+        if solution.count[facility] == 0:  # Si no tiene asignaciones, ya está cerrada
+            continue
+        if candidates is not None and not candidates[facility]:  # Sin cambios desde el último intento
             continue
         
         tentative_solution = best_solution.copy()
-        tentative_solution[facility, :] = 0  # Eliminar todas las asignaciones de esta instalación
+        tentative_solution.remove_facility(facility)  # Eliminar todas las asignaciones de esta instalación
 
-        # Reasignar demanda de los clientes
+        # Reasignar demanda de los clientes, con el estado residual de esta prueba
         feasible = True
-        for client in range(data["params"][1]):
-            remaining_demand = data["initial_demand"][client] - tentative_solution[:, client].sum()
-            if remaining_demand > 0:
+        residual = ResidualState.from_solution(data, tentative_solution)
+        for client in np.flatnonzero(residual.demandas > EPS).tolist():
+            while feasible and residual.demandas[client] > EPS:
                 # Buscar la instalación más barata para satisfacer esta demanda
-                best_facility = None
-                min_cost = float('inf')
-                for alt_facility in range(data["params"][0]):
-                    if alt_facility != facility and data["capacity"][alt_facility] > 0:
-                        cost = data["costo"][client][alt_facility]
-                        if cost < min_cost:
-                            min_cost = cost
-                            best_facility = alt_facility
-                
-                if best_facility is not None:
-                    assignable = min(remaining_demand, data["capacity"][best_facility])
-                    tentative_solution[best_facility, client] += assignable
-                    data["capacity"][best_facility] -= assignable
-                else:
+                best_facility = nearest.first_feasible(client, residual.capacity, exclude=facility)
+                if best_facility is None:
                     feasible = False
                     break
+                assignable = min(residual.demandas[client], residual.capacity[best_facility])
+                tentative_solution.add(best_facility, client, assignable)
+                residual.capacity[best_facility] -= assignable
+                residual.demandas[client] -= assignable
+            if not feasible:
+                break
 
         # Evaluar costo
         if feasible:
@@ -268,18 +503,18 @@ def facility_opening_closing(solution, data):
 
     # Intentar abrir instalaciones
     for facility in range(data["params"][0]):
-        if solution[facility, :].sum() > 0:  # Si ya está abierta
+        if expired(deadline):
+            break
+        if solution.count[facility] > 0:  # Si ya está abierta
             continue
         
         tentative_solution = best_solution.copy()
 
-        for client in range(data["params"][1]):
-            remaining_demand = data["initial_demand"][client] - tentative_solution[:, client].sum()
-            if remaining_demand > 0:
-                cost = data["costo"][client][facility]
-                assignable = min(remaining_demand, data["capacity"][facility])
-                tentative_solution[facility, client] += assignable
-                data["capacity"][facility] -= assignable
+        residual = ResidualState.from_solution(data, tentative_solution)
+        for client in np.flatnonzero(residual.demandas > EPS).tolist():
+            assignable = min(residual.demandas[client], residual.capacity[facility])
+            tentative_solution.add(facility, client, assignable)
+            residual.capacity[facility] -= assignable
 
         # Evaluar costo
         tentative_cost = evaluate_cost(tentative_solution, data)
@@ -291,41 +526,132 @@ def facility_opening_closing(solution, data):
     return best_solution, improved
 
 
-def find_improvement(solution, data, iter, N):
-    improved = False
-    
-    
-    # Dado un número de SAS, hacer FOC
-    if iter % N == 0:               
-        new, improved =  facility_opening_closing(solution, data)
-    new, improved = SAS(solution, data)
-    
-    if improved:    return new, improved
-    else:           return solution, improved
+@timed("transport")
+def optimal_allocation(solution, data, deadline=None):
+    """
+    Reasigna la demanda de forma óptima entre los centros abiertos de la solución
+    (problema de transporte, ver `transport.py`), partiendo de la asignación actual.
+    Si el conjunto ya se resolvió antes se toma de la caché (ver `memo.py`).
 
-#Done?
-def Local_Search(solution, data):
+    Args:
+        solution (Solution): Solución actual.
+        data (Instance): Datos de la instancia.
+        deadline (Deadline): Límite de tiempo (opcional).
+
+    Returns:
+        tuple: (Nueva solución, bool indicando si hubo mejora).
+    """
+    cost = evaluate_cost(solution, data)
+    cached = cached_transport(data, solution.open_facilities(), warm=solution, deadline=deadline)
+    if cached is None or cached[1] >= cost:
+        return solution, False
+    return cached[0], True
+
+
+def opening_savings(solution, data):
+    """
+    Estimación del ahorro de abrir cada centro: lo que bajaría el costo de
+    transporte si cada cliente enviara a él toda su demanda (si le conviene),
+    menos su costo fijo. Sirve solo para ordenar los centros a probar.
+    """
+    costo, demand = data["costo"], data["initial_demand"]
+    facilities, amounts = solution.facilities, solution.amounts
+    clients = np.arange(len(facilities))[:, None]
+    used = np.where(facilities != EMPTY, costo[clients, np.maximum(facilities, 0)] * amounts, 0.0).sum(axis=1)
+    unit = used / np.maximum(demand, 1e-12)  # Costo medio por unidad de cada cliente
+    gain = np.zeros(costo.shape[1])
+    for block in client_blocks(*costo.shape):  # Por bloques: la matriz puede estar en disco
+        gain += (np.maximum(unit[block, None] - costo[block], 0.0) * demand[block, None]).sum(axis=0)
+    return gain - data["costos_fijos"]
+
+
+@timed("open_set_search")
+def open_set_search(solution, data, deadline=None):
+    """
+    Búsqueda local sobre el conjunto de centros abiertos con asignación exacta.
+
+    Prueba cerrar cada centro abierto y luego abrir los centros cerrados con
+    ahorro estimado positivo (ver `opening_savings`); cada conjunto se evalúa
+    con la asignación óptima (`solve_transport`, partiendo de la solución
+    actual, o desde la caché de la instancia si ya se resolvió) y se acepta el
+    primer movimiento que mejora.
+
+    Args:
+        solution (Solution): Solución actual (con asignación óptima).
+        data (Instance): Datos de la instancia.
+        deadline (Deadline): Límite de tiempo (opcional).
+
+    Returns:
+        tuple: (Nueva solución, bool indicando si hubo mejora).
+    """
+    cost = evaluate_cost(solution, data)
+    opened = solution.open_facilities()
+
+    # Primero los centros con mayor costo fijo
+    closings = opened[np.argsort(-data["costos_fijos"][opened], kind="stable")]
+    savings = opening_savings(solution, data)
+    openings = np.flatnonzero((savings > 0) & (solution.count == 0))
+    openings = openings[np.argsort(-savings[openings], kind="stable")]
+
+    moves = [opened[opened != facility] for facility in closings.tolist()]
+    moves += [np.union1d(opened, [facility]) for facility in openings.tolist()]
+    for open_facilities in moves:
+        if expired(deadline):
+            break
+        cached = cached_transport(data, open_facilities, warm=solution, deadline=deadline)
+        if cached is not None and cached[1] < cost:
+            return cached[0], True
+    return solution, False
+
+
+@timed("local_search")
+def Local_Search(solution, data, deadline=None, exact=False, policy=None):
     """
     Mejora la solución iterativamente
 
+    Las pasadas SAS usan un único `SASEngine`, que guarda el mejor movimiento de
+    cada cliente y después de cada lote solo reevalúa los clientes y centros
+    que cambiaron (bits de "no mirar"). Cuándo se intenta abrir o cerrar centros
+    lo decide `policy`; solo se prueba cerrar los centros cuya carga cambió desde
+    el intento anterior.
+
     Args:
-        solution (dok_matrix): Solución inicial
+        solution (Solution): Solución inicial
         data (dict): Datos de la instancia
+        deadline (Deadline): Límite de tiempo; al cumplirse se retorna la mejor
+                             solución encontrada hasta ese momento.
+        exact (bool): Al terminar las pasadas SAS, asignar la demanda de forma
+                      óptima y buscar sobre el conjunto de centros abiertos
+                      (`optimal_allocation` y `open_set_search`).
+        policy (SearchPolicy): Política de la búsqueda (por defecto `SearchPolicy()`).
 
     Returns:
-        dok_matrix: Solución mejorada, en caso de que se hayan logrado mejoras
-    """
-    improved = True
-    i = 1
-    while improved:
-        new_solution, improved = find_improvement(solution, data, i, N = ENE)
-        print("i : ", i)
-        if improved:
-            solution = new_solution
-        else:
-            improved = False
-            
-        i += 1
+        Solution: Solución mejorada, en caso de que se hayan logrado mejoras
+    """
+    policy = policy or SearchPolicy()
+    engine = SASEngine(solution, data, policy.tabu_tenure, policy.escapes)
+    passes = 0
+    while not expired(deadline):
+        passes += 1
+        improved = sas_pass(engine, deadline)
+        logger.debug("Búsqueda local, pasada %d, costo: %s", passes, engine.cost)
+        if policy.open_close(passes, stalled=not improved):
+            new_solution, changed = facility_opening_closing(engine.solution, data, deadline,
+                                                             engine.facility_active)
+            engine.facility_active[:] = False
+            if changed:
+                engine.reset(new_solution, data)
+                continue
+        if not improved:
+            break
+    solution = engine.solution
+
+    if exact and not expired(deadline):
+        solution, _ = optimal_allocation(solution, data, deadline)
+        improved = True
+        while improved and not expired(deadline):
+            solution, improved = open_set_search(solution, data, deadline)
+
     return solution, evaluate_cost(solution, data)
 
 #Done?
@@ -340,43 +666,397 @@ def Update_Solution(current, best):
     Returns:
         tuple: Mejor solución entre ambas
     """
-    
-    print(current)
-    print(best)
+    logger.debug("Actual: %s, mejor: %s", current, best)
     if best is None or current[1] < best[1]:
         return current
     return best
 
-from copy import deepcopy
+def iteration_seeds(seed, iterations=None, start=0):
+    """
+    Deriva una semilla independiente para cada iteración a partir de la semilla maestra.
+
+    Cada iteración recibe siempre la misma semilla sin importar en qué proceso se
+    ejecute, por lo que el resultado es reproducible para cualquier número de workers.
+
+    Args:
+        seed (int): Semilla maestra (None para usar entropía del sistema).
+        iterations (int): Número de iteraciones (None = sin límite).
+        start (int): Iteraciones ya realizadas; se omiten sus semillas (para
+                     retomar una ejecución, ver `checkpoint.py`).
 
-def GRASP(iterations, seed, instance_name):
+    Yields:
+        int: Semilla de cada iteración.
     """
-    Algoritmo GRASP para resolver el problema.
+    sequence = np.random.SeedSequence(seed, n_children_spawned=start)
+    count = start
+    while iterations is None or count < iterations:
+        stream, = sequence.spawn(1)  # Igual a la `count`-ésima de `spawn(iterations)`
+        yield int(stream.generate_state(1)[0])
+        count += 1
+
+
+def fix_facilities(data, bound, upper_bound):
     """
-    data = read_instance(instance_name)  # Leer datos de entrada
-    best_solution = None
+    Cierra en `data` los centros que la cota Lagrangiana descarta para toda
+    solución de costo menor a `upper_bound` (ver `LagrangianBound.fixings`).
+
+    Returns:
+        int: Centros cerrados en esta llamada.
+    """
+    closed, opened = bound.fixings(upper_bound)
+    closed &= data["initial_capacity"] > 0
+    if closed.any():
+        data.fix_closed(closed)
+    logger.info("Fijación por costos reducidos: %d centros cerrados, %d deben abrirse",
+                int(closed.sum()), int(opened.sum()))
+    return int(closed.sum())
 
-    for i in range(iterations):  # Control del número de iteraciones
-        print(f"Iteración {i+1} de {iterations}")
-        dat = deepcopy(data)  # Copia de los datos para la iteración
-        solution, cost = greedy_randomized_construction(seed, dat)
 
-        if cost is None or solution.nnz == 0:  # Validar solución inicial
-            print("Solución inicial inválida. Continuando con la siguiente iteración...")
-            continue
+@timed("lower_bound")
+def lower_bound(data, deadline=None):
+    """
+    Calcula la cota inferior Lagrangiana de la instancia (ver `bound.py`) y
+    cierra los centros que se pueden descartar.
 
-        print(f"Solución generada con costo: {cost}")
+    La cota superior para el paso del subgradiente y la fijación es el costo de
+    la construcción greedy pura (`alpha = 0`) mejorada con la búsqueda local.
+    La fijación se hace solo aquí, antes de cualquier iteración: cambiar las
+    capacidades a mitad de la ejecución dejaría en la caché y en la memoria de
+    búsquedas resultados calculados con otras capacidades, y el espacio de
+    búsqueda dependería del número de workers.
+
+    Args:
+        data (Instance): Datos de la instancia (se cierran centros en ella).
+        deadline (Deadline): Límite de tiempo (opcional).
+
+    Returns:
+        LagrangianBound: Relajación con la mejor cota (`value`) y sus multiplicadores.
+    """
+    dat = data.copy()
+    state = construct(0, dat, 0.0, deadline)
+    if state.stop_reason == COMPLETE:
+        upper_bound = Local_Search(state.solution, dat, deadline)[1]
+    else:  # Cota trivial: todos los centros abiertos y el envío más caro
+        upper_bound = data["costos_fijos"].sum() + data["initial_demand"] @ data["costo"].max(axis=1)
 
-        solution, cost = Local_Search(solution.copy(), dat)  # Búsqueda local
-        best_solution = Update_Solution((solution, cost), best_solution)  # Actualizar mejor solución
+    bound = LagrangianBound(data)
+    bound.solve(upper_bound, deadline=deadline)
+    logger.info("Cota inferior Lagrangiana: %s (%d iteraciones)", bound.value, bound.iterations)
+    fix_facilities(data, bound, upper_bound)
+    return bound
 
-        print("-" * 100)
+
+def GRASP_iteration(seed, data, alpha=ALPHA, deadline=None, exact=False, single_source=False, policy=None):
+    """
+    Ejecuta una iteración de GRASP: construcción greedy aleatoria y búsqueda local.
+
+    Args:
+        seed (int): Semilla de la iteración.
+        data (Instance): Datos de la instancia (no se modifican).
+        alpha (float): Parámetro de la RCL.
+        deadline (Deadline): Límite de tiempo (opcional). Si se cumple durante la
+                             búsqueda local se retorna la mejor solución alcanzada.
+        exact (bool): Búsqueda local con asignación exacta (ver `Local_Search`).
+        single_source (bool): Cada cliente es atendido por un solo centro (ver `single.py`).
+        policy (SearchPolicy): Política de la búsqueda local.
+
+    Returns:
+        tuple: (solución, costo) o None si la construcción no generó una solución válida.
+    """
+    dat = data.copy()  # Copia de las capacidades y demandas residuales
+    if single_source:
+        from single import single_source_iteration
+        return single_source_iteration(seed, dat, alpha, deadline)
+
+    state = construct(seed, dat, alpha, deadline)
+    solution, cost = state.solution, state.cost
+
+    if state.stop_reason != COMPLETE:  # Validar solución inicial
+        logger.info("Solución inicial inválida (%s). Continuando con la siguiente iteración...", state.stop_reason)
+        return None
+
+    logger.debug("Solución generada con costo: %s", cost)
+
+    # Si esta misma solución ya se buscó, se reutiliza el resultado
+    searched = data.searched_memo()
+    key = solution_hash(solution)
+    result = searched.get(key)
+    if result is not None:
+        logger.debug("Solución construida ya buscada, se omite la búsqueda local")
+        return result
+
+    result = Local_Search(solution.copy(), dat, deadline, exact, policy)  # Búsqueda local
+    if not expired(deadline):  # Solo se recuerdan búsquedas completas
+        searched.put(key, result)
+    return result
+
+
+@timed("warm_start")
+def load_warm_start(file_path, data, deadline=None, exact=False, single_source=False, policy=None):
+    """
+    Solución inicial desde un archivo de resultados (ver `results.py`): se valida
+    contra la instancia y, si es factible, se mejora con la búsqueda local.
+
+    Args:
+        file_path (str): Archivo con las secciones `open [*]` y `proportion [*]`.
+        data (Instance): Datos de la instancia (no se modifican).
+        deadline (Deadline): Límite de tiempo (opcional).
+        exact (bool): Búsqueda local con asignación exacta (ver `Local_Search`).
+        single_source (bool): La solución debe tener un centro por cliente; se
+                              usa tal cual, sin búsqueda local.
+        policy (SearchPolicy): Política de la búsqueda local.
+
+    Returns:
+        tuple: (solución, costo), o None si el archivo no tiene una solución
+               factible para la instancia.
+    """
+    solution, opened = read_solution(file_path, data)
+    report = validate(solution, data, opened)
+    if not report["feasible"]:
+        logger.warning("La solución de %s no es factible para la instancia: %s", file_path, report)
+        return None
+    logger.info("Solución inicial desde %s, costo: %s", file_path, report["cost"])
+
+    if single_source:
+        if (solution.facilities != EMPTY).sum(axis=1).max(initial=0) > 1:
+            logger.warning("La solución de %s no es de fuente única", file_path)
+            return None
+        return solution, solution.evaluate(data)
+    dat = data.with_state(ResidualState.from_solution(data, solution))
+    return Local_Search(solution, dat, deadline, exact, policy)
+
+
+@timed("path_relinking")
+def relink(source, target, data, deadline=None, exact=False, policy=None):
+    """
+    Path relinking entre dos soluciones élite (ver `elite.path_relinking`),
+    seguido de la búsqueda local sobre la mejor solución intermedia.
+
+    Returns:
+        tuple: (solución, costo), o None si el camino no tuvo soluciones factibles.
+    """
+    result = path_relinking(source, target, data, deadline)
+    if result is None or expired(deadline):
+        return result
+    return Local_Search(result[0], data.copy(), deadline, exact, policy)
+
+
+def GRASP(iterations, seed, instance_name, workers=1, alpha=ALPHA, profile_path=None, nearest_k=None,
+          time_limit=None, patience=None, callback=None, exact=False, cache_size=None, gap=None,
+          single_source=False, policy=None, elite_size=0, checkpoint_path=None,
+          checkpoint_interval=CHECKPOINT_INTERVAL, resume=False, warm_start=None, mmap=False,
+          cost_dtype=np.float64, instance=None, cancel=None):
+    """
+    Algoritmo GRASP para resolver el problema.
+
+    Args:
+        iterations (int): Número de iteraciones (None = sin límite, requiere
+                          `time_limit` o `patience`).
+        seed (int): Semilla maestra.
+        instance_name (str): Ruta al archivo de la instancia.
+        workers (int): Número de procesos. Con más de uno las iteraciones se
+                       reparten en un pool de procesos (ver `parallel.py`).
+        alpha (float): Parámetro de la RCL de la construcción.
+        profile_path (str): Si se entrega, se registran tiempos y llamadas por
+                            fase (ver `instrument.py`) y el resumen JSON de la
+                            ejecución se escribe en este archivo. Si `PROFILER`
+                            ya estaba activo, los tiempos se suman a él.
+        nearest_k (int): Centros más cercanos por cliente en el índice usado por
+                         la construcción y el cierre de centros (por defecto `NEAREST_K`).
+        time_limit (float): Segundos de reloj disponibles. Se revisa también dentro
+                            de la construcción y la búsqueda local; al cumplirse se
+                            retorna la mejor solución encontrada.
+        patience (int): Detener tras este número de iteraciones seguidas sin mejorar.
+        callback (callable): Se llama después de cada iteración como
+                             `callback(iteración, mejor costo, segundos transcurridos)`.
+        exact (bool): Usar en la búsqueda local la asignación óptima por problema
+                      de transporte y la búsqueda sobre los centros abiertos.
+        cache_size (int): Conjuntos de centros abiertos guardados en la caché de
+                          asignaciones óptimas del modo `exact` (por defecto
+                          `CACHE_SIZE`; 0 la desactiva). No cambia el resultado.
+        gap (float): Brecha relativa objetivo. Si se entrega, antes de las
+                     iteraciones se calcula la cota inferior Lagrangiana (ver
+                     `lower_bound`), se informa la brecha de la mejor solución y
+                     la búsqueda se detiene al llegar a ella. Los centros que
+                     la cota descarta se cierran una sola vez, antes de las
+                     iteraciones.
+        single_source (bool): Resolver la variante de fuente única (SSCFLP): cada
+                              cliente es atendido por un solo centro. No se
+                              combina con `exact`.
+        policy (SearchPolicy): Cuándo abrir/cerrar centros y lista tabú de la
+                               búsqueda local (por defecto `SearchPolicy()`).
+        elite_size (int): Tamaño del conjunto élite (ver `elite.ElitePool`). Cada
+                          solución que entra se reconecta por path relinking con
+                          el miembro más distinto (no en fuente única). 0 = sin
+                          conjunto élite.
+        checkpoint_path (str): Si se entrega, se escriben puntos de control de la
+                               búsqueda en este archivo (ver `checkpoint.py`), en
+                               segundo plano y al terminar.
+        checkpoint_interval (float): Segundos entre puntos de control (0 = después
+                                     de cada iteración).
+        resume (bool): Retomar desde `checkpoint_path` si existe. Con los mismos
+                       argumentos, sin workers y sin límite de tiempo, el
+                       resultado es el mismo que el de la ejecución sin
+                       interrumpir (con workers, las cachés de cada proceso no
+                       se guardan).
+        warm_start (str): Archivo de resultados (`open [*]` / `proportion [*]`,
+                          ver `results.py`) con una solución anterior. Si es
+                          factible para la instancia, se mejora con la búsqueda
+                          local y entra como mejor solución (y al conjunto élite)
+                          antes de las iteraciones. No se usa al retomar.
+        mmap (bool): Dejar la matriz de costos en disco, mapeada en memoria (ver
+                     `read.read_mapped`), para instancias que no caben en RAM. La
+                     construcción y la búsqueda local la recorren por bloques de
+                     clientes; la cota Lagrangiana (`gap`) sí la carga completa.
+        cost_dtype: Tipo de la matriz de costos (`np.float32` usa la mitad de
+                    memoria o disco, con costos redondeados).
+        instance (Instance): Instancia ya leída (p. ej. la caché del servicio,
+                             ver `service.py`); si se entrega no se lee
+                             `instance_name` ni se modifica (se usa `fresh`).
+        cancel: Objeto con `is_set()`; al activarse la búsqueda se detiene como
+                con el límite de tiempo y se retorna la mejor solución.
+
+    Returns:
+        tuple: Mejor solución encontrada (solution, cost)
+    """
+    if iterations is None and time_limit is None and patience is None:
+        raise ValueError("Sin número de iteraciones se requiere time_limit o patience")
+    if exact and single_source:
+        raise ValueError("La asignación exacta no está disponible en el modo de fuente única")
+
+    profile = profile_path is not None
+    if profile:
+        PROFILER.reset()
+        PROFILER.enabled = True
+    start = perf_counter()
+    deadline = Deadline(time_limit, cancel=cancel)
+
+    if instance is None:
+        data = read_instance(instance_name, mmap=mmap, dtype=cost_dtype)  # Leer datos de entrada
+    else:
+        data = instance.fresh()
+    data.nearest_index(nearest_k)  # Índice compartido por todas las iteraciones
+    if exact:  # Caché de asignaciones óptimas, compartida por todas las iteraciones
+        data.open_set_cache(cache_size)
+    if PROFILER.enabled:
+        PROFILER.record("read_instance", perf_counter() - start)
+
+    # Con seed=None la entropía se fija aquí para poder retomar la ejecución
+    entropy = np.random.SeedSequence(seed).entropy
+    settings = {"instance": basename(instance_name), "alpha": alpha, "exact": exact,
+                "single_source": single_source, "elite_size": elite_size, "cache_size": cache_size,
+                "nearest_k": nearest_k, "warm_start": basename(warm_start) if warm_start else None,
+                "cost_dtype": np.dtype(cost_dtype).name}
+    checkpoint = None
+    if resume and checkpoint_path is not None and exists(checkpoint_path):
+        checkpoint = read_checkpoint(checkpoint_path, data["params"][1])
+        meta = checkpoint["meta"]
+        changed = [name for name, value in settings.items() if meta["settings"].get(name) != value]
+        if seed is not None and entropy != meta["entropy"]:
+            changed.append("seed")
+        if changed:
+            raise ValueError(f"El punto de control corresponde a otra ejecución ({', '.join(changed)})")
+        entropy = meta["entropy"]
+        if deadline.at is not None:  # El tiempo ya usado cuenta para el límite
+            deadline = Deadline(at=deadline.at - meta["seconds"], cancel=cancel)
+        if profile:
+            PROFILER.merge(meta["phases"])
+        logger.info("Retomando desde %s tras %d iteraciones", checkpoint_path, meta["iterations"])
+
+    bound = lower_bound(data, deadline) if gap is not None else None
+
+    best_solution = None
+    pool = ElitePool(elite_size) if elite_size else None
+    stale = 0  # Iteraciones seguidas sin mejorar
+    done = 0  # Iteraciones terminadas
+    stopped = None  # Criterio que detuvo la búsqueda ("gap" o "patience")
+    offset = 0.0  # Segundos de la ejecución retomada
+    if checkpoint is not None:
+        best_solution = restore(checkpoint, data, pool, deadline)
+        meta = checkpoint["meta"]
+        stale, done, stopped, offset = meta["stale"], meta["iterations"], meta["stopped"], meta["seconds"]
+    elif warm_start is not None:
+        best_solution = load_warm_start(warm_start, data, deadline, exact, single_source, policy)
+        if best_solution is not None and pool is not None:
+            pool.add(*best_solution)
+
+    def progress():
+        """Campos JSON del punto de control."""
+        return {"settings": settings, "entropy": entropy, "iterations": done, "stale": stale,
+                "stopped": stopped, "seconds": offset + perf_counter() - start,
+                "phases": PROFILER.summary() if PROFILER.enabled else {}}
+
+    seeds = iteration_seeds(entropy, done if stopped else iterations, start=done)
+    if workers > 1:
+        from parallel import parallel_iterations
+        results = parallel_iterations(data, seeds, workers, alpha, PROFILER.enabled, deadline, exact,
+                                      single_source, policy)
+    else:
+        seeds = takewhile(lambda _: not deadline.expired(), seeds)
+        results = (GRASP_iteration(s, data, alpha, deadline, exact, single_source, policy) for s in seeds)
+
+    checkpointer = Checkpointer(checkpoint_path, checkpoint_interval) if checkpoint_path else None
+    try:
+        for i, result in enumerate(results, start=done):  # Control del número de iteraciones
+            done = i + 1
+            previous = best_solution
+            if result is not None:
+                best_solution = Update_Solution(result, best_solution)  # Actualizar mejor solución
+                if pool is not None and pool.add(*result) and not single_source:
+                    partner = pool.farthest(result[0])
+                    relinked = relink(result[0], partner[0], data, deadline, exact, policy) if partner else None
+                    if relinked is not None:
+                        best_solution = Update_Solution(relinked, best_solution)
+                        pool.add(*relinked)
+            stale = 0 if best_solution is not previous else stale + 1
+
+            best_cost = best_solution[1] if best_solution else None
+            logger.info("Iteración %d de %s, mejor costo: %s", done, iterations, best_cost)
+            if callback is not None:
+                callback(done, best_cost, offset + perf_counter() - start)
+
+            if bound is not None and best_solution is not None:
+                current_gap = relative_gap(best_cost, bound.value)
+                logger.info("Cota inferior: %s, brecha: %.4f", bound.value, current_gap)
+                if current_gap <= gap:
+                    logger.info("Brecha objetivo alcanzada")
+                    stopped = "gap"
+                    break
+
+            if patience is not None and stale >= patience:
+                logger.info("Sin mejoras en %d iteraciones, se detiene la búsqueda", stale)
+                stopped = "patience"
+                break
+
+            if checkpointer is not None and checkpointer.due():
+                checkpointer.save(snapshot(progress(), data, best_solution, pool))
+        if checkpointer is not None:  # Punto de control final
+            checkpointer.save(snapshot(progress(), data, best_solution, pool))
+    finally:
+        results.close()  # Libera las iteraciones pendientes (p. ej. en el pool de procesos)
+        if checkpointer is not None:
+            checkpointer.close()
+    if cancel is not None and cancel.is_set():
+        logger.info("Búsqueda cancelada")
+    elif deadline.expired():
+        logger.info("Límite de tiempo alcanzado")
+    if data.cache is not None:
+        logger.info("Caché de conjuntos abiertos: %s", data.cache.stats())
+    if pool is not None:
+        logger.info("Conjunto élite: %d soluciones", len(pool))
+
+    if profile:
+        PROFILER.enabled = False
+        PROFILER.to_json(profile_path, instance=instance_name, iterations=iterations, seed=seed,
+                         workers=workers, alpha=alpha, exact=exact, single_source=single_source,
+                         elite_size=elite_size,
+                         seconds=offset + perf_counter() - start,
+                         cost=best_solution[1] if best_solution else None,
+                         lower_bound=bound.value if bound else None)
 
     # Retornar la mejor solución encontrada
     if best_solution is None:
-        print("No se encontró una solución válida en ninguna iteración.")
-        return dok_matrix((data["params"][0], data["params"][1]), dtype=float), float('inf')
+        logger.warning("No se encontró una solución válida en ninguna iteración.")
+        return Solution(data["params"][0], data["params"][1]), float('inf')
 
     return best_solution
-
-    
\ No newline at end of file
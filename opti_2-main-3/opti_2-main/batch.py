@@ -0,0 +1,162 @@
+"""
+Resolución no interactiva de varias instancias y semillas en paralelo.
+
+Cada combinación (instancia, semilla) se resuelve con GRASP en un pool de
+procesos acotado, y cada resultado se escribe como una línea JSON o una fila
+CSV apenas termina.
+
+Uso:
+    python batch.py "../intances_abc_dat/cap*.txt" --seeds 1 2 3 --iterations 20 --jobs 4
+    python batch.py capa8000.txt --seeds 1 --time-limit 30 --output resultados.csv
+"""
+import argparse
+import csv
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from glob import glob
+from os.path import basename
+from time import perf_counter
+
+# Campos de cada registro, en el orden de las columnas del CSV
+FIELDS = ("instance", "seed", "iterations", "time_limit", "status", "cost", "n_open",
+          "open_facilities", "read_seconds", "construction_seconds", "local_search_seconds",
+          "total_seconds", "error")
+
+
+def solve(file_path, seed, iterations, time_limit=None, patience=None, alpha=None):
+    """
+    Resuelve una instancia con GRASP y retorna el registro del resultado.
+
+    Returns:
+        dict: Registro con los campos de `FIELDS`.
+    """
+    from GRASP import GRASP, ALPHA
+    from instrument import PROFILER
+
+    record = dict.fromkeys(FIELDS)
+    record.update(instance=basename(file_path), seed=seed, iterations=iterations, time_limit=time_limit)
+
+    PROFILER.reset()
+    PROFILER.enabled = True
+    start = perf_counter()
+    try:
+        solution, cost = GRASP(iterations, seed, file_path, alpha=ALPHA if alpha is None else alpha,
+                               time_limit=time_limit, patience=patience)
+    except Exception as error:  # Se registra y se continúa con el resto del lote
+        record.update(status="error", error=f"{type(error).__name__}: {error}")
+        return record
+    finally:
+        record["total_seconds"] = perf_counter() - start
+        PROFILER.enabled = False
+
+    phases = PROFILER.summary()
+    open_facilities = solution.open_facilities().tolist()
+    record.update(
+        status="ok" if cost != float('inf') else "infeasible",
+        cost=None if cost == float('inf') else float(cost),
+        n_open=len(open_facilities),
+        open_facilities=open_facilities,
+        read_seconds=phases.get("read_instance", {}).get("seconds", 0.0),
+        construction_seconds=phases.get("construction", {}).get("seconds", 0.0),
+        local_search_seconds=phases.get("local_search", {}).get("seconds", 0.0),
+    )
+    return record
+
+
+class RecordWriter:
+    """
+    Escribe registros como JSON Lines (`.jsonl`/`.json`) o CSV (`.csv`), uno por
+    línea, a medida que llegan.
+    """
+
+    def __init__(self, file_path, format=None):
+        self.format = format or ("csv" if file_path.endswith(".csv") else "jsonl")
+        self.file = open(file_path, 'w', newline='')
+        if self.format == "csv":
+            self.writer = csv.DictWriter(self.file, fieldnames=FIELDS)
+            self.writer.writeheader()
+
+    def write(self, record):
+        if self.format == "csv":
+            row = dict(record)
+            row["open_facilities"] = " ".join(map(str, record["open_facilities"] or []))
+            self.writer.writerow(row)
+        else:
+            self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def expand(patterns):
+    """Rutas de instancias a partir de nombres de archivo o patrones glob."""
+    files = []
+    for pattern in patterns:
+        matches = sorted(glob(pattern))
+        files.extend(matches if matches else [pattern])
+    return files
+
+
+def run_batch(instances, seeds, iterations, output, jobs=1, time_limit=None, patience=None,
+              alpha=None, format=None):
+    """
+    Resuelve cada combinación (instancia, semilla) en un pool de `jobs` procesos.
+
+    Args:
+        instances (list): Rutas de las instancias.
+        seeds (list): Semillas.
+        iterations (int): Iteraciones de GRASP por resolución (None = según los límites).
+        output (str): Archivo de salida (`.jsonl` o `.csv`).
+        jobs (int): Resoluciones simultáneas.
+        time_limit (float): Segundos por resolución.
+        patience (int): Iteraciones sin mejora antes de detener cada resolución.
+        alpha (float): Parámetro de la RCL.
+        format (str): `jsonl` o `csv` (por defecto según la extensión de `output`).
+
+    Returns:
+        list: Registros en el orden en que terminaron.
+    """
+    records = []
+    with RecordWriter(output, format) as writer, ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(solve, file_path, seed, iterations, time_limit, patience, alpha)
+                   for file_path in instances for seed in seeds]
+        for future in as_completed(futures):
+            record = future.result()
+            writer.write(record)
+            records.append(record)
+            print(f"{record['instance']:<16} seed={record['seed']:<6} {record['status']:<10} "
+                  f"cost={record['cost']} t={record['total_seconds']:.2f}s", file=sys.stderr)
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("instances", nargs="+", help="Archivos o patrones glob de instancias")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[1])
+    parser.add_argument("--iterations", type=int, default=None)
+    parser.add_argument("--time-limit", type=float, default=None, help="Segundos por resolución")
+    parser.add_argument("--patience", type=int, default=None)
+    parser.add_argument("--alpha", type=float, default=None)
+    parser.add_argument("--jobs", type=int, default=1, help="Resoluciones simultáneas")
+    parser.add_argument("--output", default="batch_results.jsonl")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default=None)
+    args = parser.parse_args(argv)
+
+    if args.iterations is None and args.time_limit is None and args.patience is None:
+        parser.error("se requiere --iterations, --time-limit o --patience")
+
+    records = run_batch(expand(args.instances), args.seeds, args.iterations, args.output, args.jobs,
+                        args.time_limit, args.patience, args.alpha, args.format)
+    return 0 if all(record["status"] != "error" for record in records) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+Benchmark reproducible de GRASP sobre las instancias ABC incluidas en el repositorio.
+
+Uso:
+    python bench.py run --iterations 3 --seeds 1 2 3 --output bench_results.json
+    python bench.py compare baseline.json bench_results.json
+"""
+import argparse
+import json
+import platform
+import resource
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from glob import glob
+from os.path import abspath, basename, dirname, join
+from time import perf_counter
+
+# Directorio con las instancias capa*/capb*/capc* del repositorio
+INSTANCES_DIR = join(dirname(abspath(__file__)), "..", "intances_abc_dat")
+
+# Tolerancias por defecto del modo `compare`
+TIME_TOLERANCE = 0.20   # 20% más lento se considera regresión
+COST_TOLERANCE = 0.0    # Cualquier aumento del mejor costo es regresión
+
+
+def bench_instance(file_path, seed, iterations, workers=1, alpha=None):
+    """
+    Resuelve una instancia con GRASP y mide tiempos, memoria y calidad.
+
+    Se ejecuta en un proceso nuevo (ver `run`) para que el pico de memoria
+    corresponda solo a esta instancia.
+
+    Returns:
+        dict: Registro del benchmark.
+    """
+    import numpy as np
+    from GRASP import GRASP, ALPHA
+    from instrument import PROFILER
+    from read import read_instance
+
+    alpha = ALPHA if alpha is None else alpha
+
+    start = perf_counter()
+    read_instance(file_path, cache=False)
+    parse_seconds = perf_counter() - start
+
+    read_instance(file_path)  # Deja la instancia en la caché binaria
+    start = perf_counter()
+    read_instance(file_path)
+    cache_seconds = perf_counter() - start
+
+    PROFILER.reset()
+    PROFILER.enabled = True
+    start = perf_counter()
+    _, cost = GRASP(iterations, seed, file_path, workers=workers, alpha=alpha)
+    total_seconds = perf_counter() - start
+    PROFILER.enabled = False
+    phases = PROFILER.summary()
+
+    def phase_seconds(name):
+        return phases.get(name, {}).get("seconds", 0.0)
+
+    peak_rss = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return {
+        "instance": basename(file_path),
+        "seed": seed,
+        "iterations": iterations,
+        "workers": workers,
+        "alpha": alpha,
+        "parse_seconds": parse_seconds,
+        "cache_load_seconds": cache_seconds,
+        "construction_seconds": phase_seconds("construction"),
+        "local_search_seconds": phase_seconds("local_search"),
+        "total_seconds": total_seconds,
+        "iterations_per_second": iterations / total_seconds if total_seconds > 0 else None,
+        "peak_rss_kb": peak_rss,
+        "best_cost": None if cost == float('inf') else float(cost),
+        "numpy": np.__version__,
+    }
+
+
+def run(instances, seeds, iterations, workers=1, alpha=None, output=None):
+    """
+    Ejecuta el benchmark para cada instancia y semilla.
+
+    Args:
+        instances (list): Rutas de las instancias.
+        seeds (list): Semillas a usar en cada instancia.
+        iterations (int): Iteraciones de GRASP por ejecución.
+        workers (int): Procesos de GRASP por ejecución.
+        alpha (float): Parámetro de la RCL (por defecto el de GRASP).
+        output (str): Archivo JSON de salida (opcional).
+
+    Returns:
+        dict: Resultados con metadatos de la máquina.
+    """
+    results = []
+    for file_path in instances:
+        for seed in seeds:
+            # Un proceso nuevo por ejecución: el pico de RSS no se arrastra entre instancias
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                record = pool.submit(bench_instance, file_path, seed, iterations, workers, alpha).result()
+            results.append(record)
+            print(f"{record['instance']:<16} seed={seed:<6} cost={str(record['best_cost']):<20} "
+                  f"total={record['total_seconds']:.3f}s it/s={record['iterations_per_second']:.3f} "
+                  f"rss={record['peak_rss_kb']}KB")
+
+    report = {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+        },
+        "results": results,
+    }
+    if output is not None:
+        with open(output, 'w') as file:
+            json.dump(report, file, indent=2)
+    return report
+
+
+def compare(baseline, current, time_tolerance=TIME_TOLERANCE, cost_tolerance=COST_TOLERANCE):
+    """
+    Compara dos resultados de `run` y lista las regresiones.
+
+    Una ejecución (instancia, semilla, iteraciones) tiene regresión de tiempo si
+    `total_seconds` supera el de la línea base en más de `time_tolerance`, y de
+    calidad si `best_cost` la supera en más de `cost_tolerance` (relativos).
+
+    Returns:
+        list: Mensajes con las regresiones encontradas.
+    """
+    def key(record):
+        return record["instance"], record["seed"], record["iterations"], record.get("workers", 1)
+
+    base = {key(record): record for record in baseline["results"]}
+    regressions = []
+    for record in current["results"]:
+        old = base.get(key(record))
+        if old is None:
+            continue
+        name = "{} seed={} iterations={} workers={}".format(*key(record))
+
+        if record["total_seconds"] > old["total_seconds"] * (1 + time_tolerance):
+            regressions.append(f"TIEMPO  {name}: {old['total_seconds']:.3f}s -> {record['total_seconds']:.3f}s")
+
+        old_cost, new_cost = old["best_cost"], record["best_cost"]
+        if new_cost is None and old_cost is not None:
+            regressions.append(f"CALIDAD {name}: {old_cost} -> sin solución")
+        elif None not in (old_cost, new_cost) and new_cost > old_cost * (1 + cost_tolerance) + 1e-9:
+            regressions.append(f"CALIDAD {name}: {old_cost} -> {new_cost}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Ejecutar el benchmark")
+    run_parser.add_argument("instances", nargs="*", help="Instancias (por defecto todas las de intances_abc_dat)")
+    run_parser.add_argument("--seeds", type=int, nargs="+", default=[1])
+    run_parser.add_argument("--iterations", type=int, default=3)
+    run_parser.add_argument("--workers", type=int, default=1)
+    run_parser.add_argument("--alpha", type=float, default=None)
+    run_parser.add_argument("--output", default="bench_results.json")
+
+    compare_parser = commands.add_parser("compare", help="Comparar contra una línea base")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    compare_parser.add_argument("--cost-tolerance", type=float, default=COST_TOLERANCE)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        instances = args.instances or sorted(glob(join(INSTANCES_DIR, "cap*.txt")))
+        run(instances, args.seeds, args.iterations, args.workers, args.alpha, args.output)
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.current) as file:
+        current = json.load(file)
+    regressions = compare(baseline, current, args.time_tolerance, args.cost_tolerance)
+    for message in regressions:
+        print(message)
+    print(f"{len(regressions)} regresiones")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+Cota inferior por relajación Lagrangiana de las restricciones de demanda.
+
+Con multiplicadores `lambda` (uno por cliente) la relajación se separa por centro:
+si el centro i está abierto, su mejor envío es una mochila continua
+
+    v_i = f_i + min  sum_j (c_ij - lambda_j) x_ij
+                s.a. sum_j x_ij <= s_i,  0 <= x_ij <= d_j
+
+que se resuelve tomando los clientes en orden de costo reducido. Los centros se
+eligen con la relajación lineal de `sum_i s_i y_i >= demanda total` (restricción
+válida que refuerza la cota), y
+
+    L(lambda) = sum_j lambda_j d_j + sum_i v_i y_i
+
+es una cota inferior del costo óptimo. Los multiplicadores se ajustan con el
+método del subgradiente (paso de Polyak respecto de una cota superior).
+"""
+import numpy as np
+
+from deadline import expired
+
+# Iteraciones del subgradiente
+BOUND_ITERATIONS = 300
+
+# Iteraciones sin mejorar la cota antes de reducir el paso a la mitad
+STEP_PATIENCE = 20
+
+# Paso mínimo (relativo) antes de detener el subgradiente
+MIN_STEP = 1e-4
+
+
+class LagrangianBound:
+    """
+    Relajación Lagrangiana de una instancia.
+
+    Args:
+        data (Instance): Datos de la instancia (se usan los valores iniciales).
+    """
+
+    def __init__(self, data):
+        self.costo = np.asarray(data["costo"], dtype=np.float64)
+        self.demand = np.asarray(data["initial_demand"], dtype=np.float64)
+        self.capacity = np.asarray(data["initial_capacity"], dtype=np.float64)
+        self.costos_fijos = np.asarray(data["costos_fijos"], dtype=np.float64)
+        self.total_demand = self.demand.sum()
+
+        # Multiplicadores iniciales: menor costo unitario, contando el costo fijo
+        unit = self.costo + np.divide(self.costos_fijos, self.capacity, out=np.full_like(self.capacity, np.inf),
+                                      where=self.capacity > 0)
+        self.multipliers = unit.min(axis=1)
+        self.value = -np.inf
+        self.facility_values = None  # v_i de los mejores multiplicadores
+        self.iterations = 0
+
+    def facility_subproblems(self, multipliers):
+        """
+        Resuelve la mochila continua de todos los centros a la vez.
+
+        Returns:
+            tuple: (v, x) con v el valor de abrir cada centro (F,) y x los envíos
+                   (clientes x centros) de cada centro si está abierto.
+        """
+        reduced = self.costo - multipliers[:, None]
+        order = np.argsort(reduced, axis=0, kind="stable")
+        ordered = np.take_along_axis(reduced, order, axis=0)
+        demand = self.demand[order]
+        before = np.cumsum(demand, axis=0) - demand  # Demanda tomada antes de cada cliente
+        take = np.clip(self.capacity[None, :] - before, 0.0, demand)
+        take[ordered >= 0] = 0.0
+
+        x = np.empty_like(take)
+        np.put_along_axis(x, order, take, axis=0)
+        return self.costos_fijos + (ordered * take).sum(axis=0), x
+
+    def select(self, values, fixed=None):
+        """
+        Relajación lineal de la elección de centros: abre los de valor negativo
+        y, si no alcanza la demanda total, agrega los de menor valor por unidad
+        de capacidad (el último de forma fraccional).
+
+        Args:
+            values (ndarray): Valor de abrir cada centro.
+            fixed (tuple): (centro, 0 o 1) para forzar un centro cerrado o abierto.
+
+        Returns:
+            tuple: (y, valor) con y en [0, 1] por centro.
+        """
+        free = np.ones(len(values), dtype=bool)
+        y = np.zeros(len(values))
+        if fixed is not None:
+            facility, state = fixed
+            free[facility] = False
+            y[facility] = state
+
+        y[free & (values < 0)] = 1.0
+        missing = self.total_demand - self.capacity @ y
+        if missing > 0:
+            candidates = np.flatnonzero(free & (y == 0) & (self.capacity > 0))
+            candidates = candidates[np.argsort(values[candidates] / self.capacity[candidates], kind="stable")]
+            for facility in candidates.tolist():
+                y[facility] = min(1.0, missing / self.capacity[facility])
+                missing -= self.capacity[facility]
+                if missing <= 0:
+                    break
+            if missing > 0:  # Ni abriendo todo se cubre la demanda
+                return y, np.inf
+        return y, float(values @ y)
+
+    def evaluate(self, multipliers):
+        """
+        Returns:
+            tuple: (cota L(lambda), valores v, subgradiente por cliente)
+        """
+        values, x = self.facility_subproblems(multipliers)
+        y, selected = self.select(values)
+        subgradient = self.demand - x @ y
+        return float(multipliers @ self.demand) + selected, values, subgradient
+
+    def solve(self, upper_bound, iterations=BOUND_ITERATIONS, deadline=None):
+        """
+        Mejora la cota con el método del subgradiente.
+
+        Args:
+            upper_bound (float): Costo de una solución factible (para el paso de Polyak).
+            iterations (int): Iteraciones como máximo.
+            deadline (Deadline): Límite de tiempo (opcional).
+
+        Returns:
+            float: Mejor cota inferior encontrada.
+        """
+        multipliers = self.multipliers.copy()
+        step, stale = 2.0, 0
+        for _ in range(iterations):
+            if expired(deadline) or step < MIN_STEP:
+                break
+            value, values, subgradient = self.evaluate(multipliers)
+            self.iterations += 1
+            if value > self.value:
+                self.value, self.facility_values, self.multipliers = value, values, multipliers.copy()
+                stale = 0
+            else:
+                stale += 1
+                if stale >= STEP_PATIENCE:
+                    step, stale = step / 2, 0
+
+            norm = float(subgradient @ subgradient)
+            if norm <= 1e-12 or upper_bound - value <= 1e-9 * abs(upper_bound):
+                break  # Los envíos cubren la demanda o la cota alcanzó a la solución
+            multipliers = multipliers + step * (upper_bound - value) / norm * subgradient
+        return self.value
+
+    def fixings(self, upper_bound):
+        """
+        Fijación por costos reducidos: si forzar un centro abierto (o cerrado)
+        hace que la cota supere `upper_bound`, toda solución mejor que ella lo
+        tiene cerrado (o abierto).
+
+        Returns:
+            tuple: (máscara de centros que se pueden cerrar, máscara de centros
+                    que deben quedar abiertos)
+        """
+        closed = np.zeros(len(self.capacity), dtype=bool)
+        opened = np.zeros(len(self.capacity), dtype=bool)
+        if self.facility_values is None:
+            return closed, opened
+
+        base = float(self.multipliers @ self.demand)
+        threshold = upper_bound + 1e-9 * abs(upper_bound)
+        for facility in range(len(self.capacity)):
+            closed[facility] = base + self.select(self.facility_values, (facility, 1.0))[1] > threshold
+            opened[facility] = base + self.select(self.facility_values, (facility, 0.0))[1] > threshold
+        return closed, opened
+
+
+def relative_gap(upper_bound, lower_bound):
+    """Brecha relativa entre el costo de una solución y la cota inferior."""
+    if upper_bound is None or not np.isfinite(upper_bound) or upper_bound <= 0:
+        return np.inf
+    return max(0.0, (upper_bound - lower_bound) / upper_bound)
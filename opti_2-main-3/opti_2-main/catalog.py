@@ -0,0 +1,157 @@
+import mmap
+import re
+from os import listdir
+from os.path import basename, isdir, isfile, join, splitext
+
+import numpy as np
+
+# Extensión de los archivos de instancia
+SUFFIX = ".txt"
+
+# Secciones del archivo, en el orden en que aparecen
+SECTIONS = ("capacity", "in_cost", "demand", "cost")
+
+# Líneas de encabezado: `param C := 100;` (centros) y `param F := 1000;` (clientes)
+HEADER = re.compile(r"param\s+([CF])\s*:=\s*(\d+)\s*;")
+
+
+class InstanceFile:
+    """
+    Entrada del catálogo: un archivo de instancia del que solo se leyó el encabezado.
+
+    Las dimensiones salen de las líneas `param C := ...;` y `param F := ...;`. La
+    posición de cada sección se busca la primera vez que se pide una sección, y
+    cada sección se parsea solo cuando se solicita.
+
+    Args:
+        path (str): Ruta al archivo.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.name = splitext(basename(path))[0]
+        self.dims = read_header(path)
+        self._offsets = None
+
+    def __repr__(self):
+        return f"InstanceFile({self.name!r}, dims={self.dims})"
+
+    def offsets(self):
+        """
+        Posición (en bytes) de los datos de cada sección: desde después de su `:=`
+        hasta el `;` que la cierra.
+
+        Returns:
+            dict: {sección: (inicio, fin)}
+        """
+        if self._offsets is None:
+            self._offsets = {}
+            with open(self.path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                position = 0
+                for section in SECTIONS:
+                    label = mm.find(b"param " + section.encode(), position)
+                    if label < 0:
+                        continue
+                    start = mm.find(b":=", label) + 2
+                    end = mm.find(b";", start)
+                    self._offsets[section] = (start, end)
+                    position = end
+        return self._offsets
+
+    def facilities(self):
+        """Número de centros: del encabezado o, si falta, de las columnas de `param cost`."""
+        if self.dims:
+            return self.dims[0]
+        start, _ = self.offsets()["cost"]
+        with open(self.path, 'rb') as file:
+            head = file.read(start)
+        return len(head[head.rfind(b"param cost"):].split()) - 4  # param cost : 1 ... C :=
+
+    def section(self, name):
+        """
+        Carga una sección del archivo.
+
+        Args:
+            name (str): `capacity`, `in_cost`, `demand` o `cost`.
+
+        Returns:
+            ndarray: Vector de valores, o matriz (clientes x centros) para `cost`.
+        """
+        if name not in self.offsets():
+            raise KeyError(f"La instancia {self.name} no tiene la sección {name}")
+        start, end = self.offsets()[name]
+        with open(self.path, 'rb') as file:
+            file.seek(start)
+            text = file.read(end - start)
+
+        values = np.array(text.split(), dtype=np.float64)
+        if name != "cost":
+            return values.reshape(-1, 2)[:, 1]  # Líneas `índice valor`
+        return values.reshape(-1, self.facilities() + 1)[:, 1:]  # Líneas `cliente costo_1 ... costo_C`
+
+    def load(self):
+        """Carga la instancia completa con `read_instance` (usa la caché binaria)."""
+        from read import read_instance
+        return read_instance(self.path)
+
+
+def read_header(path):
+    """
+    Lee solo el encabezado de una instancia.
+
+    Returns:
+        list: [número de centros, número de clientes], o None si el archivo no
+              tiene las líneas `param C` / `param F`.
+    """
+    found = {}
+    with open(path, 'r') as file:
+        for line in file:
+            match = HEADER.search(line)
+            if match:
+                found[match.group(1)] = int(match.group(2))
+            elif line.lstrip().startswith("param"):
+                break  # Comenzó la primera sección de datos
+            if len(found) == 2:
+                break
+    if len(found) < 2:
+        return None
+    return [found["C"], found["F"]]
+
+
+class Catalog:
+    """
+    Catálogo de las instancias de un directorio.
+
+    Solo lee el encabezado de cada archivo `.txt`, por lo que listar cientos de
+    instancias es inmediato; los datos se cargan al pedir una instancia.
+
+    Args:
+        path (str): Directorio de las instancias.
+    """
+
+    def __init__(self, path):
+        if not isdir(path):
+            raise NotADirectoryError(f"La ruta proporcionada no es un directorio válido: {path}")
+        self.path = path
+        self.entries = [InstanceFile(join(path, option)) for option in sorted(listdir(path))
+                        if option.endswith(SUFFIX) and isfile(join(path, option))]
+        self._by_name = {entry.name: entry for entry in self.entries}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __getitem__(self, key):
+        """Entrada por nombre (sin `.txt`) o por posición."""
+        if isinstance(key, str):
+            return self._by_name[key]
+        return self.entries[key]
+
+    def options(self):
+        """
+        Returns:
+            list: [nombre, dimensiones] de cada instancia, como `read_options`.
+        """
+        return [[entry.name, entry.dims] for entry in self.entries]
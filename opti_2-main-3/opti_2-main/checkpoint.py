@@ -0,0 +1,237 @@
+"""
+Puntos de control de GRASP para retomar ejecuciones largas.
+
+Un punto de control es un `.npz` comprimido y sin pickle con lo que determina
+el resto de la búsqueda:
+
+    - iteraciones terminadas y entropía de la semilla maestra (las semillas de
+      las iteraciones siguientes se derivan de ellas, ver `iteration_seeds`),
+    - mejor solución y conjunto élite, cada solución en su formato de
+      posiciones por cliente (`Solution.facilities` / `amounts`) con su carga y
+      conteo,
+    - claves (en orden LRU) de la caché de asignaciones óptimas,
+    - centros cerrados por la cota Lagrangiana, iteraciones sin mejora, segundos
+      transcurridos y tiempos por fase.
+
+Las asignaciones de la caché y la memoria de soluciones buscadas no se guardan:
+dependen solo de su clave (ver `memo.OpenSetCache` y `elite.SearchedMemo`), así
+que al retomar la caché se reconstruye resolviendo de nuevo sus conjuntos (ver
+`rebuild_cache`) y la memoria se vuelve a llenar sola, sin cambiar el resultado.
+
+La escritura se hace en un hilo aparte: el ciclo de GRASP solo toma referencias
+a las soluciones (que no se modifican una vez guardadas) y el hilo las empaqueta
+y escribe en un archivo temporal que luego reemplaza al anterior (`os.replace`),
+de modo que en disco siempre hay un punto de control completo.
+"""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+
+import numpy as np
+
+from deadline import expired
+from elite import solution_hash
+from solution import Solution
+from transport import solve_transport
+
+# Segundos entre puntos de control
+CHECKPOINT_INTERVAL = 30.0
+
+# Versión del formato
+VERSION = 2
+
+# Grupos de soluciones guardados
+GROUPS = ("best", "elite")
+
+
+def pack_solutions(prefix, solutions, costs):
+    """
+    Arreglos de un grupo de soluciones, con nombres `{prefix}_...`.
+
+    Las filas de todas las soluciones se concatenan; `{prefix}_slots` guarda el
+    ancho de fila de cada una para separarlas al leer.
+    """
+    n_facilities = len(solutions[0].load) if solutions else 0
+    return {
+        f"{prefix}_slots": np.array([s.facilities.shape[1] for s in solutions], dtype=np.int32),
+        f"{prefix}_facilities": np.concatenate([s.facilities.ravel() for s in solutions]
+                                               or [np.empty(0, dtype=np.int32)]),
+        f"{prefix}_amounts": np.concatenate([s.amounts.ravel() for s in solutions] or [np.empty(0)]),
+        f"{prefix}_load": np.array([s.load for s in solutions]).reshape(len(solutions), n_facilities),
+        f"{prefix}_count": np.array([s.count for s in solutions],
+                                    dtype=np.int32).reshape(len(solutions), n_facilities),
+        f"{prefix}_cached": np.array([np.nan if s.cost is None else s.cost for s in solutions], dtype=float),
+        f"{prefix}_costs": np.array(costs, dtype=float),
+    }
+
+
+def unpack_solutions(arrays, prefix, n_clients):
+    """
+    Soluciones y costos de un grupo guardado con `pack_solutions`.
+
+    Returns:
+        tuple: (lista de Solution, lista de costos)
+    """
+    facilities, amounts = arrays[f"{prefix}_facilities"], arrays[f"{prefix}_amounts"]
+    loads, counts, cached = arrays[f"{prefix}_load"], arrays[f"{prefix}_count"], arrays[f"{prefix}_cached"]
+    solutions, start = [], 0
+    for i, slots in enumerate(arrays[f"{prefix}_slots"].tolist()):
+        end = start + n_clients * slots
+        solution = object.__new__(Solution)
+        solution.facilities = facilities[start:end].reshape(n_clients, slots).copy()
+        solution.amounts = amounts[start:end].reshape(n_clients, slots).copy()
+        solution.load = loads[i].copy()
+        solution.count = counts[i].copy()
+        solution.cost = None if np.isnan(cached[i]) else float(cached[i])
+        solutions.append(solution)
+        start = end
+    return solutions, arrays[f"{prefix}_costs"].tolist()
+
+
+def snapshot(meta, data, best, pool=None):
+    """
+    Estado de la búsqueda para `write_checkpoint`, sin copiar soluciones.
+
+    Args:
+        meta (dict): Campos JSON (iteraciones, entropía, segundos, ...).
+        data (Instance): Instancia (caché y centros cerrados).
+        best (tuple): Mejor (solución, costo) o None.
+        pool (ElitePool): Conjunto élite (opcional).
+
+    Returns:
+        dict: Estado a escribir.
+    """
+    cache = data.cache  # Solo existe en el modo `exact`
+    searched = data.searched_memo()
+    meta = dict(meta, version=VERSION, cache_hits=cache.hits if cache is not None else 0,
+                cache_misses=cache.misses if cache is not None else 0, searched_hits=searched.hits)
+    return {
+        "meta": meta,
+        "closed": data["initial_capacity"] == 0,
+        "best": [best] if best is not None else [],
+        "elite": [(solution, cost) for solution, cost, _ in pool.members] if pool is not None else [],
+        "cache": list(cache.entries) if cache is not None else [],
+    }
+
+
+def write_checkpoint(file_path, state):
+    """Escribe el estado de `snapshot` de forma atómica (archivo temporal y reemplazo)."""
+    arrays = {
+        "meta": np.frombuffer(json.dumps(state["meta"]).encode(), dtype=np.uint8),
+        "closed": state["closed"],
+        "cache_keys": np.array([np.frombuffer(key, dtype=np.uint8) for key in state["cache"]], dtype=np.uint8),
+    }
+    for prefix in GROUPS:
+        pairs = state[prefix]
+        arrays.update(pack_solutions(prefix, [s for s, _ in pairs], [c for _, c in pairs]))
+
+    tmp = f"{file_path}.tmp"
+    with open(tmp, 'wb') as file:
+        np.savez_compressed(file, **arrays)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp, file_path)
+
+
+def read_checkpoint(file_path, n_clients):
+    """
+    Lee un punto de control escrito con `write_checkpoint`.
+
+    Returns:
+        dict: "meta", "closed", "cache" (lista de claves) y, por grupo, la lista
+              de pares (solución, costo).
+    """
+    with np.load(file_path) as arrays:
+        meta = json.loads(arrays["meta"].tobytes().decode())
+        if meta.get("version") != VERSION:
+            raise ValueError(f"Versión de punto de control no soportada: {meta.get('version')}")
+        groups = {prefix: unpack_solutions(arrays, prefix, n_clients) for prefix in GROUPS}
+        cache_keys = [key.tobytes() for key in arrays["cache_keys"]]
+        closed = arrays["closed"].copy()
+    return {"meta": meta, "closed": closed, "best": list(zip(*groups["best"])),
+            "elite": list(zip(*groups["elite"])), "cache": cache_keys}
+
+
+def rebuild_cache(data, keys, deadline=None):
+    """
+    Vuelve a llenar la caché de asignaciones óptimas resolviendo el transporte
+    de cada conjunto guardado, en el mismo orden LRU. Es solo una aceleración:
+    si se cumple el límite de tiempo se deja de reconstruir.
+    """
+    cache = data.open_set_cache()
+    for key in keys:
+        if expired(deadline):
+            break
+        solution, optimal = solve_transport(data, cache.facilities(key), deadline=deadline)
+        if optimal:
+            cache.put(key, solution, solution.evaluate(data))
+
+
+def restore(checkpoint, data, pool=None, deadline=None):
+    """
+    Carga en la instancia los centros cerrados de un punto de control y, si
+    tiene caché (modo `exact`), la reconstruye (ver `rebuild_cache`); en `pool`
+    carga su conjunto élite.
+
+    Returns:
+        tuple: Mejor (solución, costo) guardada, o None.
+    """
+    closed = checkpoint["closed"] & (data["initial_capacity"] > 0)
+    if closed.any():
+        data.fix_closed(closed)
+
+    meta = checkpoint["meta"]
+    cache = data.cache
+    if cache is not None:
+        cache.entries.clear()
+        rebuild_cache(data, checkpoint["cache"], deadline)
+        cache.hits, cache.misses = meta["cache_hits"], meta["cache_misses"]
+    data.searched_memo().hits = meta["searched_hits"]
+
+    if pool is not None:
+        pool.members = [[solution, cost, solution_hash(solution)] for solution, cost in checkpoint["elite"]]
+    return checkpoint["best"][0] if checkpoint["best"] else None
+
+
+class Checkpointer:
+    """
+    Escritor de puntos de control en segundo plano.
+
+    Args:
+        file_path (str): Archivo del punto de control.
+        interval (float): Segundos entre puntos de control (0 = después de cada
+                          iteración).
+    """
+
+    def __init__(self, file_path, interval=CHECKPOINT_INTERVAL):
+        self.file_path = file_path
+        self.interval = interval
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.pending = None
+        self.written = 0
+        self.next_at = monotonic() + interval
+
+    def due(self):
+        """True si toca un punto de control y el anterior ya terminó de escribirse."""
+        return monotonic() >= self.next_at and (self.pending is None or self.pending.done())
+
+    def save(self, state):
+        """Escribe el estado (ver `snapshot`) sin bloquear a quien llama."""
+        self._check()
+        self.pending = self.executor.submit(write_checkpoint, self.file_path, state)
+        self.next_at = monotonic() + self.interval
+
+    def close(self):
+        """Espera la escritura pendiente y libera el hilo."""
+        try:
+            self._check()
+        finally:
+            self.executor.shutdown(wait=True)
+
+    def _check(self):
+        """Propaga el error de la última escritura, si lo hubo."""
+        if self.pending is not None:
+            self.pending.result()
+            self.written += 1
+            self.pending = None
@@ -0,0 +1,89 @@
+"""
+Matriz de costos en disco para instancias que no caben en memoria.
+
+La matriz (clientes x centros) se guarda como `.npy` binario, en float64 o
+float32, y se abre con `np.load(..., mmap_mode='r')`: el sistema operativo trae
+a memoria solo las filas (clientes) que se leen. Como cada cliente es una fila
+contigua, los recorridos completos de la matriz se hacen por bloques de
+clientes consecutivos (`client_blocks`), con memoria acotada.
+"""
+from os import replace
+
+import numpy as np
+
+# Valores de la matriz (clientes x columnas) procesados por bloque
+BLOCK_ENTRIES = 1 << 22
+
+# Tipos admitidos para la matriz en disco
+COST_DTYPES = ("float64", "float32")
+
+
+def client_blocks(n_clients, n_columns, entries=BLOCK_ENTRIES):
+    """
+    Rebanadas de clientes consecutivos con a lo más `entries` valores de
+    `n_columns` columnas cada una (al menos un cliente por bloque).
+    """
+    size = max(1, entries // max(1, n_columns))
+    for start in range(0, n_clients, size):
+        yield slice(start, min(n_clients, start + size))
+
+
+def costs_path(cached, dtype):
+    """Archivo `.npy` de la matriz junto al `.npz` de la caché de una instancia."""
+    return f"{cached[:-len('.npz')]}.costo.{np.dtype(dtype).name}.npy"
+
+
+def open_costs(file_path):
+    """Matriz de costos mapeada en memoria, de solo lectura."""
+    return np.load(file_path, mmap_mode='r')
+
+
+class CostWriter:
+    """
+    Escribe la matriz de costos por bloques de filas de texto `cliente c_1 ... c_F`.
+
+    Se escribe en un archivo temporal que reemplaza al definitivo en `close`,
+    de modo que nunca queda una matriz a medio escribir.
+
+    Args:
+        file_path (str): Archivo `.npy` de destino.
+        shape (tuple): (clientes, centros).
+        dtype: `np.float64` o `np.float32`.
+    """
+
+    def __init__(self, file_path, shape, dtype=np.float64):
+        if np.dtype(dtype).name not in COST_DTYPES:
+            raise ValueError(f"Tipo de la matriz de costos no soportado: {np.dtype(dtype).name}")
+        self.file_path = file_path
+        self.tmp = file_path + ".tmp"
+        self.costs = np.lib.format.open_memmap(self.tmp, mode='w+', dtype=dtype, shape=shape)
+        self.rows = 0
+        self.pending = []
+        self.block = max(1, BLOCK_ENTRIES // max(1, shape[1]))
+
+    def write(self, line):
+        """Agrega una fila de texto (se parsea al completar un bloque)."""
+        self.pending.append(line)
+        if len(self.pending) >= self.block:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        n_clients, n_facilities = self.costs.shape
+        values = np.fromstring(" ".join(self.pending), dtype=np.float64, sep=" ")  # Sin un objeto por valor
+        if len(values) != len(self.pending) * (n_facilities + 1) or self.rows + len(self.pending) > n_clients:
+            raise ValueError("Las filas de `param cost` no coinciden con las dimensiones de la instancia")
+        rows = values.reshape(len(self.pending), n_facilities + 1)[:, 1:]
+        self.costs[self.rows:self.rows + len(rows)] = rows
+        self.rows += len(rows)
+        self.pending = []
+
+    def close(self):
+        """Termina la escritura y deja la matriz en `file_path`."""
+        self.flush()
+        if self.rows != self.costs.shape[0]:
+            raise ValueError(f"Se leyeron {self.rows} filas de costos, se esperaban {self.costs.shape[0]}")
+        self.costs.flush()
+        del self.costs
+        replace(self.tmp, self.file_path)
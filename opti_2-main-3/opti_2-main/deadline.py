@@ -0,0 +1,39 @@
+from time import monotonic
+
+
+class Deadline:
+    """
+    Límite de tiempo de reloj para una ejecución.
+
+    Usa `time.monotonic`, que en un mismo equipo es común a todos los procesos,
+    de modo que el instante `at` se puede enviar a los workers tal cual.
+
+    Args:
+        seconds (float): Segundos disponibles desde ahora (None = sin límite).
+        at (float): Instante límite en segundos de `monotonic` (alternativa a `seconds`).
+        cancel: Objeto con `is_set()` (p. ej. `threading.Event`); el límite se
+                cumple en cuanto se activa, con o sin tiempo restante.
+    """
+
+    __slots__ = ("at", "cancel")
+
+    def __init__(self, seconds=None, at=None, cancel=None):
+        self.at = at if seconds is None else monotonic() + seconds
+        self.cancel = cancel
+
+    def __repr__(self):
+        return f"Deadline(remaining={self.remaining()})"
+
+    def expired(self):
+        if self.cancel is not None and self.cancel.is_set():
+            return True
+        return self.at is not None and monotonic() >= self.at
+
+    def remaining(self):
+        """Segundos restantes (None si no hay límite)."""
+        return None if self.at is None else max(0.0, self.at - monotonic())
+
+
+def expired(deadline):
+    """True si hay un límite y ya se cumplió (acepta None como "sin límite")."""
+    return deadline is not None and deadline.expired()
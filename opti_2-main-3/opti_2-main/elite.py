@@ -0,0 +1,216 @@
+"""
+Conjunto élite de soluciones, memoria de soluciones ya buscadas y path relinking.
+
+    - `solution_hash`: huella corta de una solución, independiente del orden de
+      las posiciones de cada cliente.
+    - `SearchedMemo`: resultado de la búsqueda local de cada solución construida,
+      para no repetir `Local_Search` cuando una iteración construye una solución
+      que ya se buscó.
+    - `ElitePool`: las mejores soluciones encontradas que difieren entre sí en al
+      menos `min_distance` centros abiertos.
+    - `path_relinking`: recorre los conjuntos de centros abiertos entre dos
+      soluciones élite, asignando cada uno con el problema de transporte (y la
+      caché de conjuntos abiertos de la instancia).
+"""
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from deadline import expired
+from solution import EMPTY
+from transport import cached_transport
+
+# Soluciones en el conjunto élite
+ELITE_SIZE = 10
+
+# Centros abiertos distintos que debe tener una solución para ser "diferente"
+MIN_DISTANCE = 2
+
+# Soluciones construidas cuyo resultado se recuerda
+SEARCHED_SIZE = 256
+
+# Cambios evaluados en cada paso del path relinking
+RELINK_CANDIDATES = 3
+
+# Decimales de las cantidades que entran en la huella
+HASH_DECIMALS = 6
+
+
+def solution_hash(solution):
+    """
+    Huella de 16 bytes de una solución: pares (cliente, centro) ordenados y sus
+    cantidades redondeadas.
+    """
+    clients, slots = np.nonzero(solution.facilities != EMPTY)
+    keys = clients.astype(np.int64) * len(solution.load) + solution.facilities[clients, slots]
+    order = np.argsort(keys, kind="stable")
+    digest = hashlib.blake2b(keys[order].tobytes(), digest_size=16)
+    digest.update(np.round(solution.amounts[clients, slots][order], HASH_DECIMALS).tobytes())
+    return digest.digest()
+
+
+def distance(solution, other):
+    """Centros abiertos en una solución y cerrados en la otra."""
+    return int(np.count_nonzero((solution.count > 0) != (other.count > 0)))
+
+
+class SearchedMemo:
+    """
+    Resultado de la búsqueda local por huella de la solución construida.
+
+    Se crea una vez por instancia (ver `Instance.searched_memo`) y la comparten
+    las iteraciones de un mismo proceso; guarda a lo más `maxsize` resultados.
+    Solo se guardan búsquedas completas (sin límite de tiempo), que dependen
+    únicamente de la solución de partida: un acierto entrega lo mismo que
+    repetir la búsqueda, sin importar qué iteraciones corrió antes el proceso.
+
+    Args:
+        maxsize (int): Resultados guardados (0 = sin memoria).
+    """
+
+    def __init__(self, maxsize=SEARCHED_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        Returns:
+            tuple: Copia de (solución, costo) de la búsqueda, o None.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0].copy(), entry[1]
+
+    def put(self, key, result):
+        if self.maxsize <= 0 or result is None:
+            return
+        self.entries[key] = result[0].copy(), result[1]
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+
+class ElitePool:
+    """
+    Conjunto élite de soluciones diversas.
+
+    Una solución entra si no está repetida (misma huella) y, o hay espacio y
+    está a distancia `min_distance` o más de todas, o es mejor que la peor. Si
+    es parecida a un miembro (distancia menor a `min_distance`) solo lo
+    reemplaza a él, y solo si es mejor.
+
+    Args:
+        size (int): Soluciones en el conjunto.
+        min_distance (int): Distancia mínima entre miembros (ver `distance`).
+    """
+
+    def __init__(self, size=ELITE_SIZE, min_distance=MIN_DISTANCE):
+        self.size = size
+        self.min_distance = min_distance
+        self.members = []  # [solución, costo, huella]
+
+    def __len__(self):
+        return len(self.members)
+
+    def __iter__(self):
+        return ((solution, cost) for solution, cost, _ in self.members)
+
+    def best(self):
+        return min(self, key=lambda member: member[1], default=None)
+
+    def add(self, solution, cost):
+        """
+        Returns:
+            bool: True si la solución entró al conjunto.
+        """
+        key = solution_hash(solution)
+        if any(member[2] == key for member in self.members):
+            return False
+
+        member = [solution, cost, key]
+        distances = [distance(solution, other) for other, _, _ in self.members]
+        close = [i for i, d in enumerate(distances) if d < self.min_distance]
+        if close:
+            closest = min(close, key=lambda i: distances[i])
+            if cost >= self.members[closest][1]:
+                return False
+            self.members[closest] = member
+            return True
+
+        if len(self.members) < self.size:
+            self.members.append(member)
+            return True
+
+        worst = max(range(len(self.members)), key=lambda i: self.members[i][1])
+        if cost >= self.members[worst][1]:
+            return False
+        self.members[worst] = member
+        return True
+
+    def farthest(self, solution):
+        """Miembro más distante de `solution` (None si no hay otro)."""
+        distances = [(distance(solution, other), i) for i, (other, _, _) in enumerate(self.members)]
+        farthest, i = max(distances, default=(0, None))
+        if not farthest:
+            return None
+        return self.members[i][0], self.members[i][1]
+
+
+def path_relinking(source, target, data, deadline=None, candidates=RELINK_CANDIDATES):
+    """
+    Path relinking desde `source` hacia `target` sobre los centros abiertos.
+
+    En cada paso se abre o se cierra uno de los centros en que difieren: se
+    prueban los `candidates` con mejor costo fijo por unidad de capacidad (abrir
+    los baratos, cerrar los caros), cada conjunto con su asignación óptima
+    (`cached_transport`, que reutiliza los conjuntos ya resueltos), y se avanza
+    con el mejor. Los conjuntos sin capacidad suficiente se atraviesan sin
+    evaluarlos.
+
+    Args:
+        source (Solution): Solución de partida.
+        target (Solution): Solución guía.
+        data (Instance): Datos de la instancia.
+        deadline (Deadline): Límite de tiempo (opcional).
+        candidates (int): Cambios evaluados por paso.
+
+    Returns:
+        tuple: Mejor (solución, costo) intermedia, o None si no hubo ninguna factible.
+    """
+    current = source.count > 0
+    goal = target.count > 0
+    capacity = np.asarray(data["initial_capacity"])
+    unit = np.divide(data["costos_fijos"], capacity, out=np.full(len(capacity), np.inf), where=capacity > 0)
+
+    warm, best = source, None
+    while not expired(deadline):
+        differ = np.flatnonzero(current != goal)
+        if len(differ) <= 1:  # El último paso llega a `target`
+            break
+        score = np.where(goal[differ], unit[differ], -unit[differ])
+        trials = differ[np.argsort(score, kind="stable")][:candidates]
+
+        step = None
+        for facility in trials.tolist():
+            mask = current.copy()
+            mask[facility] = goal[facility]
+            result = cached_transport(data, np.flatnonzero(mask), warm=warm, deadline=deadline)
+            if result is not None and (step is None or result[1] < step[2]):
+                step = facility, result[0], result[1]
+
+        if step is None:
+            current[trials[0]] = goal[trials[0]]
+            continue
+        facility, warm, cost = step
+        current[facility] = goal[facility]
+        if best is None or cost < best[1]:
+            best = warm, cost
+    return best
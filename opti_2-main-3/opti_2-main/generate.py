@@ -0,0 +1,91 @@
+"""
+Generador de instancias sintéticas en el formato de las instancias incluidas
+(`param C`, `param F`, `param capacity`, `param in_cost`, `param demand` y
+`param cost`), para medir tiempo y memoria con tamaños mucho mayores.
+
+Centros y clientes son puntos al azar en el cuadrado unitario y el costo de
+transporte por unidad es proporcional a la distancia, con escalas parecidas a
+las de las instancias cap*: demandas entre 1 y 100, la misma capacidad en todos
+los centros y costos fijos proporcionales a la capacidad. La matriz de costos
+se genera y escribe por bloques de clientes, por lo que nunca está completa en
+memoria: las demandas y coordenadas de los clientes sí se guardan enteras y la
+memoria máxima crece linealmente con el número de clientes (no con clientes x
+centros).
+
+Uso:
+    python generate.py sintetica_1000x100000.txt --facilities 1000 --clients 100000 --seed 1
+"""
+import argparse
+
+import numpy as np
+
+from costmatrix import client_blocks
+
+# Demanda de cada cliente (entera, uniforme)
+DEMAND_RANGE = (1, 100)
+
+# Capacidad total de los centros respecto de la demanda total
+CAPACITY_RATIO = 10.0
+
+# Costo fijo por unidad de capacidad (se multiplica por un factor uniforme)
+FIXED_PER_UNIT = 140.0
+FIXED_SPREAD = (0.6, 1.6)
+
+# Costo de transporte por unidad y por unidad de distancia
+COST_SCALE = 100000.0
+
+# Decimales de los costos escritos
+DECIMALS = 5
+
+
+def generate_instance(file_path, n_facilities, n_clients, seed=None, capacity_ratio=CAPACITY_RATIO):
+    """
+    Escribe una instancia sintética.
+
+    Args:
+        file_path (str): Archivo de salida.
+        n_facilities (int): Número de centros.
+        n_clients (int): Número de clientes.
+        seed (int): Semilla (la misma semilla genera el mismo archivo).
+        capacity_ratio (float): Capacidad total sobre demanda total (debe ser
+                                mayor que 1 para que la instancia sea factible).
+    """
+    rng = np.random.default_rng(seed)
+    facilities = rng.random((n_facilities, 2))
+    clients = rng.random((n_clients, 2))
+    demand = rng.integers(DEMAND_RANGE[0], DEMAND_RANGE[1] + 1, size=n_clients)
+    capacity = np.ceil(capacity_ratio * demand.sum() / n_facilities)
+    fixed = FIXED_PER_UNIT * capacity * rng.uniform(*FIXED_SPREAD, size=n_facilities)
+    rows = np.arange(1, n_clients + 1)
+
+    with open(file_path, 'w') as file:
+        file.write(f"#Defining sets using ranges\nparam C := {n_facilities};\nparam F := {n_clients};\n\n")
+        file.write("#Capacity in each plant\nparam capacity :=\n")
+        file.writelines(f"   {i} {capacity:.0f}\n" for i in range(1, n_facilities + 1))
+        file.write(";\n#Instalation cost of each plant\nparam in_cost :=\n")
+        file.writelines(f"   {i} {value:.1f}\n" for i, value in enumerate(fixed, start=1))
+        file.write(";\n#Demand of each client\nparam demand :=\n")
+        file.writelines(f"   {j} {value}\n" for j, value in enumerate(demand.tolist(), start=1))
+        file.write(";\n#Transportation cost\nparam cost : " + " ".join(map(str, range(1, n_facilities + 1)))
+                   + " :=\n")
+        for block in client_blocks(n_clients, n_facilities):
+            distance = np.sqrt(((clients[block, None, :] - facilities[None, :, :]) ** 2).sum(axis=2))
+            costs = np.round(COST_SCALE * distance, DECIMALS)
+            np.savetxt(file, np.column_stack((rows[block], costs)), fmt=["   %d"] + [f"%.{DECIMALS}f"] * n_facilities)
+        file.write(";\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera una instancia sintética del problema.")
+    parser.add_argument("output", help="Archivo de salida")
+    parser.add_argument("--facilities", type=int, required=True, help="Número de centros")
+    parser.add_argument("--clients", type=int, required=True, help="Número de clientes")
+    parser.add_argument("--seed", type=int, default=None, help="Semilla")
+    parser.add_argument("--capacity-ratio", type=float, default=CAPACITY_RATIO,
+                        help="Capacidad total sobre demanda total")
+    args = parser.parse_args(argv)
+    generate_instance(args.output, args.facilities, args.clients, args.seed, args.capacity_ratio)
+
+
+if __name__ == "__main__":
+    main()
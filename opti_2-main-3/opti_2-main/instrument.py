@@ -0,0 +1,94 @@
+import json
+import logging
+from functools import wraps
+from time import perf_counter
+
+# Logger común de todos los módulos. Sin configuración no muestra nada.
+logger = logging.getLogger("opt2")
+logger.addHandler(logging.NullHandler())
+
+
+def configure_logging(level=logging.INFO, stream=None):
+    """
+    Activa la salida del logger `opt2` con el nivel indicado.
+
+    Args:
+        level (int): Nivel de logging (`logging.DEBUG`, `logging.INFO`, ...).
+        stream: Destino de los mensajes (por defecto stderr).
+    """
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+    for old in [h for h in logger.handlers if isinstance(h, logging.StreamHandler)]:
+        logger.removeHandler(old)
+    logger.addHandler(handler)
+    logger.setLevel(level)
+
+
+class Profiler:
+    """
+    Acumula tiempo de reloj y número de llamadas por fase del algoritmo.
+
+    Desactivado por defecto: las funciones marcadas con `timed` solo verifican
+    `enabled` antes de ejecutarse.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.stats = {}
+
+    def reset(self):
+        self.stats = {}
+
+    def record(self, phase, seconds, calls=1):
+        entry = self.stats.setdefault(phase, [0, 0.0])
+        entry[0] += calls
+        entry[1] += seconds
+
+    def merge(self, stats):
+        """Suma estadísticas obtenidas en otro proceso (ver `summary`)."""
+        for phase, entry in stats.items():
+            self.record(phase, entry["seconds"], entry["calls"])
+
+    def summary(self):
+        """
+        Returns:
+            dict: {fase: {"calls": int, "seconds": float}}
+        """
+        return {phase: {"calls": calls, "seconds": seconds}
+                for phase, (calls, seconds) in sorted(self.stats.items())}
+
+    def to_json(self, file_path=None, **extra):
+        """
+        Resumen de la ejecución en JSON. Si se entrega `file_path`, también se escribe.
+
+        Args:
+            file_path (str): Archivo de salida (opcional).
+            **extra: Campos adicionales del resumen (instancia, costo, ...).
+
+        Returns:
+            str: Resumen en formato JSON.
+        """
+        text = json.dumps({**extra, "phases": self.summary()}, indent=2)
+        if file_path is not None:
+            with open(file_path, 'w') as file:
+                file.write(text)
+        return text
+
+
+PROFILER = Profiler()
+
+
+def timed(phase):
+    """Decorador que registra tiempo y llamadas de la función en `PROFILER`."""
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return function(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                PROFILER.record(phase, perf_counter() - start)
+        return wrapper
+    return decorator
@@ -2,16 +2,20 @@
 from read import read_options, read_instance
 from utility import display, get_iter
 from GRASP import GRASP
-from os.path import join 
+from instrument import configure_logging
+from os.path import join, dirname, abspath
 
-# Directorio donde se almacenan las instancias 
-instances_path = r'opti_2-main\intances_abc(2)\intances_abc_dat'
+# Directorio donde se almacenan las instancias (para ejecuciones sin teclado ver batch.py)
+instances_path = join(dirname(abspath(__file__)), '..', 'intances_abc_dat')
 
 # Semilla para generación de soluciones aleatorias (reproducibilidad)
 seed = None
 
 def main():
     
+    # Mostrar el avance de las iteraciones
+    configure_logging()
+    
     # Leer instancias disponibles desde el directorio especificado
     instances = read_options(instances_path)
     
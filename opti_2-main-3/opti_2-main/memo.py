@@ -0,0 +1,102 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from instrument import PROFILER
+
+# Conjuntos de centros abiertos guardados por defecto
+CACHE_SIZE = 512
+
+
+class OpenSetCache:
+    """
+    Caché de evaluaciones por conjunto de centros abiertos.
+
+    La clave es la máscara de centros abiertos empaquetada en bits (13 bytes
+    para 100 centros). Para cada conjunto se guarda solo su asignación óptima
+    (problema de transporte, ver `transport.cached_transport`) y su costo: un
+    valor que depende únicamente del conjunto, de modo que un acierto entrega lo
+    mismo que volver a resolverlo y el resultado de GRASP no depende de qué
+    iteraciones corrió antes cada proceso (número de workers, ejecución
+    retomada). Las asignaciones heurísticas (p. ej. la reasignación greedy de
+    `facility_opening_closing`) dependen de la solución de la que partieron y
+    no se guardan. Cuando se llena se descarta el conjunto usado hace más
+    tiempo (LRU).
+
+    Por eso solo la usa el modo `exact` de GRASP (`optimal_allocation` y
+    `open_set_search`). Se crea una vez por instancia (ver `Instance.open_set_cache`) y la comparten
+    todas las iteraciones de GRASP de un mismo proceso.
+
+    Args:
+        n_facilities (int): Número de centros de la instancia.
+        maxsize (int): Conjuntos guardados como máximo (0 = sin caché).
+    """
+
+    def __init__(self, n_facilities, maxsize=CACHE_SIZE):
+        self.n_facilities = n_facilities
+        self.maxsize = maxsize
+        self.entries = OrderedDict()  # clave -> (costo, solución óptima)
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return f"OpenSetCache(size={len(self)}, maxsize={self.maxsize}, hits={self.hits}, misses={self.misses})"
+
+    def key(self, open_facilities):
+        """Clave de un conjunto de centros abiertos (índices o `Solution`)."""
+        if hasattr(open_facilities, "count"):
+            mask = open_facilities.count > 0
+        else:
+            mask = np.zeros(self.n_facilities, dtype=bool)
+            mask[np.asarray(open_facilities, dtype=np.intp)] = True
+        return np.packbits(mask).tobytes()
+
+    def facilities(self, key):
+        """Centros abiertos de una clave (inversa de `key`)."""
+        mask = np.unpackbits(np.frombuffer(key, dtype=np.uint8), count=self.n_facilities)
+        return np.flatnonzero(mask)
+
+    def get(self, key):
+        """
+        Busca un conjunto.
+
+        Args:
+            key (bytes): Clave del conjunto (ver `key`).
+
+        Returns:
+            tuple: (solución, costo), o None si no está guardado. La solución es
+                   una copia que se puede modificar.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            if PROFILER.enabled:
+                PROFILER.record("cache_miss", 0.0)
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        if PROFILER.enabled:
+            PROFILER.record("cache_hit", 0.0)
+        cost, solution = entry
+        return solution.copy(), cost
+
+    def put(self, key, solution, cost):
+        """Guarda la asignación óptima de un conjunto (debe serlo, ver la clase)."""
+        if self.maxsize <= 0:
+            return
+        if key in self.entries:  # Ya guardada: es la misma asignación
+            self.entries.move_to_end(key)
+            return
+        self.entries[key] = (cost, solution.copy())
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def stats(self):
+        """Tamaño, aciertos y fallos de la caché."""
+        lookups = self.hits + self.misses
+        return {"size": len(self), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
@@ -0,0 +1,104 @@
+import numpy as np
+
+from costmatrix import client_blocks
+
+# Centros más cercanos que se guardan por cliente
+NEAREST_K = 10
+
+
+class NearestIndex:
+    """
+    Índice, por cliente, de los centros ordenados por costo de transporte.
+
+    Solo guarda los `k` centros más baratos de cada cliente; si ninguno de ellos
+    sirve, las búsquedas recurren a la fila completa de la matriz de costos.
+    Se construye una vez por instancia (ver `Instance.nearest_index`).
+
+    Args:
+        costo (ndarray): Matriz de costos (clientes x centros).
+        k (int): Centros guardados por cliente.
+        order (ndarray): Índice ya calculado (opcional, p. ej. en memoria compartida).
+    """
+
+    def __init__(self, costo, k=NEAREST_K, order=None):
+        self.costo = costo
+        if order is None:
+            k = min(k, costo.shape[1])
+            order = np.empty((costo.shape[0], k), dtype=np.int32)
+            for block in client_blocks(*costo.shape):  # Por bloques: la matriz puede estar en disco
+                order[block] = np.argsort(costo[block], axis=1, kind="stable")[:, :k]
+        self.order = order
+        self.k = order.shape[1]
+        self.inverse = None
+
+    def clients_of(self, facility):
+        """
+        Clientes que tienen al centro entre sus `k` más cercanos, en orden.
+        El índice inverso se construye en la primera llamada.
+        """
+        if self.inverse is None:
+            flat = self.order.ravel()
+            clients = np.argsort(flat, kind="stable") // self.k
+            starts = np.concatenate(([0], np.cumsum(np.bincount(flat, minlength=self.costo.shape[1]))))
+            self.inverse = clients, starts
+        clients, starts = self.inverse
+        return clients[starts[facility]:starts[facility + 1]]
+
+    def first_feasible(self, client, capacity, exclude=-1):
+        """
+        Centro más barato para el cliente entre los que tienen capacidad restante.
+
+        Args:
+            client (int): Cliente.
+            capacity (ndarray): Capacidad restante de cada centro.
+            exclude (int): Centro que no se debe considerar.
+
+        Returns:
+            int: Centro, o None si ninguno tiene capacidad.
+        """
+        for facility in self.order[client].tolist():
+            if facility != exclude and capacity[facility] > 0:
+                return facility
+        return self.fallback(client, capacity, exclude)
+
+    def fallback(self, client, capacity, exclude=-1, amount=None):
+        """
+        Igual que `first_feasible`, pero recorriendo todos los centros. Con
+        `amount` solo sirven los centros con al menos esa capacidad restante.
+        """
+        usable = capacity > 0 if amount is None else capacity >= amount
+        costs = np.where(usable, self.costo[client], np.inf)
+        if exclude >= 0:
+            costs[exclude] = np.inf
+        facility = int(costs.argmin())
+        return facility if np.isfinite(costs[facility]) else None
+
+    def candidates(self, clients, capacity, amounts=None):
+        """
+        Centros candidatos para varios clientes a la vez.
+
+        Args:
+            clients (ndarray): Clientes.
+            capacity (ndarray): Capacidad restante de cada centro.
+            amounts (ndarray): Capacidad mínima que necesita cada cliente (por
+                               defecto basta con que quede capacidad).
+
+        Returns:
+            tuple: (centros, factibles), ambos de forma (clientes, k). Los clientes
+                   sin ningún centro factible entre sus `k` más cercanos reciben en
+                   la primera columna el más barato de la lista completa.
+        """
+        facilities = self.order[clients]
+        if amounts is None:
+            feasible = capacity[facilities] > 0
+        else:
+            feasible = capacity[facilities] >= amounts[:, None]
+
+        missing = np.flatnonzero(~feasible.any(axis=1))
+        for row in missing.tolist():
+            amount = None if amounts is None else amounts[row]
+            facility = self.fallback(clients[row], capacity, amount=amount)
+            if facility is not None:
+                facilities[row, 0] = facility
+                feasible[row, 0] = True
+        return facilities, feasible
@@ -0,0 +1,196 @@
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from costmatrix import open_costs
+from deadline import Deadline, expired
+from instrument import PROFILER
+from neighbors import NearestIndex
+from read import Instance
+from GRASP import GRASP_iteration, ALPHA
+
+# Arreglos de la instancia que se publican en memoria compartida
+SHARED_KEYS = ("initial_capacity", "costos_fijos", "initial_demand", "costo")
+
+# Iteraciones enviadas por adelantado a cada worker
+QUEUED_PER_WORKER = 2
+
+# Segundos entre consultas de la cancelación mientras se espera a un worker
+CANCEL_POLL = 0.1
+
+# Estado de cada worker (se inicializa una vez por proceso)
+_shm = None
+_data = None
+_stop = None  # Evento compartido: las iteraciones en curso se detienen al activarse
+
+
+class SharedInstance:
+    """
+    Publica los arreglos de una instancia en un único bloque de memoria compartida.
+
+    Incluye el índice de centros más cercanos de la instancia. Los workers se
+    conectan al bloque con `attach` y leen la matriz de costos y el índice
+    directamente desde él, sin copiarlos ni recibirlos serializados.
+
+    Uso:
+        with SharedInstance(data) as shared:
+            ... shared.descriptor ...
+    """
+
+    def __init__(self, data):
+        # Una matriz mapeada desde disco no se copia: cada worker abre el mismo archivo
+        keys = [key for key in SHARED_KEYS if not (key == "costo" and data.costs_path)]
+        arrays = [np.ascontiguousarray(data[key], dtype=data[key].dtype) for key in keys]
+        arrays.append(np.ascontiguousarray(data.nearest_index().order))
+        size = sum(array.nbytes for array in arrays)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+
+        layout = []
+        offset = 0
+        for array in arrays:
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=self.shm.buf, offset=offset)
+            view[...] = array
+            layout.append((array.shape, array.dtype.str, offset))
+            offset += array.nbytes
+
+        self.descriptor = (self.shm.name, layout, data.costs_path)
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach(descriptor):
+    """
+    Se conecta a un bloque creado por `SharedInstance` y construye la instancia.
+
+    La matriz de costos queda como vista de solo lectura sobre la memoria
+    compartida; los vectores (pequeños) se copian porque la construcción
+    modifica las capacidades y demandas residuales.
+
+    Returns:
+        tuple: (SharedMemory, Instance). Se debe mantener la referencia al bloque
+               mientras se use la instancia.
+    """
+    name, layout, costs_path = descriptor
+    shm = shared_memory.SharedMemory(name=name)
+
+    views = []
+    for shape, dtype, offset in layout:
+        view = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+        view.flags.writeable = False
+        views.append(view)
+    if costs_path:
+        views.insert(SHARED_KEYS.index("costo"), open_costs(costs_path))
+
+    capacity, costos_fijos, demandas, costo, order = views
+    data = Instance(capacity.copy(), costos_fijos.copy(), demandas.copy(), costo)
+    data.costs_path = costs_path
+    data.nearest = NearestIndex(data.costo, order=order)
+    return shm, data
+
+
+def _init_worker(descriptor, cache_size, stop):
+    global _shm, _data, _stop
+    _shm, _data = attach(descriptor)
+    _stop = stop
+    if cache_size is not None:
+        _data.open_set_cache(cache_size)
+
+
+def _run_iteration(seed, alpha, profile, deadline_at, exact=False, single_source=False, policy=None):
+    deadline = Deadline(at=deadline_at, cancel=_stop)
+    if not profile:
+        return GRASP_iteration(seed, _data, alpha, deadline, exact, single_source, policy), None
+    PROFILER.reset()
+    PROFILER.enabled = True
+    result = GRASP_iteration(seed, _data, alpha, deadline, exact, single_source, policy)
+    return result, PROFILER.summary()
+
+
+def _wait_result(future, cancel, stop):
+    """
+    Resultado de una iteración enviada al pool. Mientras se espera se consulta
+    `cancel` y, si se activa, se activa `stop` para detener a todos los workers.
+    """
+    while cancel is not None and not stop.is_set():
+        if wait([future], timeout=CANCEL_POLL).done:
+            break
+        if cancel.is_set():
+            stop.set()
+    return future.result()
+
+
+def parallel_iterations(data, seeds, workers, alpha=ALPHA, profile=False, deadline=None, exact=False,
+                        single_source=False, policy=None):
+    """
+    Ejecuta una iteración de GRASP por semilla en un pool de procesos.
+
+    Los resultados se entregan en el orden de las semillas, de modo que la
+    reducción con `Update_Solution` elige la misma solución que la versión
+    secuencial, sin importar el número de workers. Solo se mantienen unas pocas
+    iteraciones en cola por worker, por lo que `seeds` puede ser infinito; al
+    cerrar el generador (o al cumplirse el límite de tiempo) no se envían más
+    iteraciones y se cancelan las pendientes. La cancelación de `deadline`
+    (`Deadline.cancel`) se reenvía a los workers por un evento compartido, de
+    modo que también se detienen las iteraciones que ya están corriendo.
+
+    Si `data` tiene caché de conjuntos abiertos (modo `exact`), cada worker
+    tiene la suya, del mismo tamaño; como solo guarda valores que dependen del
+    conjunto (ver `memo.OpenSetCache`), el resultado de cada iteración no
+    depende de qué otras iteraciones corrió el worker.
+
+    Args:
+        data (Instance): Datos de la instancia.
+        seeds (iterable): Semilla de cada iteración.
+        workers (int): Número de procesos.
+        alpha (float): Parámetro de la RCL de la construcción.
+        profile (bool): Registrar tiempos en los workers y sumarlos a `PROFILER`.
+        deadline (Deadline): Límite de tiempo y cancelación, que también
+                             respetan los workers.
+        exact (bool): Búsqueda local con asignación exacta (ver `Local_Search`).
+        single_source (bool): Variante de fuente única (ver `single.py`).
+        policy (SearchPolicy): Política de la búsqueda local.
+
+    Yields:
+        tuple: (solución, costo) de cada iteración, o None si fue inválida.
+    """
+    deadline_at = deadline.at if deadline is not None else None
+    cancel = deadline.cancel if deadline is not None else None
+    seeds = iter(seeds)
+    pending = deque()
+    context = multiprocessing.get_context()
+    stop = context.Event()
+
+    with SharedInstance(data) as shared:
+        cache_size = data.cache.maxsize if data.cache is not None else None
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(shared.descriptor, cache_size, stop)) as pool:
+            try:
+                while True:
+                    while len(pending) < workers * QUEUED_PER_WORKER and not expired(deadline):
+                        seed = next(seeds, None)
+                        if seed is None:
+                            break
+                        pending.append(pool.submit(_run_iteration, seed, alpha, profile, deadline_at, exact,
+                                                   single_source, policy))
+                    if not pending:
+                        return
+
+                    result, stats = _wait_result(pending.popleft(), cancel, stop)
+                    if stats:
+                        PROFILER.merge(stats)
+                    yield result
+            finally:
+                stop.set()  # Las iteraciones que siguen corriendo ya no se usan
+                for future in pending:
+                    future.cancel()
@@ -1,64 +1,152 @@
-from os import listdir as dir
-from os.path import join, isdir
-import re
+from os import makedirs, remove, replace, stat
+from os.path import join, abspath, dirname, exists
+from zipfile import BadZipFile
+import hashlib
 
+import numpy as np
 
-def leer_archivo(arch):
+from catalog import read_header
+from costmatrix import CostWriter, costs_path, open_costs
+from elite import SEARCHED_SIZE, SearchedMemo
+from memo import CACHE_SIZE, OpenSetCache
+from neighbors import NearestIndex
+
+# Directorio (junto a cada instancia) donde se guardan las versiones binarias ya parseadas
+CACHE_DIR = "__instcache__"
+
+# Errores al cargar un `.npz` de la caché truncado o corrupto (p. ej. una escritura interrumpida)
+CORRUPT_CACHE = (OSError, KeyError, ValueError, EOFError, BadZipFile)
+
+
+# Etiquetas de inicio de cada sección del archivo de instancia
+SECTION_LABELS = (("param capacity :=", "capacity"), ("param in_cost :=", "costos_fijos"),
+                  ("param demand :=", "demandas"), ("param cost :", "costos"))
+
+
+def iter_sections(arch):
     """
-    Modifica la función `leer_archivo` para leer archivos con formato específico
-    como el proporcionado, que incluye parámetros con etiquetas como `param capacity`,
-    `param in_cost`, `param demand`, y `param cost`.
+    Recorre línea a línea las secciones de datos de un archivo de instancia.
+
+    Yields:
+        tuple: (sección, línea) para cada línea no vacía dentro de una sección:
+               `capacity`, `costos_fijos`, `demandas` o `costos`.
     """
-    capacity = []
-    costos_fijos = []
-    demandas = []
-    costos_transporte = []
     seccion_actual = None
-
     with open(arch, 'r') as file:
         for linea in file:
             linea = linea.strip()
 
             # Detectar el inicio de una nueva sección basada en las etiquetas del archivo
-            if linea.startswith("param capacity :="):
-                seccion_actual = "capacity"
-                continue
-            elif linea.startswith("param in_cost :="):
-                seccion_actual = "costos_fijos"
-                continue
-            elif linea.startswith("param demand :="):
-                seccion_actual = "demandas"
-                continue
-            elif linea.startswith("param cost :"):
-                seccion_actual = "costos"
+            etiqueta = next((nombre for inicio, nombre in SECTION_LABELS if linea.startswith(inicio)), None)
+            if etiqueta is not None:
+                seccion_actual = etiqueta
                 continue
             elif linea == ";":
                 seccion_actual = None
                 continue
 
-            # Procesar cada sección según su formato
-            if seccion_actual == "capacity":
-                partes = linea.split()
-                if len(partes) == 2:
-                    capacity.append(float(partes[1]))
-            elif seccion_actual == "costos_fijos":
-                partes = linea.split()
-                if len(partes) == 2:
-                    costos_fijos.append(float(partes[1]))
-            elif seccion_actual == "demandas":
-                partes = linea.split()
-                if len(partes) == 2:
-                    demandas.append(float(partes[1]))
-            elif seccion_actual == "costos":
-                partes = linea.split()
-                if len(partes) > 1:
-                    # Convertir todos los costos en una lista de listas
-                    costos_transporte.append([float(costo) for costo in partes[1:]])
+            if seccion_actual is not None and linea:
+                yield seccion_actual, linea
+
+
+def leer_archivo(arch):
+    """
+    Modifica la función `leer_archivo` para leer archivos con formato específico
+    como el proporcionado, que incluye parámetros con etiquetas como `param capacity`,
+    `param in_cost`, `param demand`, y `param cost`.
+    """
+    capacity = []
+    costos_fijos = []
+    demandas = []
+    costos_transporte = []
+    vectores = {"capacity": capacity, "costos_fijos": costos_fijos, "demandas": demandas}
+
+    # Procesar cada sección según su formato
+    for seccion_actual, linea in iter_sections(arch):
+        partes = linea.split()
+        if seccion_actual == "costos":
+            if len(partes) > 1:
+                # Convertir todos los costos en una lista de listas
+                costos_transporte.append([float(costo) for costo in partes[1:]])
+        elif len(partes) == 2:
+            vectores[seccion_actual].append(float(partes[1]))
 
     # Retornar los parámetros organizados
     return capacity, costos_fijos, demandas, costos_transporte
 
 
+def convert_instance(file_path, vectors_path, costs_path, dtype=np.float64):
+    """
+    Convierte una instancia de texto a archivos binarios en una sola pasada: los
+    vectores en un `.npz` y la matriz de costos en un `.npy` escrito por bloques
+    de clientes (ver `costmatrix.CostWriter`), sin cargar la matriz en memoria.
+
+    Requiere el encabezado `param C` / `param F` para conocer las dimensiones.
+    """
+    dims = read_header(file_path)
+    if dims is None:
+        raise ValueError(f"La instancia {file_path} no tiene el encabezado `param C` / `param F`")
+    n_facilities, n_clients = dims
+
+    writer = CostWriter(costs_path, (n_clients, n_facilities), dtype)
+    vectors = {"capacity": [], "costos_fijos": [], "demandas": []}
+    for section, line in iter_sections(file_path):
+        if section == "costos":
+            writer.write(line)
+        else:
+            partes = line.split()
+            if len(partes) == 2:
+                vectors[section].append(float(partes[1]))
+    writer.close()
+
+    tmp = vectors_path + ".tmp"
+    with open(tmp, 'wb') as file:
+        np.savez(file, **{key: np.array(values) for key, values in vectors.items()})
+    replace(tmp, vectors_path)
+
+
+def iter_results(file_path):
+    """
+    Recorre línea a línea las secciones `open [*]` y `proportion [*]` de un
+    archivo de resultados, sin cargarlo completo en memoria.
+
+    Las filas de `proportion` son `centro valor valor ...`; los clientes son
+    1, 2, ... o los de la última línea de encabezado `: 1 2 3 :=` (formato de
+    tablas por bloques de AMPL).
+
+    Args:
+        file_path (str): Ruta al archivo de resultados.
+
+    Yields:
+        tuple: ("open", centro, estado) o ("proportion", centro, clientes,
+               valores), con los índices del archivo y solo los valores positivos.
+    """
+    section = None
+    columns = None
+    with open(file_path, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if line.startswith("open ["):
+                section, line = "open", line.partition(":=")[2]
+            elif line.startswith("proportion ["):
+                section, columns, line = "proportion", None, line.partition(":=")[2]
+            if section is None:
+                continue
+
+            end = ";" in line
+            entries = line.partition(";")[0].split()
+            if section == "open":
+                for k in range(0, len(entries) - 1, 2):
+                    yield "open", int(entries[k]), int(float(entries[k + 1]))
+            elif entries and entries[0] == ":":  # Encabezado con los clientes de las columnas
+                columns = np.array([int(entry) for entry in entries[1:] if entry != ":="])
+            elif len(entries) > 1:
+                values = np.array(entries[1:], dtype=float)
+                clients = columns if columns is not None else np.arange(1, len(values) + 1)
+                positive = np.flatnonzero(values > 0)  # Ignorar ceros
+                yield "proportion", int(entries[0]), clients[positive], values[positive]
+            if end:
+                section = None
 
 
 def read_results(file_path):
@@ -71,34 +159,14 @@ def read_results(file_path):
     Returns:
         dict: Diccionario con las secciones `open` y `proportion` procesadas.
     """
-    with open(file_path, 'r') as file:
-        content = file.read()
-
-    # Procesar la sección `open`
-    open_pattern = r"open \[\*\] :=([\s\S]*?);"
-    open_match = re.search(open_pattern, content)
     open_dict = {}
-    if open_match:
-        open_data = open_match.group(1).strip()
-        for line in open_data.splitlines():
-            entries = line.split()
-            for i in range(0, len(entries), 2):
-                facility = int(entries[i])
-                state = int(entries[i + 1])
-                open_dict[facility] = state
-
-    # Procesar la sección `proportion`
-    proportion_pattern = r"proportion \[\*\] :=([\s\S]*?);"
-    proportion_match = re.search(proportion_pattern, content)
     proportion_dict = {}
-    if proportion_match:
-        proportion_data = proportion_match.group(1).strip()
-        for line in proportion_data.splitlines():
-            entries = line.split()
-            facility = int(entries[0])
-            for client, value in enumerate(entries[1:], start=1):
-                if float(value) > 0:  # Ignorar ceros
-                    proportion_dict[(facility, client)] = float(value)
+    for row in iter_results(file_path):
+        if row[0] == "open":
+            open_dict[row[1]] = row[2]
+        else:
+            _, facility, clients, values = row
+            proportion_dict.update(zip(((facility, client) for client in clients.tolist()), values.tolist()))
 
     return {
         "open": open_dict,
@@ -106,57 +174,358 @@ def read_results(file_path):
     }
 
 
-
 def read_options(path):
     """
     Lee los nombres y dimensiones de todas las instancias disponibles en el directorio.
 
+    Solo se lee el encabezado (`param C`, `param F`) de cada archivo; ver `catalog.Catalog`.
+
     Args:
         path (str): Ruta al directorio que contiene las instancias.
 
     Returns:
-        list: Lista de nombres y dimensiones de las instancias.
+        list: Lista de nombres y dimensiones ([centros, clientes]) de las instancias.
     """
-    from os.path import isdir
+    from catalog import Catalog
 
-    if not isdir(path):
-        raise NotADirectoryError(f"La ruta proporcionada no es un directorio válido: {path}")
+    return Catalog(path).options()
 
-    options = []
-    for option in dir(path):
-        file_path = join(path, option)
-        name = option.strip('.txt')
+class ResidualState:
+    """
+    Capacidades y demandas residuales de una iteración: lo único que cambia
+    mientras se construye o modifica una solución.
 
-        with open(file_path, 'r') as file:
-            while True:
-                line = file.readline().strip()
-                if not line or not line[0].isdigit():  # Ignorar líneas vacías o no numéricas
-                    continue
-                try:
-                    dims = [int(item) for item in line.split()]
-                    options.append([name, dims])
-                    break
-                except ValueError:
-                    continue  # Ignorar líneas mal formateadas
-    return options
+    Son dos vectores pequeños (centros + clientes), por lo que clonarlos o
+    volver a los valores iniciales cuesta unos pocos KB.
 
-def read_instance(file_path):
+    Args:
+        capacity (ndarray): Capacidad restante de cada centro.
+        demandas (ndarray): Demanda pendiente de cada cliente.
     """
-    Modifica la función `read_instance` para integrar la nueva lógica de lectura
-    desde archivos formateados como el proporcionado.
+
+    __slots__ = ("capacity", "demandas")
+
+    def __init__(self, capacity, demandas):
+        self.capacity = capacity
+        self.demandas = demandas
+
+    @classmethod
+    def initial(cls, data):
+        """Estado sin asignaciones: capacidades y demandas iniciales."""
+        return cls(np.array(data["initial_capacity"]), np.array(data["initial_demand"]))
+
+    @classmethod
+    def from_solution(cls, data, solution):
+        """Estado que deja una solución (capacidad y demanda que no usa)."""
+        return cls(data["initial_capacity"] - solution.load, data["initial_demand"] - solution.assigned())
+
+    def clone(self):
+        return ResidualState(self.capacity.copy(), self.demandas.copy())
+
+    def reset(self, data):
+        """Vuelve a los valores iniciales sin reservar memoria nueva."""
+        np.copyto(self.capacity, data["initial_capacity"])
+        np.copyto(self.demandas, data["initial_demand"])
+
+
+class Instance:
     """
+    Datos de una instancia almacenados en arreglos contiguos float64.
+
+    Mantiene las mismas claves que el diccionario original (`data["capacity"]`,
+    `data["costo"][client][facility]`, ...) para que el resto del código pueda
+    seguir indexando la instancia como antes.
+
+    Los datos de la instancia son de solo lectura y se comparten por referencia
+    entre todas las copias; lo que cambia durante una iteración (`capacity`,
+    `demandas`) vive en un `ResidualState` propio de cada copia (ver `copy`).
+
+    Atributos:
+        params (list): [número de centros, número de clientes]
+        capacity (ndarray): Capacidad restante de cada centro (F,), en `state`
+        costos_fijos (ndarray): Costo de abrir cada centro (F,)
+        demandas (ndarray): Demanda pendiente de cada cliente (C,), en `state`
+        costo (ndarray): Costo de transporte cliente x centro (C, F), float64 o
+                         float32, en memoria o mapeado desde disco
+        initial_capacity (ndarray): Capacidad original de cada centro
+        initial_demand (ndarray): Demanda original de cada cliente
+        state (ResidualState): Capacidades y demandas residuales
+        nearest (NearestIndex): Centros más cercanos de cada cliente (ver `nearest_index`)
+        cache (OpenSetCache): Evaluaciones por conjunto de centros abiertos (ver `open_set_cache`)
+        searched (SearchedMemo): Resultados de búsquedas locales ya hechas (ver `searched_memo`)
+        costs_path (str): Archivo `.npy` de la matriz si está mapeada (ver `read_mapped`)
+    """
+
+    KEYS = ("params", "capacity", "costos_fijos", "demandas", "costo",
+            "initial_capacity", "initial_demand")
+
+    def __init__(self, capacity, costos_fijos, demandas, costo):
+        self.initial_capacity = _read_only(capacity)
+        self.costos_fijos = _read_only(costos_fijos)
+        self.initial_demand = _read_only(demandas)
+        self.costo = _read_only(costo, np.float32 if getattr(costo, "dtype", None) == np.float32 else np.float64)
+        self.state = ResidualState.initial(self)
+        self.params = [len(self.initial_capacity), len(self.initial_demand)]
+        self.nearest = None
+        self.cache = None
+        self.searched = None
+        self.costs_path = None
+
+        if self.costo.shape != (self.params[1], self.params[0]):
+            raise ValueError(
+                f"La matriz de costos tiene dimensión {self.costo.shape}, "
+                f"se esperaba {(self.params[1], self.params[0])}"
+            )
+
+    @property
+    def capacity(self):
+        return self.state.capacity
+
+    @capacity.setter
+    def capacity(self, value):
+        self.state.capacity = value
+
+    @property
+    def demandas(self):
+        return self.state.demandas
+
+    @demandas.setter
+    def demandas(self, value):
+        self.state.demandas = value
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.KEYS
+
+    def with_state(self, state):
+        """Vista de la instancia con otro estado residual (sin copiar datos)."""
+        new = object.__new__(type(self))
+        new.__dict__.update(self.__dict__)
+        new.params = list(self.params)
+        new.state = state
+        return new
+
+    def copy(self):
+        """
+        Copia para una iteración: clona solo el estado residual (que se modifica
+        durante la construcción) y comparte por referencia la matriz de costos y
+        el resto de los datos.
+        """
+        return self.with_state(self.state.clone())
+
+    def fresh(self):
+        """
+        Vista para una ejecución independiente: estado residual inicial, sin
+        caché de conjuntos abiertos ni memoria de búsquedas; comparte la matriz
+        de costos y el índice de centros más cercanos.
+        """
+        new = self.with_state(ResidualState.initial(self))
+        new.cache = None
+        new.searched = None
+        return new
+
+    def nearest_index(self, k=None):
+        """
+        Índice de centros más cercanos por cliente. Se construye en la primera
+        llamada y se comparte con todas las copias de la instancia.
+
+        Args:
+            k (int): Centros por cliente. Si es None se usa el índice existente
+                     (o `NEAREST_K` si aún no existe).
+
+        Returns:
+            NearestIndex: Índice de la instancia.
+        """
+        if self.nearest is None or (k is not None and k != self.nearest.k):
+            self.nearest = NearestIndex(self.costo) if k is None else NearestIndex(self.costo, k)
+        return self.nearest
+
+    def open_set_cache(self, maxsize=None):
+        """
+        Caché de evaluaciones por conjunto de centros abiertos. Se crea en la
+        primera llamada y se comparte con todas las copias de la instancia.
+
+        Args:
+            maxsize (int): Conjuntos guardados. Si es None se usa la caché
+                           existente (o `CACHE_SIZE` si aún no existe).
+
+        Returns:
+            OpenSetCache: Caché de la instancia.
+        """
+        if self.cache is None or (maxsize is not None and maxsize != self.cache.maxsize):
+            self.cache = OpenSetCache(self.params[0], CACHE_SIZE if maxsize is None else maxsize)
+        return self.cache
+
+    def searched_memo(self, maxsize=None):
+        """
+        Memoria de las soluciones construidas que ya pasaron por la búsqueda
+        local. Se crea en la primera llamada y se comparte con todas las copias.
+
+        Args:
+            maxsize (int): Resultados guardados. Si es None se usa la memoria
+                           existente (o `SEARCHED_SIZE` si aún no existe).
+
+        Returns:
+            SearchedMemo: Memoria de la instancia.
+        """
+        if self.searched is None or (maxsize is not None and maxsize != self.searched.maxsize):
+            self.searched = SearchedMemo(SEARCHED_SIZE if maxsize is None else maxsize)
+        return self.searched
+
+    def fix_closed(self, closed):
+        """
+        Deja definitivamente cerrados los centros de la máscara `closed`
+        (capacidad cero), p. ej. los descartados por la cota Lagrangiana. Las
+        copias creadas antes de la llamada no cambian.
+        """
+        self.initial_capacity = _read_only(np.where(closed, 0.0, self.initial_capacity))
+        self.capacity = np.where(closed, 0.0, self.capacity)
+
+    def save(self, file_path):
+        """Guarda los arreglos originales de la instancia en formato `.npz`."""
+        with open(file_path, 'wb') as file:
+            np.savez(file,
+                     capacity=self.initial_capacity,
+                     costos_fijos=self.costos_fijos,
+                     demandas=self.initial_demand,
+                     costo=self.costo)
+
+    @classmethod
+    def load(cls, file_path, costo=None):
+        """
+        Carga una instancia guardada con `Instance.save` (o los vectores de
+        `convert_instance`, con la matriz `costo` ya abierta).
+        """
+        with np.load(file_path) as arrays:
+            return cls(arrays["capacity"], arrays["costos_fijos"],
+                       arrays["demandas"], arrays["costo"] if costo is None else costo)
+
+
+def _read_only(array, dtype=np.float64):
+    """Arreglo contiguo que no se puede modificar (se comparte entre copias)."""
+    view = np.ascontiguousarray(array, dtype=dtype).view()
+    view.flags.writeable = False
+    return view
+
+
+def cache_path(file_path, cache_dir=None):
+    """
+    Ruta del archivo binario asociado a una instancia.
+
+    La clave combina la ruta absoluta, la fecha de modificación y el tamaño del
+    archivo, de modo que cualquier cambio en el texto invalida la caché.
+
+    Args:
+        file_path (str): Ruta al archivo de la instancia.
+        cache_dir (str): Directorio de caché. Por defecto `__instcache__` junto a la instancia.
+
+    Returns:
+        str: Ruta del archivo `.npz` correspondiente.
+    """
+    info = stat(file_path)
+    key = f"{abspath(file_path)}|{info.st_mtime_ns}|{info.st_size}"
+    digest = hashlib.sha1(key.encode()).hexdigest()
+    if cache_dir is None:
+        cache_dir = join(dirname(abspath(file_path)), CACHE_DIR)
+    return join(cache_dir, digest + ".npz")
+
+
+def read_instance(file_path, cache=True, cache_dir=None, mmap=False, dtype=np.float64):
+    """
+    Lee una instancia y la retorna como un objeto `Instance`.
+
+    Si `cache` está activo, la primera lectura guarda los arreglos en un archivo
+    `.npz` y las siguientes lecturas del mismo archivo lo cargan directamente,
+    sin volver a parsear el texto.
+
+    Args:
+        file_path (str): Ruta al archivo de la instancia.
+        cache (bool): Usar la caché binaria.
+        cache_dir (str): Directorio de caché (opcional).
+        mmap (bool): Dejar la matriz de costos en disco, mapeada en memoria (ver
+                     `read_mapped`); siempre usa la caché.
+        dtype: Tipo de la matriz de costos (`np.float64` o `np.float32`).
+
+    Returns:
+        Instance: Datos de la instancia.
+    """
+    if mmap:
+        return read_mapped(file_path, cache_dir, dtype)
+    if np.dtype(dtype) != np.float64:
+        data = read_instance(file_path, cache, cache_dir)
+        return Instance(data.initial_capacity, data.costos_fijos, data.initial_demand, data.costo.astype(dtype))
+
+    if cache:
+        cached = cache_path(file_path, cache_dir)
+        try:
+            return Instance.load(cached)
+        except FileNotFoundError:
+            pass  # Primera lectura
+        except CORRUPT_CACHE:
+            _discard(cached)  # Está corrupta: se borra y se vuelve a parsear
+
     capacity, costos_fijos, demandas, costos_transporte = leer_archivo(file_path)
+    data = Instance(capacity, costos_fijos, demandas, costos_transporte)
+
+    if cache:
+        # Escritura atómica: nunca se deja un archivo a medio escribir en la caché
+        tmp = cached + ".tmp"
+        try:
+            makedirs(dirname(cached), exist_ok=True)
+            data.save(tmp)
+            replace(tmp, cached)
+        except OSError:
+            _discard(tmp)  # Directorio de solo lectura o disco lleno, se continúa sin caché
+
+    return data
 
-    data = {
-        "params": [len(capacity), len(demandas)],  # Número de centros y clientes
-        "capacity": capacity,
-        "costos_fijos": costos_fijos,
-        "demandas": demandas,
-        "costo": costos_transporte,
-        "initial_capacity": capacity.copy(),
-        "initial_demand": demandas.copy()
-    }
 
+def read_mapped(file_path, cache_dir=None, dtype=np.float64):
+    """
+    Lee una instancia con la matriz de costos mapeada en memoria desde un `.npy`
+    (ver `costmatrix.py`): solo se cargan las filas de los clientes que se usan.
+
+    La primera lectura convierte el texto con `convert_instance` a archivos junto
+    a la caché de la instancia (`cache_path`); las siguientes solo los abren.
+
+    Args:
+        file_path (str): Ruta al archivo de la instancia.
+        cache_dir (str): Directorio de caché (opcional).
+        dtype: Tipo de la matriz en disco (`np.float64` o `np.float32`).
+
+    Returns:
+        Instance: Datos de la instancia, con `costs_path` apuntando a la matriz.
+    """
+    cached = cache_path(file_path, cache_dir)
+    vectors = f"{cached[:-len('.npz')]}.vectors.npz"
+    costs = costs_path(cached, dtype)
+    data = None
+    if exists(vectors) and exists(costs):
+        try:
+            data = Instance.load(vectors, costo=open_costs(costs))
+        except CORRUPT_CACHE:  # Conversión interrumpida o archivos dañados: se vuelve a convertir
+            _discard(vectors)
+            _discard(costs)
+    if data is None:
+        makedirs(dirname(cached), exist_ok=True)
+        convert_instance(file_path, vectors, costs, dtype)
+        data = Instance.load(vectors, costo=open_costs(costs))
+    data.costs_path = costs
     return data
 
 
+def _discard(file_path):
+    """Borra un archivo de la caché si existe (sin fallar si no se puede)."""
+    try:
+        remove(file_path)
+    except OSError:
+        pass
@@ -0,0 +1,137 @@
+"""
+Soluciones guardadas en archivos de resultados (`open [*]` / `proportion [*]`).
+
+    - `read_solution`: arma una `Solution` directamente desde el archivo (ver
+      `read.iter_results`), sin pasar por diccionarios.
+    - `validate`: verifica de forma vectorizada demanda, capacidad y centros
+      cerrados contra los datos de `read_instance`, y recalcula el costo.
+    - `write_results`: escribe una solución en el mismo formato.
+
+Los índices del archivo empiezan en 1 (AMPL) y `proportion` es la fracción de la
+demanda de cada cliente que atiende cada centro, por lo que una solución leída
+se adapta sola a cambios en las demandas de la instancia.
+"""
+import numpy as np
+from scipy.sparse import coo_matrix
+
+from read import iter_results
+from solution import EMPTY, Solution
+
+# Índice del primer centro / cliente en los archivos de resultados
+INDEX_BASE = 1
+
+# Tolerancia relativa de la validación (los archivos redondean las proporciones)
+TOLERANCE = 1e-6
+
+# Cifras significativas de las proporciones escritas
+DIGITS = 12
+
+
+def read_solution(file_path, data):
+    """
+    Lee una solución de un archivo de resultados.
+
+    Args:
+        file_path (str): Ruta al archivo de resultados.
+        data (Instance): Datos de la instancia (demandas y dimensiones).
+
+    Returns:
+        tuple: (Solution, máscara de centros abiertos según la sección `open`,
+               o None si el archivo no la tiene).
+    """
+    n_facilities, n_clients = data["params"]
+    demand = np.asarray(data["initial_demand"])
+    opened = None
+    facilities, clients, proportions = [], [], []
+    for row in iter_results(file_path):
+        if row[0] == "open":
+            if opened is None:
+                opened = np.zeros(n_facilities, dtype=bool)
+            opened[row[1] - INDEX_BASE] = row[2] > 0
+        else:
+            _, facility, columns, values = row
+            facilities.append(np.full(len(columns), facility - INDEX_BASE))
+            clients.append(columns - INDEX_BASE)
+            proportions.append(values)
+
+    if facilities:
+        facilities, clients = np.concatenate(facilities), np.concatenate(clients)
+        amounts = np.concatenate(proportions) * demand[clients]
+    else:
+        facilities = clients = np.empty(0, dtype=np.intp)
+        amounts = np.empty(0)
+    matrix = coo_matrix((amounts, (facilities, clients)), shape=(n_facilities, n_clients))
+    return Solution.from_matrix(matrix), opened
+
+
+def validate(solution, data, opened=None, tolerance=TOLERANCE):
+    """
+    Verifica una solución desde cero (sin usar `load`, `count` ni `cost`).
+
+    Args:
+        solution (Solution): Solución a verificar.
+        data (Instance): Datos de la instancia (valores iniciales).
+        opened (ndarray): Centros abiertos declarados (opcional); atender a un
+                          cliente desde otro centro es una violación.
+        tolerance (float): Tolerancia relativa de demanda y capacidad.
+
+    Returns:
+        dict: "feasible", "cost" y las violaciones: clientes con demanda mal
+              atendida y la mayor diferencia, centros sobre su capacidad y el
+              mayor exceso, y asignaciones a centros cerrados.
+    """
+    capacity = np.asarray(data["initial_capacity"])
+    demand = np.asarray(data["initial_demand"])
+    clients, slots = np.nonzero(solution.facilities != EMPTY)
+    facilities = solution.facilities[clients, slots]
+    amounts = solution.amounts[clients, slots]
+
+    assigned = np.bincount(clients, weights=amounts, minlength=len(demand))
+    load = np.bincount(facilities, weights=amounts, minlength=len(capacity))
+    used = np.bincount(facilities, minlength=len(capacity)) > 0
+
+    demand_error = np.abs(assigned - demand)
+    excess = load - capacity
+    bad_demand = demand_error > tolerance * np.maximum(1.0, demand)
+    bad_capacity = excess > tolerance * np.maximum(1.0, capacity)
+    closed_used = used & ~opened if opened is not None else np.zeros(len(capacity), dtype=bool)
+    negative = int(np.count_nonzero(amounts < 0))
+
+    cost = float(np.asarray(data["costos_fijos"])[used].sum()
+                 + np.dot(amounts, np.asarray(data["costo"])[clients, facilities]))
+    return {
+        "feasible": not (bad_demand.any() or bad_capacity.any() or closed_used.any() or negative),
+        "cost": cost,
+        "clients_unserved": int(bad_demand.sum()),
+        "max_demand_error": float(demand_error.max(initial=0.0)),
+        "facilities_over_capacity": int(bad_capacity.sum()),
+        "max_excess": float(max(0.0, excess.max(initial=0.0))),
+        "closed_facilities_used": int(closed_used.sum()),
+        "negative_amounts": negative,
+    }
+
+
+def write_results(file_path, solution, data):
+    """
+    Escribe una solución como archivo de resultados legible por `read_solution`:
+    la sección `open` con todos los centros y una fila de `proportion` por centro
+    abierto.
+    """
+    n_facilities, n_clients = data["params"]
+    demand = np.asarray(data["initial_demand"])
+    clients, slots = np.nonzero(solution.facilities != EMPTY)
+    facilities = solution.facilities[clients, slots]
+    proportions = np.divide(solution.amounts[clients, slots], demand[clients],
+                            out=np.zeros(len(clients)), where=demand[clients] > 0)
+    matrix = coo_matrix((proportions, (facilities, clients)), shape=(n_facilities, n_clients)).tocsr()
+    opened = np.diff(matrix.indptr) > 0
+
+    with open(file_path, 'w') as file:
+        file.write("open [*] :=\n")
+        for facility in range(n_facilities):
+            file.write(f"{facility + INDEX_BASE} {int(opened[facility])}\n")
+        file.write(";\n\nproportion [*] :=\n")
+        for facility in np.flatnonzero(opened).tolist():
+            row = matrix[facility].toarray().ravel()
+            file.write(f"{facility + INDEX_BASE} " + " ".join(f"{value:.{DIGITS}g}" for value in row) + "\n")
+        file.write(";\n")
@@ -0,0 +1,243 @@
+import numpy as np
+
+from costmatrix import client_blocks
+from deadline import expired
+from solution import EMPTY
+
+# Tolerancia para comparar cargas acumuladas con la capacidad
+EPS = 1e-9
+
+
+class SASEngine:
+    """
+    Estado incremental del vecindario SAS (reasignación de la demanda de un cliente).
+
+    Trabaja sobre una copia de la solución, que ya mantiene la carga de cada
+    centro y cuántas asignaciones positivas tiene (un centro está abierto si tiene
+    al menos una), de modo que el cambio de costo de mover la demanda de un
+    cliente se calcula directamente (ver `deltas`), sin copiar la solución ni
+    llamar a `evaluate_cost`.
+
+    Args:
+        solution (Solution): Solución inicial.
+        data (Instance): Datos de la instancia.
+        tabu_tenure (int): Lotes durante los que un cliente movido no se vuelve a mover.
+        escapes (int): Movimientos que empeoran permitidos al quedar sin mejoras
+                       (solo con `tabu_tenure` > 0 tiene sentido).
+    """
+
+    def __init__(self, solution, data, tabu_tenure=0, escapes=0):
+        self.solution = solution.copy()
+        self.costo = np.asarray(data["costo"])
+        self.costos_fijos = np.asarray(data["costos_fijos"])
+        self.capacity = np.asarray(data["initial_capacity"])
+        self.cost = self.solution.evaluate(data)
+
+        # Mejor movimiento de cada cliente (ver `improve_batch`)
+        self.best_change = None
+        self.best_source = None
+        self.best_target = None
+        # Centros cuya carga cambió desde que se revisaron por última vez
+        self.facility_active = np.ones(len(self.capacity), dtype=bool)
+        self.tabu_tenure = tabu_tenure
+        self.escapes = escapes
+        self.tabu_until = np.zeros(len(self.solution.facilities), dtype=np.int64)
+        self.batches = 0
+        self.examined = 0  # Deltas evaluados
+
+    def apply(self, facility, client, alternative, change):
+        """Aplica el movimiento (con su delta `change`) y actualiza cargas, centros abiertos y costo."""
+        self.solution.move(client, facility, alternative)
+        self.cost += change
+
+    def deltas(self, clients=None, columns=None):
+        """
+        Cambio de costo de varios movimientos a la vez: cada asignación
+        (cliente, centro) hacia cada centro alternativo.
+
+        Args:
+            clients (ndarray): Clientes cuyas asignaciones se evalúan (por defecto todos).
+            columns (ndarray): Centros de destino (por defecto todos).
+
+        Returns:
+            tuple: (clientes, centros de origen, matriz asignaciones x destinos de
+                    deltas); los movimientos no factibles tienen delta infinito.
+        """
+        solution = self.solution
+        if clients is None:
+            clients, slots = np.nonzero(solution.facilities != EMPTY)
+        else:
+            rows, slots = np.nonzero(solution.facilities[clients] != EMPTY)
+            clients = clients[rows]
+        facilities = solution.facilities[clients, slots]
+        amounts = solution.amounts[clients, slots]
+        if columns is None:
+            columns = np.arange(len(self.capacity))
+
+        costs = self.costo[clients[:, None], columns]
+        changes = amounts[:, None] * (costs - self.costo[clients, facilities][:, None])
+        changes += np.where(solution.count[columns] == 0, self.costos_fijos[columns], 0.0)  # Se abre el destino
+        changes -= np.where(solution.count[facilities] == 1, self.costos_fijos[facilities], 0.0)[:, None]
+        changes[solution.load[columns] + amounts[:, None] > self.capacity[columns] + EPS] = np.inf
+        changes[facilities[:, None] == columns] = np.inf
+        return clients, facilities, changes
+
+    # --- Bits de "no mirar" ---------------------------------------------------
+
+    def _best_moves(self, clients=None, columns=None):
+        """
+        Mejor movimiento de cada cliente entre los evaluados por `deltas`.
+
+        Los clientes se evalúan por bloques (`client_blocks`) para acotar el
+        tamaño de la matriz de deltas cuando hay muchos clientes.
+        """
+        if clients is None:
+            clients = np.arange(len(self.solution.facilities))
+        if columns is None:
+            columns = np.arange(len(self.capacity))
+        blocks = list(client_blocks(len(clients), len(columns))) or [slice(0, 0)]
+        moves = [self._block_moves(clients[block], columns) for block in blocks]
+        if len(moves) == 1:
+            return moves[0]
+        return tuple(np.concatenate(parts) for parts in zip(*moves))
+
+    def _block_moves(self, clients, columns):
+        """Mejor movimiento de cada cliente de un bloque (ver `_best_moves`)."""
+        clients, facilities, changes = self.deltas(clients, columns)
+        best = changes.argmin(axis=1) if changes.size else np.zeros(len(clients), dtype=np.intp)
+        gains = changes[np.arange(len(clients)), best] if changes.size else np.full(len(clients), np.inf)
+
+        # Un cliente con varias asignaciones se queda con la de menor delta
+        order = np.lexsort((gains, clients))
+        unique, first = np.unique(clients[order], return_index=True)
+        rows = order[first]
+        return unique, gains[rows], facilities[rows], columns[best[rows]]
+
+    def _refresh(self, clients=None, columns=None):
+        """
+        Recalcula el mejor movimiento de los clientes dados (fila completa) o,
+        con `columns`, solo contra esos destinos, quedándose con el mejor.
+        """
+        n_clients = len(self.solution.facilities)
+        if self.best_change is None:
+            self.best_change = np.full(n_clients, np.inf)
+            self.best_source = np.full(n_clients, EMPTY, dtype=np.intp)
+            self.best_target = np.full(n_clients, EMPTY, dtype=np.intp)
+
+        if columns is None:
+            if clients is not None:
+                self.best_change[clients] = np.inf
+            else:
+                self.best_change[:] = np.inf
+        unique, gains, sources, targets = self._best_moves(clients, columns)
+        better = gains < self.best_change[unique]
+        unique = unique[better]
+        self.best_change[unique] = gains[better]
+        self.best_source[unique] = sources[better]
+        self.best_target[unique] = targets[better]
+
+    def _touch(self, moved, touched, single):
+        """
+        Actualiza los mejores movimientos después de mover a los clientes `moved`
+        entre los centros `touched` (cuya carga y apertura cambiaron).
+
+        En la fila de una asignación desde el centro `a`, lo único que depende de
+        `a` es si cerrarlo ahorra su costo fijo (`count[a] == 1`); la carga y la
+        apertura de los destinos están en sus columnas. Por eso solo se recalculan
+        completas las filas de los clientes movidos, de los atendidos por un centro
+        que entró o salió de `count == 1` (`single` es el estado anterior) y de los
+        cuyo mejor movimiento iba hacia un centro tocado; para los demás basta con
+        revisar las columnas de los centros tocados.
+        """
+        touched = np.flatnonzero(touched)
+        flipped = touched[(self.solution.count[touched] == 1) != single[touched]]
+        dirty = np.isin(self.best_target, touched)
+        if len(flipped):
+            dirty |= np.isin(self.solution.facilities, flipped).any(axis=1)
+        dirty[moved] = True
+        self.facility_active[touched] = True
+
+        clean = np.flatnonzero(~dirty)
+        if len(clean):
+            self._refresh(clean, touched)
+        self._refresh(np.flatnonzero(dirty))
+        self.examined += len(clean) * len(touched) + int(dirty.sum()) * len(self.capacity)
+
+    def reset(self, solution, data):
+        """
+        Continúa desde otra solución (p. ej. después de abrir o cerrar centros)
+        conservando la contabilidad: solo se reevalúan los clientes cuyas
+        asignaciones cambiaron y los centros cuya carga o apertura cambió.
+        """
+        old, new = self.solution, solution.copy()
+        self.solution, self.cost = new, new.evaluate(data)
+        touched = (np.abs(old.load - new.load) > EPS) | (old.count != new.count)
+        if self.best_change is None or old.facilities.shape != new.facilities.shape:
+            self.best_change = None
+            self.facility_active |= touched
+            return
+        moved = np.flatnonzero((old.facilities != new.facilities).any(axis=1)
+                               | (old.amounts != new.amounts).any(axis=1))
+        self._touch(moved, touched, old.count == 1)
+
+    def improve_batch(self, deadline=None):
+        """
+        Mejor mejora por lotes: se mantiene el mejor movimiento de cada cliente y,
+        en cada lote, se aplican de menor a mayor delta los movimientos que mejoran
+        y no comparten centros (ni cliente) con uno ya aplicado, de modo que sus
+        deltas siguen siendo exactos. Después de cada lote solo se vuelven a
+        evaluar las filas y columnas que el lote pudo cambiar (ver `_touch`), por
+        lo que las pasadas cuestan mucho menos que la matriz completa. Repite hasta
+        que ningún movimiento mejore.
+
+        Con `tabu_tenure` > 0 un cliente movido no se vuelve a mover durante ese
+        número de lotes, y si no quedan mejoras se permiten hasta `escapes`
+        movimientos que empeoran (el mejor no tabú); al final se vuelve a la mejor
+        solución visitada.
+
+        Args:
+            deadline (Deadline): Si se cumple, se detiene entre dos lotes.
+
+        Returns:
+            bool: True si la solución mejoró.
+        """
+        if self.best_change is None:
+            self._refresh()
+            self.examined += self.best_change.size * len(self.capacity)
+
+        start_cost = best_cost = self.cost
+        best = None  # (snapshot, costo) de la mejor solución antes de un escape
+        escapes = self.escapes
+        while not expired(deadline):
+            self.batches += 1
+            allowed = self.tabu_until < self.batches
+            candidates = np.flatnonzero((self.best_change < -EPS) & allowed)
+            if not len(candidates):
+                escaping = np.flatnonzero(np.isfinite(self.best_change) & allowed)
+                if not escapes or not len(escaping):
+                    break
+                escapes -= 1
+                if self.cost <= best_cost + EPS:
+                    best = self.solution.snapshot(), self.cost
+                candidates = escaping[[self.best_change[escaping].argmin()]]
+
+            touched = np.zeros(len(self.capacity), dtype=bool)
+            single = self.solution.count == 1
+            moved = []
+            for client in candidates[np.argsort(self.best_change[candidates], kind="stable")].tolist():
+                facility, alternative = int(self.best_source[client]), int(self.best_target[client])
+                if touched[facility] or touched[alternative]:
+                    continue
+                self.apply(facility, client, alternative, self.best_change[client])
+                touched[facility] = touched[alternative] = True
+                moved.append(client)
+            self.tabu_until[moved] = self.batches + self.tabu_tenure
+            self._touch(moved, touched, single)
+            best_cost = min(best_cost, self.cost)
+
+        if best is not None and self.cost > best_cost + EPS:  # Volver a la mejor solución visitada
+            snapshot, self.cost = best
+            self.solution.restore(snapshot)
+            self.best_change = None
+            self.facility_active[:] = True
+        return self.cost < start_cost - EPS
@@ -0,0 +1,425 @@
+"""
+Servicio local de resolución: un proceso de larga duración que recibe trabajos
+por un socket Unix (o TCP en localhost) y los reparte entre procesos worker.
+
+Cada worker importa el solver una sola vez y guarda en memoria las últimas
+instancias que leyó, con su índice de centros más cercanos (`INSTANCE_CACHE`
+por worker). Los trabajos de una instancia se envían de preferencia a un worker
+que ya la tiene, de modo que un trabajo repetido solo paga el tiempo de búsqueda.
+Cada trabajo usa una vista nueva de la instancia (`Instance.fresh`), por lo que
+el resultado es el mismo que el de una ejecución independiente con la misma semilla.
+
+Protocolo: una solicitud JSON por línea y respuestas JSON por línea.
+
+    {"op": "solve", "instance": "capb5000.txt", "seed": 1, "time_limit": 30}
+        -> {"job": 1, "event": "queued", "position": 0}
+        -> {"job": 1, "event": "started", "worker": 0}
+        -> {"job": 1, "event": "progress", "iteration": 3, "cost": ..., "seconds": ...}
+        -> {"job": 1, "event": "done", "status": "ok", "cost": ..., ...}
+    {"op": "cancel", "job": 1}     -> {"event": "cancel", "job": 1, "ok": true}
+    {"op": "status"}               -> {"event": "status", ...}
+
+Los eventos `progress` se envían cada vez que mejora la mejor solución. Un
+trabajo cancelado (o cuyo cliente se desconecta) se detiene como con el límite
+de tiempo y termina con estado `cancelled` y la mejor solución encontrada.
+
+Uso:
+    python service.py serve --workers 4
+    python service.py solve ../intances_abc_dat/capb5000.txt --seed 1 --time-limit 30
+    python service.py status
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import signal
+import socket
+import sys
+from collections import OrderedDict, deque
+from itertools import count
+from os import remove
+from os.path import abspath, exists, join
+from queue import Empty
+from tempfile import gettempdir
+from time import perf_counter
+
+import numpy as np
+
+from GRASP import GRASP
+from instrument import logger
+from read import cache_path, read_instance
+
+# Socket por defecto del servicio
+SOCKET_PATH = join(gettempdir(), "opt2-solver.sock")
+
+# Procesos worker por defecto
+WORKERS = 2
+
+# Instancias leídas que guarda cada worker
+INSTANCE_CACHE = 4
+
+# Opciones de GRASP que acepta un trabajo (además de instance, seed e iterations)
+JOB_OPTIONS = ("alpha", "time_limit", "patience", "nearest_k", "exact", "cache_size", "gap", "single_source",
+               "elite_size", "warm_start")
+
+# Segundos entre revisiones de que el servidor siga vivo (workers sin trabajo)
+PARENT_CHECK = 1.0
+
+# Opciones de lectura de la instancia
+LOAD_OPTIONS = ("mmap", "cost_dtype")
+
+
+class CancelToken:
+    """
+    Cancelación de un trabajo dentro de un worker (ver `Deadline`): se activa
+    cuando el servidor escribe el id del trabajo en el valor compartido del worker.
+    """
+
+    def __init__(self, flag, job):
+        self.flag = flag
+        self.job = job
+
+    def is_set(self):
+        return self.flag.value == self.job
+
+
+def _load(instances, params):
+    """
+    Instancia del trabajo desde la caché del worker (o leyéndola).
+
+    Returns:
+        tuple: (Instance, True si ya estaba en memoria)
+    """
+    dtype = np.dtype(params.get("cost_dtype", "float64"))
+    key = (cache_path(params["instance"]), bool(params.get("mmap", False)), dtype.name)
+    data = instances.get(key)
+    if data is not None:
+        instances.move_to_end(key)
+        return data, True
+
+    data = read_instance(params["instance"], mmap=bool(params.get("mmap", False)), dtype=dtype)
+    data.nearest_index(params.get("nearest_k"))
+    instances[key] = data
+    if len(instances) > INSTANCE_CACHE:
+        instances.popitem(last=False)
+    return data, False
+
+
+def _run_job(job, params, instances, events, cancel):
+    """Resuelve un trabajo y retorna su evento final."""
+    start = perf_counter()
+    data, warm = _load(instances, params)
+    load_seconds = perf_counter() - start
+
+    best = [np.inf]
+
+    def progress(iteration, cost, seconds):
+        if cost is not None and cost < best[0]:
+            best[0] = cost
+            events.put((job, {"event": "progress", "iteration": iteration, "cost": float(cost),
+                              "seconds": seconds}))
+
+    options = {name: params[name] for name in JOB_OPTIONS if params.get(name) is not None}
+    solution, cost = GRASP(params.get("iterations"), params.get("seed"), params["instance"], instance=data,
+                           callback=progress, cancel=cancel, **options)
+    if cancel.is_set():
+        status = "cancelled"
+    else:
+        status = "ok" if cost != float('inf') else "infeasible"
+
+    if params.get("output") and cost != float('inf'):
+        from results import write_results
+        write_results(params["output"], solution, data)
+
+    return {"event": "done", "status": status, "cost": None if cost == float('inf') else float(cost),
+            "open_facilities": solution.open_facilities().tolist(), "warm": warm,
+            "load_seconds": load_seconds, "search_seconds": perf_counter() - start - load_seconds}
+
+
+def _worker_main(index, jobs, events, cancel_flag):
+    """
+    Ciclo de un worker: toma trabajos de `jobs` hasta recibir None o hasta que
+    el servidor deje de existir.
+    """
+    instances = OrderedDict()
+    parent = multiprocessing.parent_process()
+    while True:
+        try:
+            item = jobs.get(timeout=PARENT_CHECK)
+        except Empty:
+            if parent is not None and not parent.is_alive():
+                break
+            continue
+        if item is None:
+            break
+        job, params = item
+        events.put((job, {"event": "started", "worker": index}))
+        try:
+            record = _run_job(job, params, instances, events, CancelToken(cancel_flag, job))
+        except Exception as error:  # Se informa al cliente y el worker sigue atendiendo
+            record = {"event": "done", "status": "error", "error": f"{type(error).__name__}: {error}"}
+        events.put((job, record))
+
+
+class Worker:
+    """Proceso worker y lo que el servidor sabe de él."""
+
+    def __init__(self, index, events):
+        self.index = index
+        self.jobs = multiprocessing.Queue()
+        self.cancel_flag = multiprocessing.RawValue('q', -1)
+        self.process = multiprocessing.Process(target=_worker_main, daemon=True,
+                                               args=(index, self.jobs, events, self.cancel_flag))
+        self.job = None  # Trabajo en curso
+        self.warm = OrderedDict()  # Instancias que tiene en memoria (mismo orden LRU que el worker)
+
+    def assign(self, job):
+        self.job = job
+        self.warm[job.key] = True
+        self.warm.move_to_end(job.key)
+        if len(self.warm) > INSTANCE_CACHE:
+            self.warm.popitem(last=False)
+        self.jobs.put((job.id, job.params))
+
+
+class Job:
+    """Trabajo recibido: parámetros, conexión que lo pidió y worker asignado."""
+
+    def __init__(self, id, params, writer):
+        self.id = id
+        self.params = params
+        self.writer = writer
+        self.worker = None
+        self.key = (abspath(params["instance"]), bool(params.get("mmap", False)),
+                    np.dtype(params.get("cost_dtype", "float64")).name)
+
+
+class SolverService:
+    """
+    Servidor asyncio: cola de trabajos, asignación a workers y envío de eventos.
+
+    Args:
+        workers (int): Procesos worker.
+    """
+
+    def __init__(self, workers=WORKERS):
+        self.events = multiprocessing.Queue()
+        self.workers = [Worker(index, self.events) for index in range(workers)]
+        self.queue = deque()  # Trabajos en espera
+        self.jobs = {}  # Trabajos sin terminar, por id
+        self.ids = count(1)
+        self.server = None
+        self.loop = None
+        self.reader = None
+
+    async def start(self, path=SOCKET_PATH, host=None, port=None):
+        """Inicia los workers y el servidor (socket Unix en `path`, o TCP si se entrega `port`)."""
+        self.loop = asyncio.get_running_loop()
+        for worker in self.workers:
+            worker.process.start()
+        if port is not None:
+            self.server = await asyncio.start_server(self.handle, host or "127.0.0.1", port)
+        else:
+            if exists(path):
+                remove(path)
+            self.server = await asyncio.start_unix_server(self.handle, path)
+        self.reader = self.loop.run_in_executor(None, self._read_events)
+        logger.info("Servicio escuchando en %s con %d workers", port or path, len(self.workers))
+
+    async def serve_forever(self, path=SOCKET_PATH, host=None, port=None):
+        await self.start(path, host, port)
+        self.loop.add_signal_handler(signal.SIGTERM, self.server.close)  # Terminar limpiando los workers
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        except asyncio.CancelledError:
+            pass  # `server.close()` por SIGTERM
+        finally:
+            self.close()
+            if port is None and exists(path):
+                remove(path)
+
+    def close(self):
+        """Detiene los workers y el lector de eventos."""
+        for worker in self.workers:
+            if worker.job is not None:
+                worker.cancel_flag.value = worker.job.id
+            worker.jobs.put(None)
+        for worker in self.workers:
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+        self.events.put(None)
+
+    # --- Eventos de los workers -------------------------------------------
+
+    def _read_events(self):
+        """Hilo que pasa los eventos de los workers al ciclo de asyncio."""
+        while True:
+            item = self.events.get()
+            if item is None:
+                break
+            self.loop.call_soon_threadsafe(self._on_event, *item)
+
+    def _on_event(self, job_id, event):
+        job = self.jobs.get(job_id)
+        if job is None:
+            return
+        self._send(job.writer, {"job": job_id, **event})
+        if event["event"] == "done":
+            if event["status"] == "error":  # Puede que no haya podido leer la instancia
+                job.worker.warm.pop(job.key, None)
+            job.worker.job = None
+            del self.jobs[job_id]
+            self._dispatch()
+
+    # --- Cola -------------------------------------------------------------
+
+    def _dispatch(self):
+        """Asigna trabajos en espera a workers libres, de preferencia uno con la instancia en memoria."""
+        while self.queue:
+            idle = [worker for worker in self.workers if worker.job is None]
+            if not idle:
+                return
+            job = self.queue.popleft()
+            worker = next((w for w in idle if job.key in w.warm), idle[0])
+            job.worker = worker
+            worker.assign(job)
+
+    def submit(self, params, writer):
+        if not params.get("instance"):
+            raise ValueError("El trabajo requiere `instance`")
+        unknown = set(params) - {"op", "instance", "seed", "iterations", "output", *JOB_OPTIONS, *LOAD_OPTIONS}
+        if unknown:
+            raise ValueError(f"Opciones desconocidas: {', '.join(sorted(unknown))}")
+        if params.get("iterations") is None and params.get("time_limit") is None \
+                and params.get("patience") is None:
+            raise ValueError("El trabajo requiere iterations, time_limit o patience")
+
+        job = Job(next(self.ids), {k: v for k, v in params.items() if k != "op"}, writer)
+        self.jobs[job.id] = job
+        self.queue.append(job)
+        self._send(writer, {"job": job.id, "event": "queued", "position": len(self.queue) - 1})
+        self._dispatch()
+        return job
+
+    def cancel(self, job_id):
+        """
+        Returns:
+            bool: False si el trabajo no existe o ya terminó.
+        """
+        job = self.jobs.get(job_id)
+        if job is None:
+            return False
+        if job.worker is None:  # Aún en la cola
+            self.queue.remove(job)
+            del self.jobs[job_id]
+            self._send(job.writer, {"job": job_id, "event": "done", "status": "cancelled", "cost": None})
+        else:
+            job.worker.cancel_flag.value = job_id
+        return True
+
+    def status(self):
+        return {"event": "status", "queued": [job.id for job in self.queue],
+                "running": {worker.index: worker.job.id for worker in self.workers if worker.job},
+                "warm": {worker.index: [key[0] for key in worker.warm] for worker in self.workers}}
+
+    # --- Conexiones -------------------------------------------------------
+
+    def _send(self, writer, message):
+        if not writer.is_closing():
+            writer.write((json.dumps(message) + "\n").encode())
+
+    async def handle(self, reader, writer):
+        """Atiende una conexión: solicitudes JSON por línea."""
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    op = request.get("op")
+                    if op == "solve":
+                        self.submit(request, writer)
+                    elif op == "cancel":
+                        self._send(writer, {"event": "cancel", "job": request.get("job"),
+                                            "ok": self.cancel(request.get("job"))})
+                    elif op == "status":
+                        self._send(writer, self.status())
+                    else:
+                        raise ValueError(f"Operación desconocida: {op}")
+                except (ValueError, TypeError) as error:
+                    self._send(writer, {"event": "error", "error": str(error)})
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            # Los trabajos de un cliente que se desconecta se cancelan
+            for job in [job for job in self.jobs.values() if job.writer is writer]:
+                self.cancel(job.id)
+            writer.close()
+
+
+def connect(path=SOCKET_PATH, host=None, port=None):
+    """Socket conectado al servicio (Unix en `path`, o TCP si se entrega `port`)."""
+    if port is not None:
+        return socket.create_connection((host or "127.0.0.1", port))
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(path)
+    return client
+
+
+def request(message, path=SOCKET_PATH, host=None, port=None):
+    """
+    Envía una solicitud y entrega las respuestas: para `solve`, todos los eventos
+    del trabajo hasta `done`; para las demás, la única respuesta.
+
+    Yields:
+        dict: Eventos del servicio.
+    """
+    with connect(path, host, port) as client, client.makefile('rw') as stream:
+        stream.write(json.dumps(message) + "\n")
+        stream.flush()
+        for line in stream:
+            event = json.loads(line)
+            yield event
+            if message.get("op") != "solve" or event["event"] in ("done", "error"):
+                return
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("serve", "solve", "cancel", "status"))
+    parser.add_argument("target", nargs="?", help="Instancia (solve) o id del trabajo (cancel)")
+    parser.add_argument("--socket", default=SOCKET_PATH)
+    parser.add_argument("--port", type=int, default=None, help="Usar TCP en localhost en vez del socket Unix")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--iterations", type=int, default=None)
+    parser.add_argument("--time-limit", type=float, default=None)
+    parser.add_argument("--patience", type=int, default=None)
+    parser.add_argument("--output", default=None, help="Archivo de resultados (ver results.py)")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        from instrument import configure_logging
+        configure_logging()
+        try:
+            asyncio.run(SolverService(args.workers).serve_forever(args.socket, port=args.port))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if args.command == "solve":
+        message = {"op": "solve", "instance": abspath(args.target), "seed": args.seed,
+                   "iterations": args.iterations, "time_limit": args.time_limit, "patience": args.patience,
+                   "output": abspath(args.output) if args.output else None}
+    elif args.command == "cancel":
+        message = {"op": "cancel", "job": int(args.target)}
+    else:
+        message = {"op": "status"}
+    for event in request(message, args.socket, port=args.port):
+        print(json.dumps(event))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+"""
+Modo de fuente única (SSCFLP): cada cliente es atendido por un solo centro.
+
+La solución es un arreglo int32 de largo C con el centro de cada cliente, más
+la carga y el número de clientes de cada centro, de modo que no hay posiciones
+por cliente ni cantidades que mantener. Los vecindarios son:
+
+    shift: mover un cliente a otro centro.
+    swap:  intercambiar los centros de dos clientes (no abre ni cierra centros).
+
+Para elegir el mejor movimiento de un cliente se calcula con numpy el cambio
+de costo hacia todos los centros (shift) o con todos los clientes (swap) a la
+vez, sin copiar la solución. El costo y la factibilidad se calculan con
+`initial_capacity` e `initial_demand`, igual que en el modo de proporciones.
+"""
+import numpy as np
+
+from deadline import expired
+from GRASP import (ALPHA, CAPACITY_EXHAUSTED, COMPLETE, TIME_LIMIT, CandidateScores,
+                   construct_candidates, select_candidate)
+from instrument import logger, timed
+from sas import EPS
+from solution import EMPTY, Solution
+
+# Clientes revisados entre cada consulta del límite de tiempo
+DEADLINE_CHECK = 64
+
+
+class SingleSolution:
+    """
+    Solución de fuente única.
+
+    Args:
+        n_facilities (int): Número de centros.
+        n_clients (int): Número de clientes.
+    """
+
+    __slots__ = ("assignment", "load", "count", "cost")
+
+    def __init__(self, n_facilities, n_clients):
+        self.assignment = np.full(n_clients, EMPTY, dtype=np.int32)
+        self.load = np.zeros(n_facilities)
+        self.count = np.zeros(n_facilities, dtype=np.int32)
+        self.cost = None
+
+    @property
+    def shape(self):
+        return len(self.load), len(self.assignment)
+
+    def __repr__(self):
+        return (f"SingleSolution(shape={self.shape}, open={int(np.count_nonzero(self.count))}, "
+                f"cost={self.cost})")
+
+    def open_facilities(self):
+        """Índices de los centros con al menos un cliente."""
+        return np.flatnonzero(self.count > 0)
+
+    def assign(self, client, facility, amount):
+        """Asigna un cliente sin centro (construcción)."""
+        self.assignment[client] = facility
+        self.load[facility] += amount
+        self.count[facility] += 1
+        self.cost = None
+
+    def shift(self, client, facility, amount):
+        """Mueve el cliente (con demanda `amount`) a `facility`."""
+        current = self.assignment[client]
+        self.load[current] -= amount
+        self.count[current] -= 1
+        self.assign(client, facility, amount)
+
+    def swap(self, client, other, amount, other_amount):
+        """Intercambia los centros de dos clientes."""
+        a, b = self.assignment[client], self.assignment[other]
+        self.assignment[client], self.assignment[other] = b, a
+        self.load[a] += other_amount - amount
+        self.load[b] += amount - other_amount
+        self.cost = None
+
+    def evaluate(self, data):
+        """Costo total (costos fijos de los centros abiertos más transporte)."""
+        if self.cost is None:
+            clients = np.arange(len(self.assignment))
+            transport = np.dot(data["initial_demand"], data["costo"][clients, self.assignment])
+            self.cost = float(data["costos_fijos"][self.count > 0].sum() + transport)
+        return self.cost
+
+    def is_feasible(self, data):
+        """
+        Verifica desde cero (sin usar `load`) que todos los clientes tengan centro
+        y que ninguna capacidad se exceda.
+        """
+        if (self.assignment == EMPTY).any():
+            return False
+        load = np.bincount(self.assignment, weights=data["initial_demand"], minlength=len(self.load))
+        return bool((load <= data["initial_capacity"] + EPS).all())
+
+    def copy(self):
+        new = object.__new__(SingleSolution)
+        new.assignment = self.assignment.copy()
+        new.load = self.load.copy()
+        new.count = self.count.copy()
+        new.cost = self.cost
+        return new
+
+    def to_solution(self, data):
+        """Misma solución como `Solution` (una posición por cliente)."""
+        n_facilities, n_clients = self.shape
+        solution = Solution(n_facilities, n_clients, slots=1)
+        solution.facilities[:, 0] = self.assignment
+        solution.amounts[:, 0] = np.where(self.assignment != EMPTY, data["initial_demand"], 0.0)
+        solution.load = self.load.copy()
+        solution.count = self.count.copy()
+        return solution
+
+
+class SingleConstructionState:
+    """
+    Estado de la construcción de fuente única: un cliente solo puede ir a un
+    centro cuya capacidad restante (`data["capacity"]`) cubra toda su demanda.
+
+    Args:
+        data (Instance): Datos de la instancia (se modifica su capacidad residual).
+    """
+
+    def __init__(self, data):
+        self.solution = SingleSolution(data["params"][0], data["params"][1])
+        self.demand = data["initial_demand"]
+        self.capacity = data["capacity"]
+        self.cost = None
+        self.stop_reason = None
+
+    def pending(self):
+        return np.flatnonzero(self.solution.assignment == EMPTY)
+
+    def assign(self, facility, client):
+        amount = self.demand[client]
+        self.solution.assign(client, facility, amount)
+        self.capacity[facility] -= amount
+
+
+@timed("construction")
+def construct_single(seed, data, alpha=ALPHA, deadline=None):
+    """
+    Construcción greedy aleatoria de fuente única.
+
+    Los candidatos de cada cliente sin centro son sus centros más cercanos con
+    capacidad suficiente para toda su demanda (ver `CandidateScores`, con el
+    mismo costo greedy que el modo de proporciones); después de cada
+    asignación solo se recalculan los clientes que el centro ya no puede
+    atender. En cada paso se elige un par de la RCL (`construct_candidates`).
+
+    Args:
+        seed (int): Semilla de la construcción.
+        data (Instance): Datos de la instancia (se modifica su capacidad residual).
+        alpha (float): Parámetro de la RCL.
+        deadline (Deadline): Límite de tiempo (opcional).
+
+    Returns:
+        SingleConstructionState: Estado final, con la solución, su costo y el
+                                 motivo de término.
+    """
+    rng = np.random.default_rng(seed)
+    state = SingleConstructionState(data)
+    clients = state.pending()
+    candidates = CandidateScores(data, clients, amounts=state.demand)
+
+    for _ in range(len(clients)):
+        if expired(deadline):
+            state.stop_reason = TIME_LIMIT
+            break
+
+        rcl = construct_candidates(candidates, alpha)
+        if len(rcl) == 0:
+            state.stop_reason = CAPACITY_EXHAUSTED
+            break
+        selection = select_candidate(rcl, rng)
+
+        opened = state.solution.count[selection[0]] == 0
+        state.assign(*selection)
+        candidates.update(*selection, opened, satisfied=True)
+    else:
+        state.stop_reason = COMPLETE
+
+    state.cost = state.solution.evaluate(data)
+    return state
+
+
+class SingleSourceEngine:
+    """
+    Búsqueda local de fuente única con vecindarios shift y swap.
+
+    Args:
+        solution (SingleSolution): Solución inicial (se trabaja sobre una copia).
+        data (Instance): Datos de la instancia.
+    """
+
+    def __init__(self, solution, data):
+        self.solution = solution.copy()
+        self.costo = np.asarray(data["costo"])
+        self.costos_fijos = np.asarray(data["costos_fijos"])
+        self.capacity = np.asarray(data["initial_capacity"])
+        self.demand = np.asarray(data["initial_demand"])
+        self.cost = self.solution.evaluate(data)
+
+    def best_shift(self, client):
+        """
+        Mejor shift del cliente, evaluando todos los centros a la vez.
+
+        Returns:
+            tuple: (centro, delta); delta es infinito si no hay shift factible.
+        """
+        solution, amount = self.solution, self.demand[client]
+        current = solution.assignment[client]
+        row = self.costo[client]
+        changes = amount * (row - row[current]) + np.where(solution.count == 0, self.costos_fijos, 0.0)
+        if solution.count[current] == 1:
+            changes -= self.costos_fijos[current]
+        changes[solution.load + amount > self.capacity + EPS] = np.inf
+        changes[current] = np.inf
+        facility = int(changes.argmin())
+        return facility, changes[facility]
+
+    def best_swap(self, client):
+        """
+        Mejor swap del cliente, evaluando todos los demás clientes a la vez.
+
+        Returns:
+            tuple: (cliente, delta); delta es infinito si no hay swap factible.
+        """
+        solution = self.solution
+        assignment, load = solution.assignment, solution.load
+        a, amount = assignment[client], self.demand[client]
+        others = self.demand
+        changes = (amount * (self.costo[client, assignment] - self.costo[client, a])
+                   + others * (self.costo[:, a] - self.costo[np.arange(len(others)), assignment]))
+        infeasible = ((assignment == a)
+                      | (load[a] - amount + others > self.capacity[a] + EPS)
+                      | (load[assignment] - others + amount > self.capacity[assignment] + EPS))
+        changes[infeasible] = np.inf
+        other = int(changes.argmin())
+        return other, changes[other]
+
+    def improve(self, deadline=None):
+        """
+        Recorre los clientes y aplica, para cada uno, el mejor shift si reduce el
+        costo y, si no, el mejor swap.
+
+        Returns:
+            bool: True si se aplicó al menos un movimiento.
+        """
+        improved = False
+        solution = self.solution
+        for client in range(len(solution.assignment)):
+            if client % DEADLINE_CHECK == 0 and expired(deadline):
+                break
+            facility, change = self.best_shift(client)
+            if change < -EPS:
+                solution.shift(client, facility, self.demand[client])
+                self.cost += change
+                improved = True
+                continue
+            other, change = self.best_swap(client)
+            if change < -EPS:
+                solution.swap(client, other, self.demand[client], self.demand[other])
+                self.cost += change
+                improved = True
+        return improved
+
+
+@timed("local_search")
+def local_search_single(solution, data, deadline=None):
+    """
+    Búsqueda local de fuente única hasta que ninguna pasada mejore.
+
+    Returns:
+        tuple: (solución, costo recalculado desde cero)
+    """
+    engine = SingleSourceEngine(solution, data)
+    while engine.improve(deadline) and not expired(deadline):
+        logger.debug("Fuente única, costo: %s", engine.cost)
+    solution = engine.solution
+    solution.cost = None
+    return solution, solution.evaluate(data)
+
+
+def single_source_iteration(seed, data, alpha=ALPHA, deadline=None):
+    """
+    Iteración de GRASP de fuente única (ver `GRASP_iteration`).
+
+    Args:
+        seed (int): Semilla de la iteración.
+        data (Instance): Copia de la instancia para la iteración.
+        alpha (float): Parámetro de la RCL.
+        deadline (Deadline): Límite de tiempo (opcional).
+
+    Returns:
+        tuple: (Solution, costo), o None si no se pudo asignar a todos los clientes.
+    """
+    state = construct_single(seed, data, alpha, deadline)
+    if state.stop_reason != COMPLETE:
+        logger.info("Solución inicial de fuente única inválida (%s)", state.stop_reason)
+        return None
+
+    solution, cost = local_search_single(state.solution, data, deadline)
+    if not solution.is_feasible(data):
+        logger.warning("La búsqueda local de fuente única generó una solución infactible")
+        return None
+    return solution.to_solution(data), cost
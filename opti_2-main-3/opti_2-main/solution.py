@@ -0,0 +1,235 @@
+import numpy as np
+from scipy.sparse import csr_matrix, dok_matrix
+
+# Marca de posición libre en `Solution.facilities`
+EMPTY = -1
+
+# Posiciones iniciales por cliente (casi todos los clientes son atendidos por 1 o 2 centros)
+SLOTS = 2
+
+
+class Solution:
+    """
+    Solución del problema almacenada por cliente en arreglos planos.
+
+    Es un formato tipo CSR con largo de fila fijo: la fila `client` de
+    `facilities` / `amounts` contiene los centros que atienden al cliente y la
+    demanda asignada a cada uno; las posiciones libres tienen centro `EMPTY`.
+    Si un cliente necesita más posiciones, todas las filas se amplían.
+
+    Además mantiene la carga de cada centro, cuántas asignaciones positivas tiene
+    (un centro está abierto si tiene al menos una) y el costo de la última
+    evaluación, que se invalida con cada modificación.
+
+    Args:
+        n_facilities (int): Número de centros.
+        n_clients (int): Número de clientes.
+        slots (int): Posiciones iniciales por cliente.
+    """
+
+    __slots__ = ("facilities", "amounts", "load", "count", "cost")
+
+    def __init__(self, n_facilities, n_clients, slots=SLOTS):
+        self.facilities = np.full((n_clients, slots), EMPTY, dtype=np.int32)
+        self.amounts = np.zeros((n_clients, slots))
+        self.load = np.zeros(n_facilities)
+        self.count = np.zeros(n_facilities, dtype=np.int32)
+        self.cost = None
+
+    @property
+    def shape(self):
+        return len(self.load), len(self.facilities)
+
+    @property
+    def nnz(self):
+        return int(np.count_nonzero(self.facilities != EMPTY))
+
+    def __repr__(self):
+        return f"Solution(shape={self.shape}, nnz={self.nnz}, open={int(np.count_nonzero(self.count))}, cost={self.cost})"
+
+    # --- Consultas ---------------------------------------------------------
+
+    def _slot(self, facility, client):
+        row = self.facilities[client].tolist()  # Filas cortas: más rápido que comparar con numpy
+        return row.index(facility) if facility in row else -1
+
+    def get(self, facility, client):
+        """Demanda del cliente asignada al centro."""
+        slot = self._slot(facility, client)
+        return float(self.amounts[client, slot]) if slot >= 0 else 0.0
+
+    def assigned(self):
+        """Demanda asignada a cada cliente."""
+        return self.amounts.sum(axis=1)
+
+    def open_facilities(self):
+        """Índices de los centros con al menos una asignación."""
+        return np.flatnonzero(self.count > 0)
+
+    def items(self):
+        """Asignaciones como ((centro, cliente), cantidad), igual que `dok_matrix.items()`."""
+        clients, slots = np.nonzero(self.facilities != EMPTY)
+        for client, slot in zip(clients.tolist(), slots.tolist()):
+            yield (int(self.facilities[client, slot]), client), float(self.amounts[client, slot])
+
+    def keys(self):
+        return (key for key, _ in self.items())
+
+    # --- Modificaciones ----------------------------------------------------
+
+    def _grow(self):
+        extra = self.facilities.shape[1]
+        self.facilities = np.hstack((self.facilities, np.full((len(self.facilities), extra), EMPTY, dtype=np.int32)))
+        self.amounts = np.hstack((self.amounts, np.zeros((len(self.amounts), extra))))
+
+    def _clear(self, facility, client, slot):
+        self.facilities[client, slot] = EMPTY
+        self.amounts[client, slot] = 0
+        self.count[facility] -= 1
+
+    def add(self, facility, client, amount):
+        """
+        Suma `amount` (puede ser negativo) a la asignación del cliente en el centro.
+        Si la asignación queda en cero o menos, se elimina.
+        """
+        slot = self._slot(facility, client)
+        if slot < 0:
+            if amount <= 0:
+                return
+            free = np.flatnonzero(self.facilities[client] == EMPTY)
+            if not len(free):
+                self._grow()
+                free = np.flatnonzero(self.facilities[client] == EMPTY)
+            slot = int(free[0])
+            self.facilities[client, slot] = facility
+            self.count[facility] += 1
+
+        self.amounts[client, slot] += amount
+        self.load[facility] += amount
+        if self.amounts[client, slot] <= 0:
+            self.load[facility] -= self.amounts[client, slot]
+            self._clear(facility, client, slot)
+        self.cost = None
+
+    def move(self, client, facility, alternative):
+        """
+        Mueve toda la demanda del cliente asignada a `facility` hacia `alternative`.
+
+        Returns:
+            float: Cantidad movida.
+        """
+        slot = self._slot(facility, client)
+        if slot < 0 or facility == alternative:
+            return 0.0
+        amount = self.amounts[client, slot]
+        target = self._slot(alternative, client)
+
+        if target >= 0:  # El cliente ya era atendido por `alternative`: se juntan
+            self.amounts[client, target] += amount
+            self._clear(facility, client, slot)
+        else:            # Se reutiliza la misma posición
+            self.facilities[client, slot] = alternative
+            self.count[facility] -= 1
+            self.count[alternative] += 1
+
+        self.load[facility] -= amount
+        self.load[alternative] += amount
+        self.cost = None
+        return float(amount)
+
+    def remove_facility(self, facility):
+        """
+        Elimina todas las asignaciones de un centro.
+
+        Returns:
+            tuple: (clientes, cantidades) que estaban asignados al centro.
+        """
+        clients, slots = np.nonzero(self.facilities == facility)
+        amounts = self.amounts[clients, slots].copy()
+        self.facilities[clients, slots] = EMPTY
+        self.amounts[clients, slots] = 0
+        self.load[facility] = 0
+        self.count[facility] = 0
+        self.cost = None
+        return clients, amounts
+
+    # --- Costo -------------------------------------------------------------
+
+    def evaluate(self, data):
+        """
+        Calcula (y guarda en `cost`) el costo total: costos fijos de los centros
+        abiertos más el costo de transporte de cada asignación.
+        """
+        if self.cost is None:
+            clients, slots = np.nonzero(self.facilities != EMPTY)
+            facilities = self.facilities[clients, slots]
+            fixed = np.asarray(data["costos_fijos"])[self.count > 0].sum()
+            transport = np.dot(self.amounts[clients, slots], np.asarray(data["costo"])[clients, facilities])
+            self.cost = float(fixed + transport)
+        return self.cost
+
+    # --- Copias ------------------------------------------------------------
+
+    def copy(self):
+        new = object.__new__(Solution)
+        new.facilities = self.facilities.copy()
+        new.amounts = self.amounts.copy()
+        new.load = self.load.copy()
+        new.count = self.count.copy()
+        new.cost = self.cost
+        return new
+
+    def snapshot(self):
+        """Estado actual como tupla de arreglos, para volver a él con `restore`."""
+        return (self.facilities.copy(), self.amounts.copy(), self.load.copy(),
+                self.count.copy(), self.cost)
+
+    def restore(self, snapshot):
+        """Vuelve al estado guardado por `snapshot` (el snapshot se puede reutilizar)."""
+        facilities, amounts, load, count, cost = snapshot
+        self.facilities = facilities.copy()
+        self.amounts = amounts.copy()
+        np.copyto(self.load, load)
+        np.copyto(self.count, count)
+        self.cost = cost
+
+    # --- Conversiones ------------------------------------------------------
+
+    def toarray(self):
+        """Matriz densa (centros x clientes)."""
+        dense = np.zeros(self.shape)
+        clients, slots = np.nonzero(self.facilities != EMPTY)
+        np.add.at(dense, (self.facilities[clients, slots], clients), self.amounts[clients, slots])
+        return dense
+
+    def to_csr(self):
+        clients, slots = np.nonzero(self.facilities != EMPTY)
+        return csr_matrix((self.amounts[clients, slots], (self.facilities[clients, slots], clients)),
+                          shape=self.shape)
+
+    def to_dok(self):
+        return dok_matrix(self.to_csr())
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        """
+        Construye una solución desde una matriz (centros x clientes) densa o
+        dispersa (`dok_matrix`, `csr_matrix`, ...).
+        """
+        coo = csr_matrix(matrix).tocoo()
+        positive = coo.data > 0
+        facilities, clients, amounts = coo.row[positive], coo.col[positive], coo.data[positive]
+
+        per_client = np.bincount(clients, minlength=coo.shape[1])
+        solution = cls(coo.shape[0], coo.shape[1], max(SLOTS, int(per_client.max(initial=0))))
+
+        order = np.argsort(clients, kind="stable")
+        clients, facilities, amounts = clients[order], facilities[order], amounts[order]
+        starts = np.concatenate(([0], np.cumsum(per_client)[:-1]))
+        slots = np.arange(len(clients)) - starts[clients]
+
+        solution.facilities[clients, slots] = facilities
+        solution.amounts[clients, slots] = amounts
+        solution.load = np.bincount(facilities, weights=amounts, minlength=coo.shape[0]).astype(np.float64)
+        solution.count = np.bincount(facilities, minlength=coo.shape[0]).astype(np.int32)
+        return solution
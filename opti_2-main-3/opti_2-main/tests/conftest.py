@@ -0,0 +1,29 @@
+import sys
+from os.path import abspath, dirname, join
+
+import pytest
+
+# Los módulos del proyecto se importan por nombre (`from read import ...`)
+ROOT = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Instancias incluidas (las cap* son de 100 centros x 1000 clientes)
+INSTANCES = join(dirname(ROOT), "intances_abc_dat")
+INSTANCE = join(INSTANCES, "capb5000.txt")
+
+
+@pytest.fixture(scope="session")
+def instance_path():
+    return INSTANCE
+
+
+@pytest.fixture(scope="session")
+def instances_dir():
+    return INSTANCES
+
+
+@pytest.fixture(scope="session")
+def instance():
+    """Instancia leída una vez por sesión; los tests que la modifican usan `fresh()`."""
+    from read import read_instance
+    return read_instance(INSTANCE)
@@ -0,0 +1,39 @@
+import logging
+from time import perf_counter
+
+import pytest
+
+from GRASP import GRASP
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    logging.disable(logging.INFO)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+def test_unbounded_run_needs_a_stop_condition(instance_path):
+    with pytest.raises(ValueError):
+        GRASP(None, 1, instance_path)
+
+
+def test_time_limit_stops_an_unbounded_run(instance_path):
+    calls = []
+    start = perf_counter()
+    solution, cost = GRASP(None, 1, instance_path, time_limit=1.5, callback=lambda *args: calls.append(args))
+    assert perf_counter() - start < 3.0
+    assert solution is not None and cost == calls[-1][1]
+    assert calls[-1][2] < 3.0
+
+
+def test_patience_stops_after_iterations_without_improvement(instance_path):
+    calls = []
+    _, cost = GRASP(None, 2, instance_path, alpha=0.2, patience=3, callback=lambda *args: calls.append(args))
+    iterations = [call[0] for call in calls]
+    costs = [call[1] for call in calls]
+    assert iterations == list(range(1, len(calls) + 1))
+    assert costs == sorted(costs, reverse=True)  # El mejor costo nunca empeora
+    improved = max(i for i in range(len(costs)) if i == 0 or costs[i] < costs[i - 1])
+    assert len(costs) - 1 - improved == 3
+    assert cost == costs[-1]
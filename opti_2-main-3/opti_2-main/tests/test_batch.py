@@ -0,0 +1,44 @@
+import csv
+import json
+import logging
+
+import pytest
+
+from batch import FIELDS, main, run_batch
+from GRASP import GRASP
+
+
+def test_jsonl_records_match_grasp(instance_path, tmp_path):
+    output = tmp_path / "out.jsonl"
+    records = run_batch([instance_path], [1, 2], 1, str(output), jobs=2)
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(lines, key=lambda r: r["seed"]) == sorted(records, key=lambda r: r["seed"])
+
+    logging.disable(logging.INFO)
+    try:
+        for record in lines:
+            assert list(record) == list(FIELDS)
+            assert record["status"] == "ok" and record["error"] is None
+            assert record["n_open"] == len(record["open_facilities"])
+            assert record["cost"] == GRASP(1, record["seed"], instance_path)[1]
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def test_csv_output_and_errors(instance_path, tmp_path):
+    output = tmp_path / "out.csv"
+    missing = str(tmp_path / "no_existe.txt")
+    assert main([instance_path, missing, "--seeds", "3", "--iterations", "1", "--output", str(output)]) == 1
+
+    with open(output, newline='') as file:
+        rows = {row["instance"]: row for row in csv.DictReader(file)}
+    assert list(rows["capb5000.txt"]) == list(FIELDS)
+    ok = rows["capb5000.txt"]
+    assert ok["status"] == "ok" and len(ok["open_facilities"].split()) == int(ok["n_open"])
+    assert rows["no_existe.txt"]["status"] == "error"
+    assert "FileNotFoundError" in rows["no_existe.txt"]["error"]
+
+
+def test_requires_a_stop_condition(instance_path, tmp_path):
+    with pytest.raises(SystemExit):
+        main([instance_path, "--output", str(tmp_path / "out.jsonl")])
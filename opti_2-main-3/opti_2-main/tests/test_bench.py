@@ -0,0 +1,45 @@
+import json
+import logging
+
+from bench import compare, main, run
+from GRASP import GRASP
+
+
+def record(cost, seconds, seed=1):
+    return {"instance": "capb5000.txt", "seed": seed, "iterations": 3, "workers": 1,
+            "best_cost": cost, "total_seconds": seconds}
+
+
+def test_run_is_reproducible(instance_path, tmp_path, capsys):
+    output = tmp_path / "bench.json"
+    report = run([instance_path], [1], 2, output=str(output))
+    assert json.loads(output.read_text()) == report
+
+    result, = report["results"]
+    assert result["instance"] == "capb5000.txt" and result["seed"] == 1
+    assert result["construction_seconds"] > 0 and result["local_search_seconds"] > 0
+    assert result["peak_rss_kb"] > 0
+    logging.disable(logging.INFO)
+    try:
+        assert result["best_cost"] == GRASP(2, 1, instance_path)[1]
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def test_compare_reports_time_and_cost_regressions():
+    baseline = {"results": [record(100.0, 10.0), record(100.0, 10.0, seed=2)]}
+    current = {"results": [record(100.0, 11.0), record(101.0, 13.0, seed=2), record(1.0, 1.0, seed=3)]}
+    regressions = compare(baseline, current)
+    assert len(regressions) == 2
+    assert all("seed=2" in message for message in regressions)
+    assert compare(baseline, current, time_tolerance=0.5, cost_tolerance=0.05) == []
+
+
+def test_compare_exit_code(tmp_path, capsys):
+    base, current = tmp_path / "base.json", tmp_path / "current.json"
+    base.write_text(json.dumps({"results": [record(100.0, 10.0)]}))
+    current.write_text(json.dumps({"results": [record(100.0, 10.0)]}))
+    assert main(["compare", str(base), str(current)]) == 0
+    current.write_text(json.dumps({"results": [record(None, 10.0)]}))
+    assert main(["compare", str(base), str(current)]) == 1
+    assert "sin solución" in capsys.readouterr().out
@@ -0,0 +1,45 @@
+import logging
+from os.path import join
+
+import numpy as np
+import pytest
+
+from GRASP import GRASP, GRASP_iteration, construct, lower_bound
+from read import read_instance
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    logging.disable(logging.INFO)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+@pytest.fixture(scope="module")
+def capc_path(instances_dir):
+    return join(instances_dir, "capc5000.txt")  # La cota cierra algunos de sus centros
+
+
+def test_bound_is_below_feasible_costs(instance):
+    data = instance.fresh()
+    bound = lower_bound(data)
+    assert np.isfinite(bound.value)
+    for seed in range(5):
+        state = construct(seed, instance.fresh(), alpha=0.3)
+        assert bound.value <= state.cost
+        _, cost = GRASP_iteration(seed, data)
+        assert bound.value <= cost
+
+
+def test_fixed_closed_facilities_never_reopen(capc_path):
+    original = read_instance(capc_path)
+    data = original.fresh()
+    lower_bound(data)
+    closed = (data["initial_capacity"] == 0) & (original["initial_capacity"] > 0)
+    assert closed.any()
+
+    for seed in range(4):
+        solution, _ = GRASP_iteration(seed, data)
+        assert not solution.count[closed].any()
+    solution, _ = GRASP(6, 1, capc_path, gap=1e-6, elite_size=3)
+    assert not solution.count[closed].any()
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from catalog import Catalog, InstanceFile
+from read import read_instance, read_options
+
+
+def test_headers_match_full_parse(instances_dir):
+    catalog = Catalog(instances_dir)
+    assert len(catalog) > 0
+    for entry in catalog:
+        data = read_instance(entry.path)
+        assert entry.dims == data["params"]
+    assert read_options(instances_dir) == catalog.options()
+
+
+def test_sections_match_full_parse(instance_path):
+    entry = InstanceFile(instance_path)
+    data = read_instance(instance_path, cache=False)
+    assert np.array_equal(entry.section("capacity"), data["initial_capacity"])
+    assert np.array_equal(entry.section("in_cost"), data["costos_fijos"])
+    assert np.array_equal(entry.section("demand"), data["initial_demand"])
+    assert np.array_equal(entry.section("cost"), data["costo"])
+
+
+def test_file_without_header(instance_path, tmp_path):
+    with open(instance_path) as file:
+        lines = [line for line in file if not line.startswith(("param C", "param F"))]
+    path = tmp_path / "sin_encabezado.txt"
+    path.write_text("".join(lines))
+
+    entry = Catalog(str(tmp_path))["sin_encabezado"]
+    assert entry.dims is None
+    assert entry.facilities() == 100
+    assert entry.section("cost").shape == (1000, 100)
+    with pytest.raises(NotADirectoryError):
+        Catalog(str(path))
@@ -0,0 +1,44 @@
+import logging
+from os.path import getsize
+
+import numpy as np
+import pytest
+
+from checkpoint import read_checkpoint, restore, snapshot, write_checkpoint
+from GRASP import GRASP
+from transport import cached_transport
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    logging.disable(logging.INFO)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+def test_resumed_run_matches_uninterrupted_run(instance_path, tmp_path):
+    path = str(tmp_path / "run.npz")
+    full = GRASP(6, 3, instance_path, alpha=0.2, elite_size=3)
+    GRASP(3, 3, instance_path, alpha=0.2, elite_size=3, checkpoint_path=path, checkpoint_interval=0)
+    assert getsize(path) < 200_000
+    assert read_checkpoint(path, full[0].shape[1])["meta"]["iterations"] == 3
+    resumed = GRASP(6, 3, instance_path, alpha=0.2, elite_size=3, checkpoint_path=path, resume=True)
+    assert resumed[1] == full[1]
+    assert np.array_equal(resumed[0].toarray(), full[0].toarray())
+
+
+def test_cache_is_rebuilt_from_its_keys(instance, tmp_path):
+    data = instance.fresh()
+    rng = np.random.default_rng(0)
+    sets = [rng.choice(len(data["costos_fijos"]), 40, replace=False) for _ in range(4)]
+    expected = [cached_transport(data, facilities)[1] for facilities in sets]
+    cache = data.open_set_cache()
+
+    path = str(tmp_path / "cache.npz")
+    write_checkpoint(path, snapshot({}, data, None))
+    resumed = instance.fresh()
+    resumed.open_set_cache()  # Como en el modo `exact`
+    restore(read_checkpoint(path, data["params"][1]), resumed)
+    rebuilt = resumed.open_set_cache()
+    assert list(rebuilt.entries) == list(cache.entries)
+    assert [rebuilt.entries[cache.key(facilities)][0] for facilities in sets] == pytest.approx(expected)
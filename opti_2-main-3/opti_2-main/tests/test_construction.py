@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from GRASP import (ALPHA, CAPACITY_EXHAUSTED, COMPLETE, CandidateScores, ConstructionState, Local_Search,
+                   add_candidate, construct, construct_candidates, select_candidate)
+from read import ResidualState
+from results import validate
+from single import construct_single
+
+
+def assert_same_rows(candidates, data, amounts=None):
+    """Las filas mantenidas deben ser iguales a recalcularlas desde cero."""
+    pending = np.flatnonzero(candidates.active)
+    fresh = CandidateScores(data, pending, amounts)
+    assert np.array_equal(candidates.scores[pending], fresh.scores[pending])
+    finite = np.isfinite(fresh.scores[pending])
+    assert np.array_equal(np.where(finite, candidates.facilities[pending], -1),
+                          np.where(finite, fresh.facilities[pending], -1))
+    assert np.array_equal(candidates.low, fresh.low)
+    assert np.array_equal(candidates.high, fresh.high)
+
+
+@pytest.mark.parametrize("alpha", [0.0, 0.3])
+def test_incremental_scores_match_full_rescoring(instance, alpha):
+    data = instance.fresh()
+    rng = np.random.default_rng(1)
+    candidates = CandidateScores(data, np.flatnonzero(data["demandas"] > 0))
+    count = np.zeros(data["params"][0], dtype=int)
+    for step in range(600):
+        facility, client = select_candidate(construct_candidates(candidates, alpha), rng)
+        amount = min(data["demandas"][client], data["capacity"][facility])
+        data["demandas"][client] -= amount
+        data["capacity"][facility] -= amount
+        candidates.update(facility, client, count[facility] == 0, data["demandas"][client] <= 0)
+        count[facility] += 1
+        if step % 100 == 99:
+            assert_same_rows(candidates, data)
+
+
+def test_residual_counts_match_recount(instance):
+    data = instance.fresh()
+    state = ConstructionState(data)
+    candidates = CandidateScores(data, np.flatnonzero(data["demandas"] > 0))
+    rng = np.random.default_rng(4)
+    while state.unsatisfied:
+        selection = select_candidate(construct_candidates(candidates, 0.3), rng)
+        opened = state.solution.count[selection[0]] == 0
+        add_candidate(state, selection, data)
+        candidates.update(*selection, opened, satisfied=data["demandas"][selection[1]] <= 0)
+        assert state.unsatisfied == np.count_nonzero(data["demandas"] > 0)
+        assert state.available == np.count_nonzero(data["capacity"] > 0)
+    assert np.allclose(state.solution.assigned(), instance["initial_demand"])
+
+
+def test_construction_stops_when_capacity_runs_out(instance):
+    capacity, demand = np.array(instance["initial_capacity"]), np.array(instance["initial_demand"])
+    short = ResidualState(capacity * 0.9 * demand.sum() / capacity.sum(), demand)  # Falta un 10 %
+    state = construct(0, instance.fresh().with_state(short))
+    assert state.stop_reason == CAPACITY_EXHAUSTED
+    assert state.available == 0 and state.unsatisfied > 0
+
+
+def test_construction_is_feasible(instance):
+    state = construct(3, instance.fresh(), alpha=0.2)
+    assert state.stop_reason == COMPLETE
+    report = validate(state.solution, instance)
+    assert report["feasible"]
+    assert report["cost"] == pytest.approx(state.cost)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_construction_opens_few_facilities(instance, seed):
+    data = instance.fresh().copy()
+    state = construct(seed, data, ALPHA)
+    opened = np.count_nonzero(state.solution.count)
+    assert opened <= 0.85 * data["params"][0]  # Antes abría 97-100 de 100 centros
+
+    _, searched = Local_Search(state.solution.copy(), data)
+    assert state.cost <= 1.1 * searched
+
+
+def test_single_source_construction_is_feasible(instance):
+    state = construct_single(3, instance.fresh(), alpha=0.2)
+    assert state.stop_reason == COMPLETE
+    assert state.solution.is_feasible(instance)
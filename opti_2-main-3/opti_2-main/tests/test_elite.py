@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from elite import ElitePool, SearchedMemo, distance, path_relinking, solution_hash
+from GRASP import GRASP_iteration
+from results import validate
+
+
+@pytest.fixture(scope="module")
+def data(instance):
+    return instance.fresh()
+
+
+@pytest.fixture(scope="module")
+def results(data):
+    return [GRASP_iteration(seed, data, alpha=0.3) for seed in range(6)]
+
+
+def test_hash_ignores_slot_order(results):
+    solution = results[0][0].copy()
+    client = int(np.flatnonzero((solution.facilities >= 0).sum(axis=1) == 1)[0])
+    swapped = solution.copy()
+    swapped.facilities[client] = swapped.facilities[client][::-1]
+    swapped.amounts[client] = swapped.amounts[client][::-1]
+    assert solution_hash(swapped) == solution_hash(solution)
+
+    other = solution.copy()
+    other.amounts[client] *= 0.5
+    assert solution_hash(other) != solution_hash(solution)
+
+
+def test_pool_keeps_diverse_best_solutions(results):
+    pool = ElitePool(size=4, min_distance=3)
+    for solution, cost in results:
+        pool.add(solution, cost)
+    assert not pool.add(*results[0])  # Repetida
+    assert 0 < len(pool) <= 4
+
+    members = list(pool)
+    for i, (solution, _) in enumerate(members):
+        for other, _ in members[i + 1:]:
+            assert distance(solution, other) >= 3
+    kept = sorted(cost for _, cost in members)
+    assert pool.best()[1] == min(cost for _, cost in results) == kept[0]
+
+
+def test_close_solution_replaces_only_a_worse_neighbour(results):
+    pool = ElitePool(size=4, min_distance=200)  # Todas las soluciones son "parecidas"
+    ordered = sorted(results, key=lambda result: result[1])
+    assert pool.add(*ordered[-1])
+    assert pool.add(*ordered[0])
+    assert not pool.add(*ordered[1])
+    assert len(pool) == 1 and pool.best()[1] == ordered[0][1]
+
+
+def test_relinking_stays_between_its_endpoints(data, results):
+    (source, _), (target, _) = max(((a, b) for a in results for b in results),
+                                   key=lambda pair: distance(pair[0][0], pair[1][0]))
+    assert distance(source, target) >= 2
+    result = path_relinking(source, target, data)
+    assert result is not None
+    solution, cost = result
+    opened, start, goal = solution.count > 0, source.count > 0, target.count > 0
+    assert not (opened & ~(start | goal)).any()  # Solo centros de alguno de los extremos
+    assert 0 < distance(solution, source) and 0 < distance(solution, target)
+    report = validate(solution, data)
+    assert report["feasible"] and report["cost"] == pytest.approx(cost)
+
+
+def test_searched_memo_returns_copies_and_evicts_oldest(results):
+    memo = SearchedMemo(maxsize=2)
+    for i, result in enumerate(results[:3]):
+        memo.put(bytes([i]), result)
+    assert memo.get(bytes([0])) is None
+    solution, cost = memo.get(bytes([1]))
+    assert cost == results[1][1] and solution is not results[1][0]
+    solution.add(0, 0, 1.0)
+    assert memo.get(bytes([1]))[0].get(0, 0) == results[1][0].get(0, 0)
+    assert memo.hits == 2
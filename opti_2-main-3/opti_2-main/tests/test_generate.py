@@ -0,0 +1,54 @@
+import logging
+from functools import partial
+
+import numpy as np
+import pytest
+
+import generate
+from costmatrix import client_blocks
+from GRASP import GRASP
+from read import read_instance, read_mapped
+from results import validate
+
+
+def test_client_blocks_cover_all_clients():
+    blocks = list(client_blocks(1003, 7, entries=100))
+    assert blocks[0] == slice(0, 14) and blocks[-1].stop == 1003
+    assert all(a.stop == b.start for a, b in zip(blocks, blocks[1:]))
+    assert list(client_blocks(5, 1000, entries=10)) == [slice(i, i + 1) for i in range(5)]
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_mapped_matrix_matches_read_instance(instance_path, tmp_path, dtype):
+    parsed = read_instance(instance_path, cache=False)
+    mapped = read_mapped(instance_path, str(tmp_path), dtype)
+    assert mapped.costo.dtype == dtype and not mapped.costo.flags.owndata  # Vista del archivo mapeado
+    assert np.array_equal(mapped.costo, parsed.costo.astype(dtype))
+    assert np.array_equal(mapped.initial_demand, parsed.initial_demand)
+    assert read_mapped(instance_path, str(tmp_path), dtype).costs_path == mapped.costs_path  # Reutiliza la conversión
+
+
+def test_generator_is_blockwise_and_reproducible(tmp_path, monkeypatch):
+    whole, blocked = tmp_path / "whole.txt", tmp_path / "blocked.txt"
+    generate.generate_instance(str(whole), 12, 300, seed=4)
+    monkeypatch.setattr(generate, "client_blocks", partial(client_blocks, entries=12 * 7))
+    generate.generate_instance(str(blocked), 12, 300, seed=4)
+    assert whole.read_bytes() == blocked.read_bytes()
+
+    data = read_instance(str(whole), cache=False)
+    assert data["params"] == [12, 300]
+    ratio = data["initial_capacity"].sum() / data["initial_demand"].sum()
+    assert ratio == pytest.approx(generate.CAPACITY_RATIO, rel=0.01)
+
+
+def test_generated_instance_solves_out_of_core(tmp_path):
+    path = str(tmp_path / "sintetica.txt")
+    generate.main([path, "--facilities", "20", "--clients", "500", "--seed", "1"])
+    logging.disable(logging.INFO)
+    try:
+        solution, cost = GRASP(1, 1, path, mmap=True, cost_dtype=np.float32)
+    finally:
+        logging.disable(logging.NOTSET)
+    report = validate(solution, read_instance(path, cache=False))
+    assert report["feasible"]
+    assert report["cost"] == pytest.approx(cost, rel=1e-6)
@@ -0,0 +1,59 @@
+import io
+import json
+import logging
+
+import pytest
+
+from GRASP import GRASP
+from instrument import PROFILER, Profiler, configure_logging, logger, timed
+
+
+@pytest.fixture
+def restore_logger():
+    handlers, level = list(logger.handlers), logger.level
+    yield
+    logger.handlers[:] = handlers
+    logger.setLevel(level)
+
+
+def test_timed_records_only_when_enabled(monkeypatch):
+    profiler = Profiler()
+    monkeypatch.setattr("instrument.PROFILER", profiler)
+    square = timed("square")(lambda x: x * x)
+    assert square(3) == 9
+    assert profiler.summary() == {}
+
+    profiler.enabled = True
+    square(2), square(4)
+    assert profiler.summary()["square"]["calls"] == 2
+
+
+def test_run_is_silent_by_default(instance_path, capsys):
+    GRASP(2, 1, instance_path)
+    captured = capsys.readouterr()
+    assert captured.out == "" and captured.err == ""
+
+
+def test_levels_control_the_output(instance_path, restore_logger):
+    stream = io.StringIO()
+    configure_logging(logging.INFO, stream)
+    GRASP(2, 1, instance_path)
+    info = stream.getvalue()
+    assert "Iteración 2 de 2" in info
+    assert "DEBUG" not in info
+
+    stream = io.StringIO()
+    configure_logging(logging.DEBUG, stream)
+    GRASP(1, 1, instance_path)
+    assert "DEBUG" in stream.getvalue()
+
+
+def test_profile_summary_counts_phases(instance_path, tmp_path):
+    path = tmp_path / "profile.json"
+    best = GRASP(3, 1, instance_path, profile_path=str(path))
+    summary = json.loads(path.read_text())
+    assert not PROFILER.enabled
+    assert summary["phases"]["construction"]["calls"] == 3
+    assert summary["phases"]["sas"]["seconds"] > 0
+    assert summary["iterations"] == 3 and summary["seed"] == 1
+    assert best[1] is not None
@@ -0,0 +1,41 @@
+import numpy as np
+
+from neighbors import NearestIndex
+
+
+def test_order_is_cheapest_facilities(instance):
+    costo = np.asarray(instance["costo"])
+    nearest = NearestIndex(costo, k=5)
+    assert nearest.order.shape == (costo.shape[0], 5)
+    expected = np.sort(costo, axis=1)[:, :5]
+    assert np.array_equal(np.take_along_axis(costo, nearest.order.astype(np.intp), axis=1), expected)
+
+
+def test_clients_of_inverts_order(instance):
+    nearest = NearestIndex(np.asarray(instance["costo"]), k=5)
+    for facility in range(0, instance["params"][0], 7):
+        expected = np.flatnonzero((nearest.order == facility).any(axis=1))
+        assert np.array_equal(nearest.clients_of(facility), expected)
+
+
+def test_first_feasible_matches_full_scan(instance):
+    costo = np.asarray(instance["costo"])
+    nearest = NearestIndex(costo, k=3)
+    rng = np.random.default_rng(0)
+    capacity = np.where(rng.random(costo.shape[1]) < 0.8, 1.0, 0.0)  # Muchos de los más cercanos sin capacidad
+    for client in rng.choice(costo.shape[0], 200, replace=False).tolist():
+        exclude = int(nearest.order[client, 0])
+        expected = np.where((capacity > 0) & (np.arange(costo.shape[1]) != exclude), costo[client], np.inf).argmin()
+        assert nearest.first_feasible(client, capacity, exclude) == expected
+    assert nearest.first_feasible(0, np.zeros(costo.shape[1])) is None
+
+
+def test_candidates_fall_back_to_full_row(instance):
+    costo = np.asarray(instance["costo"])
+    nearest = NearestIndex(costo, k=3)
+    capacity = np.ones(costo.shape[1])
+    capacity[nearest.order[0]] = 0  # Ninguno de los 3 más cercanos del cliente 0 tiene capacidad
+    facilities, feasible = nearest.candidates(np.array([0, 1]), capacity)
+    assert feasible[0].tolist() == [True, False, False]
+    assert facilities[0, 0] == np.where(capacity > 0, costo[0], np.inf).argmin()
+    assert feasible[1].all()
@@ -0,0 +1,42 @@
+import logging
+import threading
+from os.path import join
+from time import perf_counter
+
+import numpy as np
+import pytest
+
+from GRASP import GRASP
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    logging.disable(logging.INFO)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+@pytest.mark.parametrize("name, seed, options", [
+    ("capc5000.txt", 2, {}),  # Con la caché de asignaciones heurísticas daba costos distintos
+    ("capb5000.txt", 5, {"elite_size": 4}),
+    ("capc5000.txt", 3, {"gap": 1e-6}),  # La fijación por costos reducidos solo se hacía sin workers
+])
+def test_same_result_for_any_number_of_workers(instances_dir, name, seed, options):
+    instance = join(instances_dir, name)
+    sequential = GRASP(10, seed, instance, workers=1, alpha=0.2, **options)
+    parallel = GRASP(10, seed, instance, workers=3, alpha=0.2, **options)
+    assert parallel[1] == sequential[1]
+    assert np.array_equal(parallel[0].toarray(), sequential[0].toarray())
+
+
+def test_cancel_stops_running_iterations(instance_path):
+    cancel = threading.Event()
+    timer = threading.Timer(1.0, cancel.set)
+    start = perf_counter()
+    timer.start()
+    try:  # Cada iteración exacta tarda varios segundos; sin reenviar la cancelación se completarían
+        GRASP(4, 1, instance_path, workers=2, exact=True, cancel=cancel)
+    finally:
+        timer.cancel()
+    assert cancel.is_set()
+    assert perf_counter() - start < 5.0
@@ -0,0 +1,83 @@
+import os
+
+import numpy as np
+import pytest
+
+from GRASP import GRASP_iteration
+from read import ResidualState, cache_path, read_instance, read_mapped
+
+
+def test_cache_matches_text(instance_path, tmp_path):
+    parsed = read_instance(instance_path, cache=False)
+    read_instance(instance_path, cache_dir=str(tmp_path))  # Escribe la caché
+    cached = read_instance(instance_path, cache_dir=str(tmp_path))
+    assert np.array_equal(cached.costo, parsed.costo)
+    assert np.array_equal(cached.initial_capacity, parsed.initial_capacity)
+    assert not os.path.exists(cache_path(instance_path, str(tmp_path)) + ".tmp")
+
+
+@pytest.mark.parametrize("size", [0, 1000, "half"])
+def test_truncated_cache_is_reparsed(instance_path, tmp_path, size):
+    parsed = read_instance(instance_path, cache_dir=str(tmp_path))
+    cached = cache_path(instance_path, str(tmp_path))
+    raw = open(cached, 'rb').read()
+    with open(cached, 'wb') as file:
+        file.write(raw[:len(raw) // 2 if size == "half" else size])
+
+    data = read_instance(instance_path, cache_dir=str(tmp_path))
+    assert np.array_equal(data.costo, parsed.costo)
+    assert os.path.getsize(cached) == len(raw)  # Se volvió a escribir completa
+
+
+def test_truncated_mapped_matrix_is_converted_again(instance_path, tmp_path):
+    parsed = read_instance(instance_path, cache=False)
+    data = read_mapped(instance_path, str(tmp_path))
+    costs = data.costs_path
+    del data
+    raw = open(costs, 'rb').read()
+    with open(costs, 'wb') as file:
+        file.write(raw[:len(raw) // 2])
+
+    assert np.array_equal(read_mapped(instance_path, str(tmp_path)).costo, parsed.costo)
+
+
+def test_copies_share_data_but_not_residual_state(instance):
+    data = instance.fresh()
+    copy = data.copy()
+    assert copy["costo"] is data["costo"] and copy["costos_fijos"] is data["costos_fijos"]
+    assert not np.shares_memory(copy["capacity"], data["capacity"])
+    assert not np.shares_memory(copy["demandas"], data["demandas"])
+
+    copy["capacity"][0] -= 1
+    copy["demandas"][:] = 0
+    assert data["capacity"][0] == data["initial_capacity"][0]
+    assert np.array_equal(data["demandas"], data["initial_demand"])
+    with pytest.raises(ValueError):
+        copy["costo"][0, 0] = 0.0  # Datos compartidos de solo lectura
+
+
+def test_iterations_leave_the_instance_untouched(instance):
+    data = instance.fresh()
+    data.nearest_index()
+    solution, _ = GRASP_iteration(1, data)
+    assert np.array_equal(data["capacity"], data["initial_capacity"])
+    assert np.array_equal(data["demandas"], data["initial_demand"])
+
+    state = ResidualState.from_solution(data, solution)
+    assert np.allclose(state.capacity, data["initial_capacity"] - solution.load)
+    assert np.allclose(state.demandas, 0.0)
+    state.reset(data)
+    assert np.array_equal(state.capacity, data["initial_capacity"])
+
+
+def test_fresh_view_drops_per_run_memory(instance):
+    data = instance.fresh()
+    nearest = data.nearest_index()
+    data.open_set_cache()
+    data.searched_memo()
+    data["capacity"][:] = 0
+
+    fresh = data.fresh()
+    assert fresh.cache is None and fresh.searched is None
+    assert fresh.nearest_index() is nearest
+    assert np.array_equal(fresh["capacity"], data["initial_capacity"])
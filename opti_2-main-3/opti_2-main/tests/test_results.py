@@ -0,0 +1,62 @@
+import logging
+
+import numpy as np
+import pytest
+
+from GRASP import GRASP, construct, load_warm_start
+from read import iter_results
+from results import read_solution, validate, write_results
+
+
+@pytest.fixture(scope="module")
+def start(instance):
+    return construct(5, instance.fresh(), alpha=0.3).solution
+
+
+def test_written_results_read_back(instance, start, tmp_path):
+    path = str(tmp_path / "resultado.txt")
+    write_results(path, start, instance)
+    rows = list(iter_results(path))
+    assert sum(row[0] == "open" for row in rows) == instance["params"][0]
+
+    solution, opened = read_solution(path, instance)
+    assert np.array_equal(opened, start.count > 0)
+    assert np.allclose(solution.toarray(), start.toarray(), rtol=1e-10)
+    report = validate(solution, instance, opened)
+    assert report["feasible"]
+    assert report["cost"] == pytest.approx(start.evaluate(instance), rel=1e-10)
+
+
+def test_validate_reports_each_violation(instance, start):
+    facility = int(np.flatnonzero(start.count)[0])
+    opened = start.count > 0
+    opened[facility] = False
+    assert validate(start, instance, opened)["closed_facilities_used"] == 1
+
+    short = start.copy()
+    client = int(np.flatnonzero(short.facilities[:, 0] >= 0)[0])
+    short.add(int(short.facilities[client, 0]), client, -1.0)
+    report = validate(short, instance)
+    assert not report["feasible"] and report["clients_unserved"] == 1
+    assert report["max_demand_error"] == pytest.approx(1.0)
+
+    over = start.copy()
+    over.add(facility, client, instance["initial_capacity"][facility])
+    report = validate(over, instance)
+    assert report["facilities_over_capacity"] == 1 and report["clients_unserved"] == 1
+
+
+def test_warm_start_never_worsens_the_file(instance, instance_path, start, tmp_path):
+    path = str(tmp_path / "resultado.txt")
+    write_results(path, start, instance)
+    logging.disable(logging.INFO)
+    try:
+        _, cost = GRASP(1, 9, instance_path, warm_start=path)
+        assert cost <= start.evaluate(instance)
+
+        over = start.copy()
+        over.add(0, 0, instance["initial_capacity"][0] + 1)
+        write_results(path, over, instance)
+        assert load_warm_start(path, instance.fresh()) is None
+    finally:
+        logging.disable(logging.NOTSET)
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from GRASP import construct
+from results import validate
+from sas import SASEngine
+from solution import Solution
+
+
+@pytest.fixture(scope="module")
+def start(instance):
+    return construct(4, instance.fresh(), alpha=0.3).solution
+
+
+def test_deltas_match_evaluate_cost(instance, start):
+    engine = SASEngine(start, instance)
+    clients, facilities, changes = engine.deltas()
+    rng = np.random.default_rng(0)
+    rows, cols = np.nonzero(np.isfinite(changes))
+    for i in rng.choice(len(rows), size=200, replace=False).tolist():
+        client, facility, alternative = int(clients[rows[i]]), int(facilities[rows[i]]), int(cols[i])
+        moved = start.copy()
+        moved.move(client, facility, alternative)
+        assert moved.evaluate(instance) - engine.cost == pytest.approx(changes[rows[i], cols[i]], abs=1e-6)
+        assert moved.load[alternative] <= instance["initial_capacity"][alternative] + 1e-9
+
+    # Los movimientos marcados como no factibles exceden la capacidad del destino
+    rows, cols = np.nonzero(np.isinf(changes) & (facilities[:, None] != np.arange(changes.shape[1])))
+    amounts = np.array([start.get(f, c) for f, c in zip(facilities[rows].tolist(), clients[rows].tolist())])
+    assert (start.load[cols] + amounts > instance["initial_capacity"][cols]).all()
+
+
+def test_batch_cost_matches_evaluation(instance, start):
+    engine = SASEngine(start, instance)
+    assert engine.improve_batch()
+    assert engine.cost < start.evaluate(instance)
+    report = validate(engine.solution, instance)
+    assert report["feasible"]
+    assert engine.cost == pytest.approx(report["cost"], rel=1e-12)
+
+
+def test_maintained_loads_match_recomputation(instance, start):
+    engine = SASEngine(start, instance)
+    rng = np.random.default_rng(2)
+    for _ in range(300):
+        clients, facilities, changes = engine.deltas()
+        rows, cols = np.nonzero(np.isfinite(changes))
+        i = rng.integers(len(rows))
+        engine.apply(int(facilities[rows[i]]), int(clients[rows[i]]), int(cols[i]), changes[rows[i], cols[i]])
+
+    solution = engine.solution
+    rebuilt = Solution.from_matrix(solution.toarray())
+    assert np.allclose(solution.load, rebuilt.load)
+    assert np.array_equal(solution.count, rebuilt.count)
+    assert engine.cost == pytest.approx(validate(solution, instance)["cost"], rel=1e-9)
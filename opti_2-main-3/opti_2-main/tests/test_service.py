@@ -0,0 +1,67 @@
+import logging
+import subprocess
+import sys
+import time
+from os.path import exists, join
+
+import pytest
+
+from conftest import ROOT
+from GRASP import GRASP
+from service import request
+
+
+@pytest.fixture(scope="module")
+def socket_path(tmp_path_factory):
+    """Servicio con dos workers en un proceso aparte, escuchando en un socket temporal."""
+    path = str(tmp_path_factory.mktemp("service") / "solver.sock")
+    server = subprocess.Popen([sys.executable, join(ROOT, "service.py"), "serve", "--workers", "2",
+                               "--socket", path], cwd=ROOT, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(100):
+            if exists(path):
+                break
+            time.sleep(0.1)
+        yield path
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def test_submitted_job_matches_grasp(socket_path, instance_path):
+    message = {"op": "solve", "instance": instance_path, "seed": 3, "iterations": 2}
+    first = list(request(message, socket_path))
+    assert [event["event"] for event in first[:2]] == ["queued", "started"]
+    done = first[-1]
+    assert done["event"] == "done" and done["status"] == "ok"
+
+    logging.disable(logging.INFO)
+    try:
+        assert done["cost"] == GRASP(2, 3, instance_path)[1]
+    finally:
+        logging.disable(logging.NOTSET)
+
+    again = list(request(message, socket_path))[-1]  # Mismo worker, instancia ya en memoria
+    assert again["cost"] == done["cost"] and again["warm"]
+
+
+def test_cancel_stops_running_job(socket_path, instance_path):
+    events = request({"op": "solve", "instance": instance_path, "seed": 1, "time_limit": 60}, socket_path)
+    job = next(events)["job"]
+    assert next(events)["event"] == "started"
+
+    start = time.perf_counter()
+    assert list(request({"op": "cancel", "job": job}, socket_path)) == [{"event": "cancel", "job": job, "ok": True}]
+    done = [event for event in events if event["event"] == "done"][0]
+    assert done["status"] == "cancelled"
+    assert time.perf_counter() - start < 10
+    assert list(request({"op": "cancel", "job": job}, socket_path))[0]["ok"] is False  # Ya terminó
+
+
+def test_invalid_requests_are_rejected(socket_path, instance_path):
+    unknown = list(request({"op": "solve", "instance": instance_path, "iterations": 1, "colour": 1}, socket_path))
+    assert unknown[0]["event"] == "error" and "colour" in unknown[0]["error"]
+    endless = list(request({"op": "solve", "instance": instance_path}, socket_path))
+    assert endless[0]["event"] == "error"
+    status = list(request({"op": "status"}, socket_path))[0]
+    assert status["queued"] == [] and status["running"] == {}
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from single import SingleSourceEngine, construct_single
+
+
+@pytest.fixture(scope="module")
+def engine(instance):
+    return SingleSourceEngine(construct_single(2, instance.fresh(), alpha=0.3).solution, instance)
+
+
+def test_shift_deltas_match_evaluation(instance, engine):
+    checked = 0
+    for client in range(0, 1000, 50):
+        facility, change = engine.best_shift(client)
+        if not np.isfinite(change):
+            continue
+        moved = engine.solution.copy()
+        moved.shift(client, facility, engine.demand[client])
+        assert moved.is_feasible(instance)
+        assert moved.evaluate(instance) - engine.cost == pytest.approx(change, abs=1e-6)
+        checked += 1
+    assert checked
+
+
+def test_swap_deltas_match_evaluation(instance, engine):
+    checked = 0
+    for client in range(0, 1000, 50):
+        other, change = engine.best_swap(client)
+        if not np.isfinite(change):
+            continue
+        moved = engine.solution.copy()
+        moved.swap(client, other, engine.demand[client], engine.demand[other])
+        assert moved.is_feasible(instance)
+        assert moved.evaluate(instance) - engine.cost == pytest.approx(change, abs=1e-6)
+        checked += 1
+    assert checked
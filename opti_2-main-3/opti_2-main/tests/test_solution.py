@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+from GRASP import construct
+from solution import Solution
+
+
+@pytest.fixture(scope="module")
+def start(instance):
+    return construct(7, instance.fresh(), alpha=0.3).solution
+
+
+@pytest.mark.parametrize("convert", [Solution.to_dok, Solution.to_csr, Solution.toarray])
+def test_matrix_round_trip(instance, start, convert):
+    solution = Solution.from_matrix(convert(start))
+    assert np.array_equal(solution.toarray(), start.toarray())
+    assert np.array_equal(solution.count, start.count)
+    assert np.allclose(solution.load, start.load)
+    assert solution.evaluate(instance) == pytest.approx(start.evaluate(instance))
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from scipy.optimize import linprog
+from scipy.sparse import coo_matrix
+
+from results import validate
+from transport import solve_transport
+
+
+def lp_transport_cost(data, facilities):
+    """Costo de transporte óptimo del conjunto según el LP de scipy (HiGHS)."""
+    demand = np.asarray(data["initial_demand"], dtype=float)
+    capacity = np.asarray(data["initial_capacity"], dtype=float)[facilities]
+    costs = np.asarray(data["costo"])[:, facilities]  # Variable (cliente, centro) en la posición c * m + f
+    n, m = costs.shape
+    variables = np.arange(n * m)
+    demand_rows = coo_matrix((np.ones(n * m), (variables // m, variables)), shape=(n, n * m))
+    capacity_rows = coo_matrix((np.ones(n * m), (variables % m, variables)), shape=(m, n * m))
+    result = linprog(costs.ravel(), A_ub=capacity_rows, b_ub=capacity, A_eq=demand_rows, b_eq=demand,
+                     method="highs")
+    assert result.success
+    return result.fun
+
+
+@pytest.mark.parametrize("size, seed", [(15, 0), (40, 1), (100, 2)])
+def test_transport_matches_linear_program(instance, size, seed):
+    data = instance.fresh()
+    rng = np.random.default_rng(seed)
+    capacity = np.asarray(data["initial_capacity"])
+    demand = np.sum(data["initial_demand"])
+    facilities = rng.permutation(len(capacity))[:size]
+    while capacity[facilities].sum() < demand:  # Conjunto con capacidad suficiente
+        facilities = rng.permutation(len(capacity))[:size]
+    facilities = np.sort(facilities)
+
+    solution, optimal = solve_transport(data, facilities)
+    assert optimal
+    assert validate(solution, data)["feasible"]
+    assert set(solution.open_facilities().tolist()) <= set(facilities.tolist())
+
+    transport = solution.evaluate(data) - np.sum(np.asarray(data["costos_fijos"])[solution.count > 0])
+    assert transport == pytest.approx(lp_transport_cost(data, facilities), rel=1e-9)
@@ -0,0 +1,381 @@
+"""
+Problema de transporte para un conjunto fijo de centros abiertos.
+
+Con los centros abiertos fijos, la mejor asignación de la demanda (con clientes
+atendidos por varios centros) es un problema de transporte: ofertas = capacidad
+de cada centro abierto, demandas = demanda de cada cliente. Se resuelve con el
+método simplex de transporte (simplex de redes sobre el grafo bipartito):
+
+    1. Solución básica inicial: se parte de la solución actual (si se entrega),
+       se completa la demanda pendiente con el método de costo mínimo y se
+       eliminan los ciclos del soporte, de modo que las celdas con flujo formen
+       un bosque; luego se completa un árbol generador con celdas en cero.
+    2. Iteraciones: potenciales u + v = c sobre el árbol, costos reducidos de
+       todas las celdas en una operación de numpy, ciclo de la celda entrante
+       en el árbol y pivoteo.
+
+Una columna ficticia de costo cero absorbe la capacidad sobrante.
+"""
+from collections import deque
+
+import numpy as np
+
+from deadline import expired
+from solution import EMPTY, Solution
+
+# Tolerancia relativa (respecto del mayor costo) para declarar optimalidad
+TOLERANCE = 1e-10
+
+# Cantidades menores a esto se consideran cero
+EPS = 1e-9
+
+
+class TransportProblem:
+    """
+    Problema de transporte restringido a los centros `open_facilities`.
+
+    Filas = centros abiertos, columnas = clientes más la columna ficticia.
+    Los nodos del árbol son `0..m-1` (filas) y `m..m+n` (columnas).
+
+    Args:
+        data (Instance): Datos de la instancia.
+        open_facilities (array): Centros abiertos.
+    """
+
+    def __init__(self, data, open_facilities):
+        self.facilities = np.asarray(open_facilities, dtype=np.intp)
+        self.supply = np.asarray(data["initial_capacity"], dtype=np.float64)[self.facilities]
+        self.demand = np.asarray(data["initial_demand"], dtype=np.float64)
+        self.m, self.n = len(self.facilities), len(self.demand)
+
+        costs = np.asarray(data["costo"])[:, self.facilities].T  # m x n
+        self.costs = np.hstack((costs, np.zeros((self.m, 1))))   # columna ficticia
+        self.spare = self.supply.sum() - self.demand.sum()
+
+    @property
+    def feasible(self):
+        return self.m > 0 and self.spare >= -EPS
+
+    def cost(self, row, col):
+        return self.costs[row, col]
+
+
+class TransportSimplex:
+    """
+    Estado del simplex de transporte: celdas básicas con su flujo y árbol generador.
+
+    Args:
+        problem (TransportProblem): Problema a resolver.
+        warm (Solution): Solución desde la que se parte (opcional).
+    """
+
+    def __init__(self, problem, warm=None):
+        self.problem = problem
+        self.nodes = problem.m + problem.n + 1
+        self.flow = {}                                   # (fila, columna) -> flujo
+        self.adjacency = [set() for _ in range(self.nodes)]
+        self.pivots = 0
+        self._initial_solution(warm)
+
+    # --- Solución básica inicial -------------------------------------------
+
+    def _initial_solution(self, warm):
+        problem = self.problem
+        m, n = problem.m, problem.n
+        supply = problem.supply.copy()
+        demand = problem.demand.copy()
+        flow = {}
+
+        # 1. Asignaciones de la solución actual que usan centros abiertos
+        if warm is not None:
+            row_of = np.full(len(warm.load), -1, dtype=np.intp)
+            row_of[problem.facilities] = np.arange(m)
+            clients, slots = np.nonzero(warm.facilities != EMPTY)
+            rows = row_of[warm.facilities[clients, slots]]
+            amounts = warm.amounts[clients, slots]
+            for row, client, amount in zip(rows.tolist(), clients.tolist(), amounts.tolist()):
+                amount = min(amount, supply[row], demand[client]) if row >= 0 else 0
+                if amount > EPS:
+                    flow[row, client] = flow.get((row, client), 0.0) + amount
+                    supply[row] -= amount
+                    demand[client] -= amount
+
+        # 2. Demanda pendiente por el método de costo mínimo
+        pending = np.flatnonzero(demand > EPS)
+        if len(pending):
+            sub = problem.costs[:, pending]
+            order = np.argsort(sub, axis=None, kind="stable")
+            rows, cols = np.divmod(order, len(pending))
+            left = len(pending)
+            for row, col in zip(rows.tolist(), cols.tolist()):
+                client = int(pending[col])
+                if demand[client] <= EPS or supply[row] <= EPS:
+                    continue
+                amount = min(supply[row], demand[client])
+                flow[row, client] = flow.get((row, client), 0.0) + amount
+                supply[row] -= amount
+                demand[client] -= amount
+                if demand[client] <= EPS:
+                    left -= 1
+                    if not left:
+                        break
+
+        # 3. Capacidad sobrante a la columna ficticia
+        for row in np.flatnonzero(supply > EPS).tolist():
+            flow[row, n] = supply[row]
+
+        # 4. Bosque sin ciclos y 5. árbol generador
+        self._build_forest(flow)
+        self._span()
+
+    def _build_forest(self, flow):
+        """
+        Agrega las celdas con flujo una por una. Si una celda cierra un ciclo,
+        se mueve flujo por el ciclo en la dirección que no aumenta el costo hasta
+        que alguna celda quede en cero, y esa celda sale (la conectividad no cambia).
+        """
+        parent = list(range(self.nodes))
+
+        def find(node):
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        m = self.problem.m
+        for (row, col), amount in flow.items():
+            a, b = find(row), find(m + col)
+            if a != b:
+                parent[a] = b
+                self._add(row, col, amount)
+                continue
+
+            path = self._path(row, m + col)  # row -> ... -> m+col en el bosque
+            cycle = [(row, col, +1)]         # la celda nueva recibe flujo
+            sign = -1
+            for u, v in zip(path[:-1], path[1:]):
+                cycle.append((*self._cell(u, v), sign))
+                sign = -sign
+            # Costo de mover una unidad en la dirección de `cycle`
+            direction = sum(s * self.problem.cost(r, c) for r, c, s in cycle)
+            if direction > 0:
+                cycle = [(r, c, -s) for r, c, s in cycle]
+
+            flows = [amount if (r, c) == (row, col) else self.flow[r, c] for r, c, _ in cycle]
+            theta = min(f for f, (_, _, s) in zip(flows, cycle) if s < 0)
+            leaving = next(i for i, (f, (_, _, s)) in enumerate(zip(flows, cycle)) if s < 0 and f <= theta)
+
+            new_amount = amount + cycle[0][2] * theta
+            for r, c, s in cycle[1:]:
+                self.flow[r, c] += s * theta
+            if leaving == 0:
+                continue  # La celda nueva queda en cero: no entra al bosque
+            r, c, _ = cycle[leaving]
+            self._remove(r, c)
+            self._add(row, col, new_amount)
+
+    def _span(self):
+        """Completa el bosque a un árbol generador con celdas de flujo cero."""
+        m = self.problem.m
+        seen = [False] * self.nodes
+        components = []
+        for start in range(self.nodes):
+            if seen[start]:
+                continue
+            seen[start] = True
+            component, queue = [start], deque([start])
+            while queue:
+                for nb in self.adjacency[queue.popleft()]:
+                    if not seen[nb]:
+                        seen[nb] = True
+                        component.append(nb)
+                        queue.append(nb)
+            components.append(component)
+
+        # Se une todo a una componente que tenga fila y columna
+        hub = next((c for c in components if min(c) < m <= max(c)), components[0])
+        hub_row = next((node for node in hub if node < m), None)
+        hub_col = next((node for node in hub if node >= m), None)
+        for component in components:
+            if component is hub:
+                continue
+            col = next((node for node in component if node >= m), None)
+            if col is not None and hub_row is not None:
+                self._add(hub_row, col - m, 0.0)
+                hub_col = hub_col if hub_col is not None else col
+            else:
+                row = next(node for node in component if node < m)
+                if hub_col is None:
+                    hub_col = next(node for c in components for node in c if node >= m)
+                self._add(row, hub_col - m, 0.0)
+                hub_row = hub_row if hub_row is not None else row
+
+    # --- Árbol ---------------------------------------------------------------
+
+    def _cell(self, u, v):
+        """Celda (fila, columna) de la arista entre los nodos u y v."""
+        m = self.problem.m
+        return (u, v - m) if u < m else (v, u - m)
+
+    def _add(self, row, col, amount):
+        m = self.problem.m
+        self.flow[row, col] = amount
+        self.adjacency[row].add(m + col)
+        self.adjacency[m + col].add(row)
+
+    def _remove(self, row, col):
+        m = self.problem.m
+        del self.flow[row, col]
+        self.adjacency[row].discard(m + col)
+        self.adjacency[m + col].discard(row)
+
+    def _path(self, source, target):
+        """Camino (lista de nodos) entre dos nodos del bosque."""
+        previous = {source: None}
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            if node == target:
+                break
+            for nb in self.adjacency[node]:
+                if nb not in previous:
+                    previous[nb] = node
+                    queue.append(nb)
+        path = [target]
+        while path[-1] != source:
+            path.append(previous[path[-1]])
+        return path[::-1]
+
+    def _potentials(self):
+        """
+        Potenciales u (filas) y v (columnas) con u + v = c en las celdas básicas,
+        junto con el padre y la profundidad de cada nodo (raíz: fila 0).
+        """
+        m, costs = self.problem.m, self.problem.costs
+        potential = np.zeros(self.nodes)
+        parent = [-1] * self.nodes
+        depth = [0] * self.nodes
+        seen = [False] * self.nodes
+        seen[0] = True
+        queue = deque([0])
+        while queue:
+            node = queue.popleft()
+            for nb in self.adjacency[node]:
+                if not seen[nb]:
+                    seen[nb] = True
+                    row, col = self._cell(node, nb)
+                    potential[nb] = costs[row, col] - potential[node]
+                    parent[nb] = node
+                    depth[nb] = depth[node] + 1
+                    queue.append(nb)
+        return potential[:m], potential[m:], parent, depth
+
+    # --- Simplex -------------------------------------------------------------
+
+    def solve(self, deadline=None, max_pivots=None):
+        """
+        Pivotea hasta que ningún costo reducido sea negativo.
+
+        Args:
+            deadline (Deadline): Límite de tiempo; al cumplirse se detiene con la
+                                 solución factible actual.
+            max_pivots (int): Máximo de pivoteos (por defecto 50 * (m + n)).
+
+        Returns:
+            bool: True si se alcanzó el óptimo.
+        """
+        problem = self.problem
+        m = problem.m
+        tolerance = TOLERANCE * max(1.0, float(np.abs(problem.costs).max()))
+        if max_pivots is None:
+            max_pivots = 50 * (problem.m + problem.n)
+
+        while self.pivots < max_pivots and not expired(deadline):
+            u, v, parent, depth = self._potentials()
+            reduced = problem.costs - u[:, None] - v[None, :]
+            entering = int(reduced.argmin())
+            row, col = divmod(entering, problem.n + 1)
+            if reduced[row, col] >= -tolerance:
+                return True
+
+            # Camino en el árbol entre la columna y la fila de la celda entrante
+            a, b = m + col, row
+            left, right = [a], [b]
+            while a != b:
+                if depth[a] >= depth[b]:
+                    a = parent[a]
+                    left.append(a)
+                else:
+                    b = parent[b]
+                    right.append(b)
+            path = left + right[-2::-1]  # m+col -> ... -> row
+
+            minus = [self._cell(x, y) for x, y in zip(path[0::2], path[1::2])]
+            plus = [self._cell(x, y) for x, y in zip(path[1::2], path[2::2])]
+            theta = min(self.flow[cell] for cell in minus)
+            leaving = next(cell for cell in minus if self.flow[cell] <= theta)
+
+            for cell in minus:
+                self.flow[cell] -= theta
+            for cell in plus:
+                self.flow[cell] += theta
+            self._remove(*leaving)
+            self._add(row, col, theta)
+            self.pivots += 1
+        return False
+
+    def to_solution(self, n_facilities):
+        """Solución (sin la columna ficticia) con las celdas de flujo positivo."""
+        solution = Solution(n_facilities, self.problem.n)
+        facilities = self.problem.facilities
+        for (row, col), amount in self.flow.items():
+            if col < self.problem.n and amount > EPS:
+                solution.add(int(facilities[row]), col, amount)
+        return solution
+
+
+def solve_transport(data, open_facilities, warm=None, deadline=None, max_pivots=None):
+    """
+    Asignación de costo mínimo de la demanda a un conjunto fijo de centros abiertos.
+
+    Args:
+        data (Instance): Datos de la instancia.
+        open_facilities (array): Centros que pueden atender demanda.
+        warm (Solution): Solución desde la que se parte (opcional).
+        deadline (Deadline): Límite de tiempo (opcional).
+        max_pivots (int): Máximo de pivoteos (opcional).
+
+    Returns:
+        tuple: (Solution, bool óptimo), o (None, False) si la capacidad de los
+               centros no alcanza para la demanda total.
+    """
+    problem = TransportProblem(data, open_facilities)
+    if not problem.feasible:
+        return None, False
+    simplex = TransportSimplex(problem, warm)
+    optimal = simplex.solve(deadline, max_pivots)
+    return simplex.to_solution(len(data["initial_capacity"])), optimal
+
+
+def cached_transport(data, open_facilities, warm=None, deadline=None):
+    """
+    Como `solve_transport`, pero consultando primero la caché de conjuntos
+    abiertos de la instancia (`Instance.open_set_cache`) y guardando en ella el
+    resultado si es óptimo (una resolución cortada por el límite de tiempo no
+    se guarda).
+
+    Returns:
+        tuple: (Solution, costo), o None si la capacidad no alcanza. La solución
+               es una copia que se puede modificar.
+    """
+    cache = data.open_set_cache()
+    key = cache.key(open_facilities)
+    cached = cache.get(key)
+    if cached is None:
+        solution, optimal = solve_transport(data, open_facilities, warm, deadline)
+        if solution is None:
+            return None
+        cached = solution, solution.evaluate(data)
+        if optimal:
+            cache.put(key, *cached)
+    return cached